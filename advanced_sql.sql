@@ -121,27 +121,23 @@ ORDER BY
 -- 6. Materialized View (simulated using a regular table and insert/update logic)
 -- For performance, we can create a summary table that is periodically updated.
 -- This is a common pattern when true materialized views are not directly supported or desired.
-CREATE TABLE IF NOT EXISTS daily_sales_summary (
-    summary_date DATE PRIMARY KEY,
-    total_daily_sales DECIMAL(10, 2),
-    total_daily_profit DECIMAL(10, 2)
-);
-
--- Example of how to populate/update this summary table (this would typically be part of an ETL job)
--- INSERT INTO daily_sales_summary (summary_date, total_daily_sales, total_daily_profit)
+-- daily_sales_summary is created in schema.sql and refreshed by the ETL after every load
+-- (rollups.refresh_daily_sales_summary), either for the affected dates or as a full rebuild:
+-- DELETE FROM daily_sales_summary WHERE summary_date IN (...);
+-- INSERT INTO daily_sales_summary (summary_date, total_daily_sales, total_daily_profit, total_daily_orders)
 -- SELECT
 --     o.order_date,
 --     SUM(s.sales),
---     SUM(s.profit)
+--     SUM(s.profit),
+--     COUNT(DISTINCT s.order_id)
 -- FROM
 --     sales s
 -- JOIN
 --     orders o ON s.order_id = o.order_id
+-- WHERE
+--     o.order_date IN (...)
 -- GROUP BY
---     o.order_date
--- ON DUPLICATE KEY UPDATE
---     total_daily_sales = VALUES(total_daily_sales),
---     total_daily_profit = VALUES(total_daily_profit);
+--     o.order_date;
 
 -- 7. Trigger: after_sales_insert_update
 -- Updates product stock or logs changes (example: simple log table)
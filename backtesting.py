@@ -0,0 +1,140 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from batch_forecasting import (DEFAULT_METHODS, fit_method, load_series, method_label, minimum_history,
+                               predict_method)
+
+HORIZON = 6
+MIN_TRAIN_MONTHS = 12
+WORKERS = os.cpu_count() or 1
+
+
+def error_sums(actual, predicted):
+    """Per-horizon sums and counts of absolute, percentage and symmetric percentage errors.
+
+    actual and predicted are (series x horizon). Percentage errors skip zero actuals,
+    which are common in sparse sub-category series.
+    """
+    absolute = np.abs(actual - predicted)
+    nonzero = actual != 0
+    ape = np.divide(absolute, np.abs(actual), out=np.zeros_like(absolute), where=nonzero)
+    denominator = np.abs(actual) + np.abs(predicted)
+    smape_defined = denominator != 0
+    sape = np.divide(2 * absolute, denominator, out=np.zeros_like(absolute), where=smape_defined)
+    return np.stack([
+        absolute.sum(axis=0), np.full(actual.shape[1], actual.shape[0], dtype=float),
+        ape.sum(axis=0), nonzero.sum(axis=0),
+        sape.sum(axis=0), smape_defined.sum(axis=0),
+    ])
+
+
+def evaluation_dates(calendar, cutoff, steps):
+    """Months forecast from a cutoff: the calendar months the forecasts are scored against"""
+    return calendar[cutoff:cutoff + steps]
+
+
+def evaluate_cutoffs(shm_name, shape, dtype, calendar, method, hyperparameters, cutoffs, horizon):
+    """Worker: forecast every series from each cutoff and return summed errors per horizon.
+
+    The series matrix is read straight from shared memory instead of being pickled
+    into every task.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        Y = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        totals = np.zeros((6, horizon))
+        for cutoff in cutoffs:
+            steps = min(horizon, shape[1] - cutoff)
+            train, train_calendar = Y[:, :cutoff], calendar[:cutoff]
+            parameters = fit_method(method, train, train_calendar, **hyperparameters)
+            predicted = predict_method(method, parameters, cutoff, evaluation_dates(calendar, cutoff, steps),
+                                       **hyperparameters)
+            totals[:, :steps] += error_sums(Y[:, cutoff:cutoff + steps], predicted)
+        del Y
+        return method, totals
+    finally:
+        shm.close()
+
+
+def run_backtest(Y, calendar, methods=DEFAULT_METHODS, horizon=HORIZON, min_train=MIN_TRAIN_MONTHS,
+                 workers=WORKERS):
+    """Expanding-window evaluation of every method over every cutoff and series.
+
+    Returns one row per method and horizon with MAE, MAPE and sMAPE.
+    """
+    Y = np.ascontiguousarray(Y, dtype=float)
+    shm = shared_memory.SharedMemory(create=True, size=max(Y.nbytes, 1))
+    try:
+        np.ndarray(Y.shape, dtype=Y.dtype, buffer=shm.buf)[:] = Y
+        tasks = []
+        for method, hyperparameters in methods:
+            first_cutoff = max(min_train, minimum_history(method, **hyperparameters))
+            cutoffs = list(range(first_cutoff, Y.shape[1]))
+            for chunk in np.array_split(np.array(cutoffs, dtype=int), max(min(workers, len(cutoffs)), 1)):
+                if len(chunk):
+                    tasks.append((method, hyperparameters, chunk.tolist()))
+
+        totals = {}
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(evaluate_cutoffs, shm.name, Y.shape, Y.dtype, calendar,
+                                       method, hyperparameters, chunk, horizon)
+                       for method, hyperparameters, chunk in tasks]
+            for future in futures:
+                method, method_totals = future.result()
+                totals[method] = totals.get(method, 0) + method_totals
+    finally:
+        shm.close()
+        shm.unlink()
+
+    rows = []
+    for method, hyperparameters in methods:
+        if method not in totals:
+            continue
+        abs_sum, abs_count, ape_sum, ape_count, sape_sum, sape_count = totals[method]
+        for step in range(horizon):
+            rows.append({
+                'method': method_label(method, **hyperparameters),
+                'horizon': step + 1,
+                'forecasts': int(abs_count[step]),
+                'MAE': abs_sum[step] / abs_count[step] if abs_count[step] else np.nan,
+                'MAPE': ape_sum[step] / ape_count[step] * 100 if ape_count[step] else np.nan,
+                'sMAPE': sape_sum[step] / sape_count[step] * 100 if sape_count[step] else np.nan,
+            })
+    return pd.DataFrame(rows)
+
+
+def metric_tables(results):
+    """One method x horizon table per metric"""
+    return {metric: results.pivot(index='method', columns='horizon', values=metric)
+            for metric in ('MAPE', 'sMAPE', 'MAE')}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Expanding-window backtest of every forecasting method")
+    parser.add_argument('--horizon', type=int, default=HORIZON, help="Months ahead to evaluate")
+    parser.add_argument('--min-train', type=int, default=MIN_TRAIN_MONTHS, help="Months in the first training window")
+    parser.add_argument('--workers', type=int, default=WORKERS, help="Worker processes")
+    parser.add_argument('--target', default='monthly_sales', choices=['monthly_sales', 'monthly_profit', 'monthly_orders'])
+    parser.add_argument('--national', action='store_true', help="Evaluate the national total instead of every series")
+    parser.add_argument('--output', help="Write the results to this CSV file")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    keys, calendar, Y = load_series(args.target)
+    if args.national:
+        Y = Y.sum(axis=0, keepdims=True)
+    start_time = time.time()
+    results = run_backtest(Y, calendar, horizon=args.horizon, min_train=args.min_train, workers=args.workers)
+    print(f"Backtested {Y.shape[0]:,} series in {time.time() - start_time:.2f} seconds\n")
+    for metric, table in metric_tables(results).items():
+        print(f"{metric}\n{table.round(2).to_string()}\n")
+    if args.output:
+        results.to_csv(args.output, index=False)
@@ -0,0 +1,194 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from forecast_cache import FORECAST_CACHE
+from forecasting import data_fingerprint, get_data_from_db, monthly_agg_ready
+from rollups import SERIES_FROM_AGG_QUERY
+
+SERIES_KEYS = ['region', 'category', 'sub_category']
+
+# Every region x category x sub-category monthly series in one grouped scan
+SERIES_QUERY = """
+SELECT
+    o.region,
+    p.category,
+    p.sub_category,
+    DATE_FORMAT(o.order_date, '%Y-%m-01') as month_date,
+    SUM(s.sales) as monthly_sales,
+    SUM(s.profit) as monthly_profit,
+    COUNT(DISTINCT s.order_id) as monthly_orders
+FROM sales s
+JOIN orders o ON s.order_id = o.order_id
+JOIN products p ON s.product_id = p.product_id
+GROUP BY o.region, p.category, p.sub_category, month_date
+ORDER BY o.region, p.category, p.sub_category, month_date
+"""
+
+# (method, hyperparameters) fitted by default, matching forecasting.get_sales_forecasts
+DEFAULT_METHODS = (
+    ('linear', {}),
+    ('polynomial', {'degree': 2}),
+    ('moving_average', {'window': 3}),
+    ('seasonal', {}),
+)
+
+
+def load_series(target_column='monthly_sales'):
+    """All series as a (keys frame, month dates, values matrix) triple.
+
+    Series are aligned on one monthly calendar; months without sales are 0.
+    """
+    df = get_data_from_db(SERIES_FROM_AGG_QUERY if monthly_agg_ready() else SERIES_QUERY)
+    if df.empty:
+        return pd.DataFrame(columns=SERIES_KEYS), pd.DatetimeIndex([]), np.empty((0, 0))
+    return series_matrix(df, target_column)
+
+
+def series_matrix(df, target_column='monthly_sales'):
+    df = df.assign(month_date=pd.to_datetime(df['month_date']))
+    calendar = pd.date_range(df['month_date'].min(), df['month_date'].max(), freq='MS')
+    wide = df.pivot_table(index=SERIES_KEYS, columns='month_date', values=target_column, aggfunc='sum')
+    wide = wide.reindex(columns=calendar).fillna(0.0)
+    return wide.index.to_frame(index=False), calendar, wide.to_numpy(dtype=float)
+
+
+def future_dates(calendar, periods):
+    """Month starts following the last month of the calendar.
+
+    The seasonal method indexes its fit by calendar month, so the horizon must step
+    whole months; 30-day steps drift and can skip or repeat a month.
+    """
+    return pd.date_range(calendar[-1] + pd.offsets.MonthBegin(1), periods=periods, freq='MS')
+
+
+def polynomial_design(time_index, degree):
+    return np.vander(np.asarray(time_index, dtype=float), degree + 1, increasing=True)
+
+
+def month_design(months):
+    """One-hot calendar-month indicators; least squares on them yields per-month means"""
+    return (np.asarray(months)[:, None] == np.arange(1, 13)[None, :]).astype(float)
+
+
+def fit_method(method, Y, calendar, **hyperparameters):
+    """Parameters of one method for every series (rows of Y) in a single solve.
+
+    All series share the same design matrix, so np.linalg.lstsq fits them together
+    with Y.T as a stacked right-hand side.
+    """
+    if method in ('linear', 'polynomial'):
+        degree = 1 if method == 'linear' else hyperparameters.get('degree', 2)
+        coefficients, *_ = np.linalg.lstsq(polynomial_design(np.arange(Y.shape[1]), degree), Y.T, rcond=None)
+        return coefficients.T
+    if method == 'moving_average':
+        return Y[:, -hyperparameters.get('window', 3):].mean(axis=1, keepdims=True)
+    if method == 'seasonal':
+        coefficients, *_ = np.linalg.lstsq(month_design(calendar.month), Y.T, rcond=None)
+        return coefficients.T
+    raise ValueError(f"Unknown forecasting method: {method}")
+
+
+def predict_method(method, parameters, n_history, horizon_dates, **hyperparameters):
+    """Forecast matrix (series x periods) from fitted parameters"""
+    periods = len(horizon_dates)
+    if method in ('linear', 'polynomial'):
+        degree = parameters.shape[1] - 1
+        return parameters @ polynomial_design(np.arange(n_history, n_history + periods), degree).T
+    if method == 'moving_average':
+        return np.repeat(parameters, periods, axis=1)
+    if method == 'seasonal':
+        return parameters @ month_design(horizon_dates.month).T
+    raise ValueError(f"Unknown forecasting method: {method}")
+
+
+def minimum_history(method, **hyperparameters):
+    return {'linear': 3, 'polynomial': 3, 'seasonal': 12}.get(method, hyperparameters.get('window', 3))
+
+
+def method_label(method, **hyperparameters):
+    """forecast_type labels used by forecasting.py"""
+    if method == 'linear':
+        return 'Linear'
+    if method == 'polynomial':
+        return f"Polynomial (degree {hyperparameters.get('degree', 2)})"
+    if method == 'moving_average':
+        return f"Moving Average ({hyperparameters.get('window', 3)} months)"
+    return 'Seasonal'
+
+
+def forecast_frame(keys, horizon_dates, predictions, label):
+    """Long-format rows for one method: one row per series and forecast month"""
+    n_series, periods = predictions.shape
+    frame = keys.loc[keys.index.repeat(periods)].reset_index(drop=True)
+    frame['month_date'] = np.tile(horizon_dates.values, n_series)
+    frame['horizon'] = np.tile(np.arange(1, periods + 1), n_series)
+    frame['forecast_type'] = label
+    frame['predicted_value'] = predictions.ravel()
+    return frame
+
+
+def batch_forecast(keys, calendar, Y, periods=6, methods=DEFAULT_METHODS, fingerprint=None, series_id=None):
+    """Forecast every series with every method; one long-format frame.
+
+    With a fingerprint, each method's parameters and forecast rows are taken from
+    the forecast cache when present, so repeat requests skip fitting.
+    """
+    horizon_dates = future_dates(calendar, periods)
+    frames = []
+    for method, hyperparameters in methods:
+        if Y.shape[1] < minimum_history(method, **hyperparameters):
+            continue
+
+        def fit():
+            parameters = fit_method(method, Y, calendar, **hyperparameters)
+            predictions = predict_method(method, parameters, Y.shape[1], horizon_dates, **hyperparameters)
+            return {'parameters': parameters,
+                    'forecast': forecast_frame(keys, horizon_dates, predictions, method_label(method, **hyperparameters))}
+
+        if fingerprint is not None and series_id is not None:
+            payload = FORECAST_CACHE.get_or_compute(series_id, method, dict(hyperparameters, periods=periods),
+                                                    fingerprint, fit)
+        else:
+            payload = fit()
+        frames.append(payload['forecast'])
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def get_batch_forecasts(periods=6, target_column='monthly_sales', methods=DEFAULT_METHODS):
+    """Forecasts for every region x category x sub-category series"""
+    fingerprint = data_fingerprint()
+    series_id = f"all_series:{target_column}"
+    series = FORECAST_CACHE.get(series_id, 'history', {}, fingerprint) if fingerprint else None
+    if series is None:
+        series = load_series(target_column)
+        if fingerprint and series[2].size:
+            FORECAST_CACHE.put(series_id, 'history', {}, fingerprint, series)
+    keys, calendar, Y = series
+    if Y.size == 0:
+        return pd.DataFrame()
+    forecasts = batch_forecast(keys, calendar, Y, periods, methods, fingerprint, series_id)
+    forecasts['target'] = target_column
+    return forecasts
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Forecast every region x category x sub-category series")
+    parser.add_argument('--periods', type=int, default=6, help="Months to forecast")
+    parser.add_argument('--target', default='monthly_sales', choices=['monthly_sales', 'monthly_profit', 'monthly_orders'])
+    parser.add_argument('--output', help="Write the forecasts to this CSV file")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    start_time = time.time()
+    forecasts = get_batch_forecasts(args.periods, args.target)
+    print(f"{len(forecasts):,} forecast rows in {time.time() - start_time:.2f} seconds")
+    print(forecasts.head(12))
+    if args.output:
+        forecasts.to_csv(args.output, index=False)
@@ -0,0 +1,206 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from sql_statements import run_statement
+from timing_stats import summarize_timings
+from workload import BASE_DIR, collect_workload
+
+# Database connection details
+DB_CONFIG = {
+    'host': 'localhost',
+    'database': os.environ.get('RETAIL_SALES_DB', 'retail_sales'),
+    'user': 'root',
+    'password': 'root'
+}
+
+RESULTS_DIR = os.path.join(BASE_DIR, 'benchmarks')
+COLD_RUNS = 3
+WARM_RUNS = 20
+
+
+class MySQLBackend:
+    """Runs the workload against a MySQL server; every cold run opens a new connection"""
+    name = 'mysql'
+
+    def __init__(self, db_config):
+        self.db_config = db_config
+
+    def open(self):
+        import mysql.connector
+        return mysql.connector.connect(**self.db_config)
+
+    def run(self, session, sql, params):
+        return run_statement(session, sql, params)
+
+    def close(self, session):
+        session.close()
+
+    def supports(self, query):
+        return True
+
+
+class DuckDBBackend:
+    """Local stand-in: a DuckDB snapshot built from a Superstore CSV, queried in MySQL dialect.
+
+    A cold run loads a fresh engine, so it includes no state left by earlier queries.
+    """
+    name = 'duckdb'
+
+    def __init__(self, csv_path):
+        self.csv_path = csv_path
+
+    def open(self):
+        from local_engine import LocalAnalyticsEngine
+
+        engine = LocalAnalyticsEngine()
+        engine.load_from_csv(self.csv_path)
+        return engine
+
+    def run(self, session, sql, params):
+        return len(session.query(sql, params))
+
+    def close(self, session):
+        pass
+
+    def supports(self, query):
+        from local_engine import is_local_query
+
+        # The snapshot only holds the star schema, not the ETL rollups or the compact tables
+        return is_local_query(query['sql']) and not any(table in query['sql']
+                                                        for table in ('daily_sales_summary', 'monthly_sales_agg',
+                                                                      'cohort_retention', 'compact_', 'dim_'))
+
+
+def time_run(backend, session, query):
+    start_time = time.perf_counter()
+    rows = backend.run(session, query['sql'], query['params'])
+    return (time.perf_counter() - start_time) * 1000, rows
+
+
+def run_benchmark(backend, workload, cold_runs=COLD_RUNS, warm_runs=WARM_RUNS):
+    """Cold (first run on a fresh session) and warm (repeated) timings for every query"""
+    results = []
+    for query in workload:
+        if not backend.supports(query):
+            continue
+        result = {'query': query['name'], 'source': query['source']}
+        try:
+            cold_timings = []
+            for _ in range(cold_runs):
+                session = backend.open()
+                try:
+                    elapsed_ms, rows = time_run(backend, session, query)
+                finally:
+                    backend.close(session)
+                cold_timings.append(elapsed_ms)
+
+            session = backend.open()
+            try:
+                time_run(backend, session, query)  # warm-up, not recorded
+                warm_timings = []
+                for _ in range(warm_runs):
+                    elapsed_ms, rows = time_run(backend, session, query)
+                    warm_timings.append(elapsed_ms)
+            finally:
+                backend.close(session)
+
+            result.update({'rows': rows, 'cold': summarize_timings(cold_timings),
+                           'warm': summarize_timings(warm_timings)})
+            print(f"{query['name'][:40]:<40} cold p50 {result['cold']['p50_ms']:9.2f} ms   "
+                  f"warm p50 {result['warm']['p50_ms']:9.2f} ms   p99 {result['warm']['p99_ms']:9.2f} ms")
+        except Exception as err:
+            result['error'] = str(err)
+            print(f"{query['name'][:40]:<40} error: {err}")
+        results.append(result)
+    return results
+
+
+def run_metadata(backend, cold_runs, warm_runs):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'backend': backend.name,
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'host': platform.node(),
+        'cold_runs': cold_runs,
+        'warm_runs': warm_runs,
+    }
+
+
+def write_results(metadata, results, output=None):
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output = os.path.join(RESULTS_DIR, f"benchmark_{metadata['backend']}_{stamp}.json")
+    with open(output, 'w') as f:
+        json.dump({'metadata': metadata, 'results': results}, f, indent=2, default=str)
+    print(f"\nResults written to {output}")
+    return output
+
+
+def compare_results(baseline_path, current_path):
+    """Warm p50/p95 of two result files side by side"""
+    def load(path):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return {r['query']: r for r in data['results'] if 'warm' in r}
+
+    baseline, current = load(baseline_path), load(current_path)
+    rows = []
+    for name in current:
+        if name in baseline:
+            rows.append({
+                'query': name,
+                'baseline_p50_ms': baseline[name]['warm']['p50_ms'],
+                'current_p50_ms': current[name]['warm']['p50_ms'],
+                'p50_ratio': current[name]['warm']['p50_ms'] / baseline[name]['warm']['p50_ms'],
+                'baseline_p95_ms': baseline[name]['warm']['p95_ms'],
+                'current_p95_ms': current[name]['warm']['p95_ms'],
+            })
+    comparison = pd.DataFrame(rows)
+    print(comparison.to_string(index=False))
+    return comparison
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark every query issued by the dashboard, analysis_queries.sql and forecasting")
+    parser.add_argument('--backend', choices=['mysql', 'duckdb'], default='mysql',
+                        help="Run against MySQL or a local DuckDB stand-in built from --csv")
+    parser.add_argument('--csv', default=os.path.join(BASE_DIR, 'Sample-Superstore.csv'), help="CSV for the duckdb backend")
+    parser.add_argument('--cold-runs', type=int, default=COLD_RUNS, help="Runs on a fresh connection or engine")
+    parser.add_argument('--warm-runs', type=int, default=WARM_RUNS, help="Repeated runs on one warmed-up session")
+    parser.add_argument('--output', help="Result JSON path (default: benchmarks/benchmark_<backend>_<time>.json)")
+    parser.add_argument('--compare', metavar='BASELINE_JSON', help="Compare this run with an earlier result file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.backend == 'mysql':
+        backend = MySQLBackend(DB_CONFIG)
+        workload = collect_workload(include_procedures=True)
+    else:
+        backend = DuckDBBackend(args.csv)
+        workload = collect_workload()
+
+    results = run_benchmark(backend, workload, args.cold_runs, args.warm_runs)
+    output = write_results(run_metadata(backend, args.cold_runs, args.warm_runs), results, args.output)
+    if args.compare:
+        print()
+        compare_results(args.compare, output)
+
+
+if __name__ == "__main__":
+    main()
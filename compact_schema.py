@@ -0,0 +1,117 @@
+import os
+
+import pandas as pd
+
+from etl_script import BATCH_SIZE, upsert_in_batches
+
+# Database the compact load creates and fills from schema_compact.sql. It follows
+# RETAIL_SALES_DB like every other module, with its own default so a plain
+# `--compact` run never lands in the retail_sales database.
+COMPACT_DATABASE = os.environ.get('RETAIL_SALES_DB', 'retail_sales_compact')
+
+# (table, key column, natural key columns, attribute columns) in load order;
+# every table only references keys of tables loaded before it
+COMPACT_DIMENSIONS = [
+    ('dim_region', 'region_key', ['region'], []),
+    ('dim_segment', 'segment_key', ['segment'], []),
+    ('dim_ship_mode', 'ship_mode_key', ['ship_mode'], []),
+    ('dim_category', 'category_key', ['category'], []),
+    ('dim_sub_category', 'sub_category_key', ['sub_category', 'category_key'], []),
+    ('dim_location', 'location_key', ['country', 'state', 'city', 'postal_code', 'region_key'], []),
+    ('dim_customer', 'customer_key', ['customer_id'], ['customer_name', 'segment_key']),
+    ('compact_products', 'product_key', ['product_id'], ['sub_category_key', 'product_name']),
+    ('compact_orders', 'order_key', ['order_id'], ['order_date', 'ship_date', 'ship_mode_key', 'customer_key', 'location_key']),
+]
+
+COMPACT_SALES_INSERT_QUERY = """
+INSERT INTO compact_sales (row_id, order_key, product_key, sales, quantity, discount, profit)
+VALUES (%s, %s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+order_key = VALUES(order_key),
+product_key = VALUES(product_key),
+sales = VALUES(sales),
+quantity = VALUES(quantity),
+discount = VALUES(discount),
+profit = VALUES(profit);
+"""
+
+
+def normalize_source_frame(df):
+    """Rename the CSV columns to schema column names and fix natural key types"""
+    frame = df.rename(columns=lambda column: column.lower().replace(' ', '_').replace('-', '_'))
+    frame['postal_code'] = frame['postal_code'].fillna('').astype(str).str.replace(r'\.0$', '', regex=True)
+    frame['order_date'] = frame['order_date'].dt.date
+    frame['ship_date'] = frame['ship_date'].dt.date
+    return frame
+
+
+def fetch_key_map(connection, table, key_column, natural_columns, natural_df):
+    """Surrogate keys for the given natural keys, looked up in batches through the unique index"""
+    cursor = connection.cursor()
+    rows = []
+    records = list(natural_df[natural_columns].itertuples(index=False, name=None))
+    row_placeholder = f"({', '.join(['%s'] * len(natural_columns))})"
+    for start in range(0, len(records), BATCH_SIZE):
+        batch = records[start:start + BATCH_SIZE]
+        cursor.execute(
+            f"SELECT {', '.join(natural_columns)}, {key_column} FROM {table} "
+            f"WHERE ({', '.join(natural_columns)}) IN ({', '.join([row_placeholder] * len(batch))})",
+            [value for record in batch for value in record]
+        )
+        rows.extend(cursor.fetchall())
+    cursor.close()
+    key_map = pd.DataFrame(rows, columns=natural_columns + [key_column])
+    # Match the dtypes of the frame so the merge lines up
+    for column in natural_columns:
+        key_map[column] = key_map[column].astype(natural_df[column].dtype)
+    return key_map
+
+
+def upsert_and_map(connection, table, key_column, natural_columns, attribute_columns, frame, batch_size=BATCH_SIZE):
+    """Maintain one surrogate-keyed table and return frame with its key column added.
+
+    New natural keys are inserted without a key so MySQL assigns one. Existing rows
+    are updated with their known key, which does not consume AUTO_INCREMENT values;
+    plain INSERT IGNORE would burn ids and overflow the TINYINT dictionaries.
+    """
+    rows = frame[natural_columns + attribute_columns].drop_duplicates(subset=natural_columns)
+    known = fetch_key_map(connection, table, key_column, natural_columns, rows)
+    rows = rows.merge(known, on=natural_columns, how='left')
+
+    new_rows = rows[rows[key_column].isna()]
+    if not new_rows.empty:
+        columns = natural_columns + attribute_columns
+        upsert_in_batches(
+            connection,
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})",
+            new_rows[columns], batch_size
+        )
+
+    existing_rows = rows[rows[key_column].notna()]
+    if attribute_columns and not existing_rows.empty:
+        columns = [key_column] + natural_columns + attribute_columns
+        updates = ', '.join(f"{column} = VALUES({column})" for column in attribute_columns)
+        upsert_in_batches(
+            connection,
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))}) "
+            f"ON DUPLICATE KEY UPDATE {updates}",
+            existing_rows[columns].astype({key_column: 'int64'}), batch_size
+        )
+
+    key_map = pd.concat([known, fetch_key_map(connection, table, key_column, natural_columns, new_rows)]) \
+        if not new_rows.empty else known
+    key_map[key_column] = key_map[key_column].astype('int64')
+    return frame.merge(key_map, on=natural_columns, how='left')
+
+
+def load_compact_data_to_db(df, connection, batch_size=BATCH_SIZE):
+    """Load the flat CSV frame into the compact schema, maintaining the surrogate key mapping"""
+    frame = normalize_source_frame(df)
+    for table, key_column, natural_columns, attribute_columns in COMPACT_DIMENSIONS:
+        frame = upsert_and_map(connection, table, key_column, natural_columns, attribute_columns, frame, batch_size)
+        print(f"{table}: {frame[key_column].nunique():,} keys mapped")
+
+    sales = frame[['row_id', 'order_key', 'product_key', 'sales', 'quantity', 'discount', 'profit']]
+    loaded = upsert_in_batches(connection, COMPACT_SALES_INSERT_QUERY, sales, batch_size)
+    print(f"compact_sales: {loaded:,} rows loaded")
+    return frame
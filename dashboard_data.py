@@ -0,0 +1,163 @@
+import os
+import time
+
+import pandas as pd
+import streamlit as st
+
+from db_pool import get_pool
+from local_engine import get_local_engine, is_local_query
+from named_queries import NAMED_QUERIES, execute_named_query, named_query_sql
+from query_cache import RESULT_CACHE, data_version as database_version
+from rollups import cohort_retention_available, daily_summary_available, monthly_agg_available
+from telemetry import TELEMETRY
+
+# Database connection details
+DB_CONFIG = {
+    'host': 'localhost',
+    'database': os.environ.get('RETAIL_SALES_DB', 'retail_sales'),
+    'user': 'root',
+    'password': 'root'
+}
+
+# "mysql" sends every widget query to the server; "local" answers page queries from an
+# in-process DuckDB snapshot loaded from MySQL, or from a CSV path in LOCAL_ENGINE_SOURCE
+DASHBOARD_ENGINE = os.environ.get('DASHBOARD_ENGINE', 'mysql')
+LOCAL_ENGINE_SOURCE = os.environ.get('LOCAL_ENGINE_SOURCE', 'mysql')
+
+def load_local_snapshot(engine):
+    """Fill the local engine from MySQL or, when configured, from a CSV extract"""
+    if LOCAL_ENGINE_SOURCE == 'mysql':
+        with get_pool(DB_CONFIG).connection() as connection:
+            engine.load_from_mysql(connection)
+    else:
+        engine.load_from_csv(LOCAL_ENGINE_SOURCE)
+
+def local_engine():
+    """Local engine when the dashboard runs in local mode, else None"""
+    if DASHBOARD_ENGINE != 'local':
+        return None
+    return get_local_engine(load_local_snapshot)
+
+def current_data_version():
+    """ETL completion and sales_log marks used to invalidate cached query results"""
+    try:
+        with get_pool(DB_CONFIG).connection() as connection:
+            return database_version(connection)
+    except Exception:
+        return None
+
+def fetch_data_from_db(query):
+    """Execute SQL query and return DataFrame; raises on failure and never calls st.*"""
+    with TELEMETRY.track('get_data_from_db', query) as event:
+        if DASHBOARD_ENGINE == 'local' and is_local_query(query):
+            try:
+                df = local_engine().query(query)
+            except Exception as e:
+                raise RuntimeError(f"Local engine error: {e}") from e
+            event['rows'] = len(df)
+            return df
+
+        version = RESULT_CACHE.current_version(current_data_version)
+        cached_df = RESULT_CACHE.get(query, version)
+        if cached_df is not None:
+            event.update(cache_hit=True, rows=len(cached_df))
+            return cached_df.copy()
+        try:
+            checkout_start = time.perf_counter()
+            with get_pool(DB_CONFIG).connection() as connection:
+                event['pool_wait'] = time.perf_counter() - checkout_start
+                df = pd.read_sql(query, connection)
+        except Exception as e:
+            raise RuntimeError(f"Database connection error: {e}") from e
+        event['rows'] = len(df)
+        RESULT_CACHE.put(query, df, version)
+        return df.copy()
+
+def get_data_from_db(query):
+    """Execute SQL query and return DataFrame"""
+    try:
+        return fetch_data_from_db(query)
+    except Exception as e:
+        st.error(str(e))
+        return pd.DataFrame()
+
+def fetch_named_query(name, params=()):
+    """Execute a named query as a prepared statement; raises on failure and never calls st.*"""
+    params = tuple(params)
+    # The local engine holds the star schema, so it always gets the standard SQL
+    sql = NAMED_QUERIES[name] if DASHBOARD_ENGINE == 'local' else named_query_sql(name)
+    with TELEMETRY.track('run_named_query', sql) as event:
+        if DASHBOARD_ENGINE == 'local':
+            try:
+                df = local_engine().query(sql, params)
+            except Exception as e:
+                raise RuntimeError(f"Local engine error: {e}") from e
+            event['rows'] = len(df)
+            return df
+
+        cache_key = ('named', name, params)
+        version = RESULT_CACHE.current_version(current_data_version)
+        cached_df = RESULT_CACHE.get(cache_key, version)
+        if cached_df is not None:
+            event.update(cache_hit=True, rows=len(cached_df))
+            return cached_df.copy()
+        try:
+            checkout_start = time.perf_counter()
+            with get_pool(DB_CONFIG).connection() as connection:
+                event['pool_wait'] = time.perf_counter() - checkout_start
+                df = execute_named_query(connection, name, params)
+        except Exception as e:
+            raise RuntimeError(f"Database connection error: {e}") from e
+        event['rows'] = len(df)
+        RESULT_CACHE.put(cache_key, df, version)
+        return df.copy()
+
+def run_named_query(name, params=()):
+    """Execute a named query as a prepared statement and return DataFrame"""
+    try:
+        return fetch_named_query(name, params)
+    except Exception as e:
+        st.error(str(e))
+        return pd.DataFrame()
+
+def fetch_page_data(plan, renderers):
+    """Run a page's fetch plan and render each widget from the script thread as its data arrives"""
+    for name, df, error in plan.run():
+        if error is not None:
+            st.error(str(error))
+            df = pd.DataFrame()
+        renderers[name](df)
+
+@st.cache_data(ttl=300)
+def daily_rollup_available():
+    """Whether date-range aggregates can be answered from daily_sales_summary"""
+    if DASHBOARD_ENGINE == 'local':
+        # The snapshot only holds the star schema; local scans are cheap anyway
+        return False
+    try:
+        with get_pool(DB_CONFIG).connection() as connection:
+            return daily_summary_available(connection)
+    except Exception:
+        return False
+
+@st.cache_data(ttl=300)
+def monthly_agg_ready():
+    """Whether the monthly trend can be read from monthly_sales_agg"""
+    if DASHBOARD_ENGINE == 'local':
+        return False
+    try:
+        with get_pool(DB_CONFIG).connection() as connection:
+            return monthly_agg_available(connection)
+    except Exception:
+        return False
+
+@st.cache_data(ttl=300)
+def cohort_matrix_ready():
+    """Whether the retention heatmap can be read from cohort_retention"""
+    if DASHBOARD_ENGINE == 'local':
+        return False
+    try:
+        with get_pool(DB_CONFIG).connection() as connection:
+            return cohort_retention_available(connection)
+    except Exception:
+        return False
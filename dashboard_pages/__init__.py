@@ -0,0 +1,30 @@
+import importlib
+import sys
+import time
+
+from startup_profiler import STARTUP_PROFILE
+
+# Sidebar label -> page module in this package. A page module, and whatever it imports
+# (plotly, the query profiler, the editor guard), is only loaded when the page is first
+# opened; every module exposes show().
+PAGES = {
+    "📊 Overview": 'overview',
+    "💰 Sales Analysis": 'sales_analysis',
+    "📦 Product Analysis": 'product_analysis',
+    "👤 Customer Analysis": 'customer_analysis',
+    "🌍 Regional Analysis": 'regional_analysis',
+    "🔍 SQL Query Editor": 'sql_editor',
+    "📈 Advanced Analytics": 'advanced_analytics',
+    "⚡ Performance Monitor": 'performance_monitor',
+}
+
+
+def load_page(label):
+    """Page module for a sidebar label, imported on first use"""
+    module_name = f"{__name__}.{PAGES[label]}"
+    module = sys.modules.get(module_name)
+    if module is None:
+        start_time = time.perf_counter()
+        module = importlib.import_module(module_name)
+        STARTUP_PROFILE.record_page_import(label, time.perf_counter() - start_time)
+    return module
@@ -0,0 +1,55 @@
+import streamlit as st
+import plotly.express as px
+from dashboard_data import cohort_matrix_ready, fetch_named_query, fetch_page_data
+from fetch_planner import FetchPlan
+
+def show():
+    st.header("📈 Advanced Analytics")
+    
+    # Customer Lifetime Value Analysis
+    st.subheader("💎 Customer Lifetime Value Analysis")
+    clv_container = st.container()
+    
+    # Cohort Analysis
+    st.subheader("👥 Customer Cohort Analysis")
+    cohort_container = st.container()
+
+    def render_clv(clv_df):
+        if clv_df.empty:
+            return
+        col1, col2 = clv_container.columns(2)
+        
+        with col1:
+            fig = px.scatter(
+                clv_df, 
+                x='average_order_value', 
+                y='estimated_annual_value',
+                size='total_orders',
+                hover_name='customer_name',
+                title='Customer Value Analysis'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            st.dataframe(clv_df[['customer_name', 'total_sales', 'estimated_annual_value']], use_container_width=True)
+
+    def render_cohorts(cohort_df):
+        if cohort_df.empty:
+            return
+        # Create cohort heatmap
+        cohort_pivot = cohort_df.pivot(index='cohort_month', columns='order_month', values='retention_rate')
+        
+        fig = px.imshow(
+            cohort_pivot.values,
+            x=cohort_pivot.columns,
+            y=cohort_pivot.index,
+            title='Customer Retention Heatmap (%)',
+            color_continuous_scale='Blues'
+        )
+        cohort_container.plotly_chart(fig, use_container_width=True)
+
+    plan = FetchPlan()
+    plan.add('clv', fetch_named_query, 'customer_lifetime_value')
+    # The ETL-maintained matrix is a few hundred rows; the cohort query is the fallback
+    plan.add('cohorts', fetch_named_query, 'cohort_retention_matrix' if cohort_matrix_ready() else 'cohort_retention')
+    fetch_page_data(plan, {'clv': render_clv, 'cohorts': render_cohorts})
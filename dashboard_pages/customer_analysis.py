@@ -0,0 +1,33 @@
+import streamlit as st
+import plotly.express as px
+from dashboard_data import run_named_query
+
+def show():
+    st.header("👤 Customer Analysis")
+    
+    # Customer segmentation using advanced SQL
+    st.subheader("🎯 Customer Segmentation")
+    
+    segmentation_df = run_named_query('customer_segmentation')
+    if not segmentation_df.empty:
+        # Customer segment distribution
+        segment_counts = segmentation_df['customer_segment'].value_counts()
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            fig = px.pie(values=segment_counts.values, names=segment_counts.index,
+                        title='Customer Segment Distribution')
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            fig = px.scatter(
+                segmentation_df, 
+                x='order_frequency', 
+                y='total_sales',
+                color='customer_segment',
+                hover_name='customer_name',
+                title='Customer Segmentation Analysis'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        
+        st.dataframe(segmentation_df, use_container_width=True)
@@ -0,0 +1,95 @@
+import streamlit as st
+import plotly.graph_objects as go
+from datetime import datetime
+from dashboard_data import daily_rollup_available, fetch_named_query, fetch_page_data, monthly_agg_ready
+from fetch_planner import FetchPlan
+from named_queries import overview_kpi_params
+
+def get_overview_kpis(start_date, end_date, use_rollup):
+    """Current and prior-period KPIs for a date range from one aggregate pass, cached in RESULT_CACHE"""
+    name = 'overview_kpis_rollup' if use_rollup else 'overview_kpis'
+    return fetch_named_query(name, overview_kpi_params(start_date, end_date))
+
+def delta_pct(current, prior):
+    """Change against the prior period as a metric delta, or None without a prior value"""
+    if not prior:
+        return None
+    return f"{(current - prior) / abs(prior):+.1%}"
+
+def show():
+    st.header("📈 Sales Overview")
+    
+    # Date range filter
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("Start Date", value=datetime(2014, 1, 1))
+    with col2:
+        end_date = st.date_input("End Date", value=datetime(2017, 12, 31))
+    
+    # Key metrics with date filter
+    col1, col2, col3, col4 = st.columns(4)
+
+    st.markdown("---")
+
+    # Monthly Sales Trend using view
+    st.subheader("📅 Monthly Sales & Profit Trend")
+    trend_container = st.container()
+
+    def render_kpis(kpi_df):
+        total_sales = total_profit = total_orders = 0
+        prior_sales = prior_profit = prior_orders = 0
+        if not kpi_df.empty:
+            kpis = kpi_df.iloc[0].fillna(0)
+            total_sales, total_profit, total_orders = kpis['total_sales'], kpis['total_profit'], int(kpis['total_orders'])
+            prior_sales, prior_profit, prior_orders = kpis['prior_sales'], kpis['prior_profit'], int(kpis['prior_orders'])
+            # Deltas compare with the equally long period right before the selected range
+            col1.metric("Total Sales", f"${total_sales:,.2f}", delta=delta_pct(total_sales, prior_sales))
+            col2.metric("Total Profit", f"${total_profit:,.2f}", delta=delta_pct(total_profit, prior_profit))
+            col3.metric("Total Orders", f"{total_orders:,}", delta=delta_pct(total_orders, prior_orders))
+        
+        # Average Order Value
+        if total_orders > 0 and total_sales > 0:
+            avg_order_value = total_sales / total_orders
+            prior_order_value = prior_sales / prior_orders if prior_orders else 0
+            col4.metric("Avg Order Value", f"${avg_order_value:,.2f}", delta=delta_pct(avg_order_value, prior_order_value))
+
+    def render_trend(monthly_trend_df):
+        if monthly_trend_df.empty:
+            return
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=monthly_trend_df['sales_month'], 
+            y=monthly_trend_df['monthly_sales'],
+            mode='lines+markers',
+            name='Sales',
+            line=dict(color='blue', width=3)
+        ))
+        fig.add_trace(go.Scatter(
+            x=monthly_trend_df['sales_month'], 
+            y=monthly_trend_df['monthly_profit'],
+            mode='lines+markers',
+            name='Profit',
+            line=dict(color='green', width=3),
+            yaxis='y2'
+        ))
+        
+        fig.update_layout(
+            title='Monthly Sales and Profit Trend',
+            xaxis_title='Month',
+            yaxis=dict(title='Sales ($)', side='left'),
+            yaxis2=dict(title='Profit ($)', side='right', overlaying='y'),
+            hovermode='x unified'
+        )
+        trend_container.plotly_chart(fig, use_container_width=True)
+
+    # Sales, profit and order count for the range and the prior period from a single scan, fetched
+    # together with the trend; both come from the rollups once they are populated
+    use_rollup = daily_rollup_available()
+    if monthly_agg_ready():
+        trend_query = 'monthly_trend_agg'
+    else:
+        trend_query = 'monthly_trend_rollup' if use_rollup else 'monthly_trend'
+    plan = FetchPlan()
+    plan.add('kpis', get_overview_kpis, start_date, end_date, use_rollup)
+    plan.add('trend', fetch_named_query, trend_query)
+    fetch_page_data(plan, {'kpis': render_kpis, 'trend': render_trend})
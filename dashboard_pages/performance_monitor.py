@@ -0,0 +1,217 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from datetime import datetime, timedelta
+from db_pool import get_pool, all_pool_stats
+from dashboard_data import DB_CONFIG, get_data_from_db
+from query_cache import RESULT_CACHE
+from telemetry import TELEMETRY
+from query_guard import get_query_guard
+from query_profiler import PROFILE_RUNS, load_profile_history, profile_query, save_profile
+from startup_profiler import RERUN_BUDGET_MS, STARTUP_PROFILE
+
+def show():
+    st.header("⚡ Performance Monitor")
+    
+    # Database statistics
+    st.subheader("📊 Database Statistics")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    # Table sizes
+    table_stats_query = """
+    SELECT 
+        table_name,
+        table_rows,
+        ROUND(((data_length + index_length) / 1024 / 1024), 2) AS size_mb
+    FROM information_schema.tables 
+    WHERE table_schema = DATABASE()
+    ORDER BY size_mb DESC;
+    """
+    
+    table_stats_df = get_data_from_db(table_stats_query)
+    if not table_stats_df.empty:
+        with col1:
+            st.metric("Total Tables", len(table_stats_df))
+        with col2:
+            total_rows = table_stats_df['table_rows'].sum()
+            st.metric("Total Rows", f"{total_rows:,}")
+        with col3:
+            total_size = table_stats_df['size_mb'].sum()
+            st.metric("Total Size", f"{total_size:.2f} MB")
+        
+        st.subheader("📋 Table Statistics")
+        st.dataframe(table_stats_df, use_container_width=True)
+    
+    # Connection pool statistics
+    st.subheader("🔌 Connection Pool")
+    pool_stats = get_pool(DB_CONFIG).stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Open Connections", f"{pool_stats['open_connections']} / {pool_stats['size']}")
+    col2.metric("In Use", pool_stats['in_use_connections'])
+    col3.metric("Checkouts", f"{pool_stats['checkouts']:,}")
+    col4.metric("Avg Wait", f"{pool_stats['avg_wait_time'] * 1000:.1f} ms")
+    st.dataframe(pd.DataFrame(all_pool_stats()), use_container_width=True)
+    
+    # SQL editor guard
+    st.subheader("🛡️ SQL Editor Guard")
+    guard_stats = get_query_guard(DB_CONFIG).stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Running", guard_stats['running'])
+    col2.metric("Completed", f"{guard_stats['completed']:,}")
+    col3.metric("Cancelled / Timed Out", f"{guard_stats['cancelled']} / {guard_stats['timed_out']}")
+    col4.metric("Rejected", guard_stats['rejected'])
+    running_df = pd.DataFrame(get_query_guard(DB_CONFIG).running_queries())
+    if not running_df.empty:
+        st.dataframe(running_df, use_container_width=True)
+    
+    # Result cache statistics
+    st.subheader("🗄️ Query Result Cache")
+    cache_stats = RESULT_CACHE.stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Hit Rate", f"{cache_stats['hit_rate']:.1%}")
+    col2.metric("Hits / Misses", f"{cache_stats['hits']:,} / {cache_stats['misses']:,}")
+    col3.metric("Cached Results", cache_stats['entries'])
+    etl_mark, log_mark = cache_stats['version'] or (None, None)
+    col4.metric("Last ETL Run", str(etl_mark) if etl_mark is not None else "n/a",
+                help=f"sales_log mark: {log_mark if log_mark is not None else 'n/a'}")
+    if st.button("🧹 Clear Result Cache"):
+        RESULT_CACHE.clear()
+        st.success("Result cache cleared")
+    
+    # Live query telemetry
+    st.subheader("📡 Live Query Telemetry")
+    telemetry_df = pd.DataFrame(TELEMETRY.summary())
+    if telemetry_df.empty:
+        st.info("No queries recorded yet. Browse the other pages to collect telemetry.")
+    else:
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Queries", f"{telemetry_df['calls'].sum():,}")
+        col2.metric("Cache Hit Rate", f"{telemetry_df['cache_hits'].sum() / telemetry_df['calls'].sum():.1%}")
+        col3.metric("Query Time", f"{telemetry_df['total_latency'].sum():.2f} s")
+        col4.metric("Pool Wait", f"{telemetry_df['total_pool_wait'].sum() * 1000:.1f} ms")
+        
+        page_df = telemetry_df.groupby('page', as_index=False)['total_latency'].sum()
+        fig = px.bar(page_df, x='page', y='total_latency', title='Query Time by Page',
+                     labels={'page': 'Page', 'total_latency': 'Total Query Time (s)'})
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(telemetry_df[['page', 'source', 'fingerprint', 'query', 'calls', 'errors', 'hit_rate',
+                                   'rows', 'avg_latency_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'avg_pool_wait_ms']],
+                     use_container_width=True)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.download_button("📥 Prometheus Metrics", TELEMETRY.prometheus_text(),
+                           file_name="dashboard_queries.prom", mime="text/plain")
+    with col2:
+        st.download_button("📥 JSON Lines Events", TELEMETRY.json_lines(),
+                           file_name="dashboard_queries.jsonl", mime="application/x-ndjson")
+    with col3:
+        if st.button("🧹 Reset Telemetry"):
+            TELEMETRY.reset()
+            st.success("Telemetry reset")
+    
+    # Page imports and per-rerun script overhead in this process
+    st.subheader("🚦 Start-up Profile")
+    rerun_df = pd.DataFrame(STARTUP_PROFILE.reruns())
+    if not rerun_df.empty:
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Reruns Recorded", len(rerun_df))
+        col2.metric("Median Rerun Overhead", f"{rerun_df['overhead_ms'].median():.1f} ms",
+                    help=f"Script time before the page renders; budget {RERUN_BUDGET_MS:.0f} ms")
+        col3.metric("Median Page Render", f"{rerun_df['render_ms'].median():.0f} ms")
+        st.dataframe(rerun_df.groupby('page', as_index=False)[['overhead_ms', 'render_ms']].median(),
+                     use_container_width=True)
+    st.dataframe(pd.DataFrame(STARTUP_PROFILE.page_imports()), use_container_width=True)
+    st.caption("Run `python3 startup_profiler.py` for cold-start import timings against the budget.")
+    
+    # Query performance testing
+    st.subheader("🏃‍♂️ Query Performance Testing")
+    
+    performance_queries = {
+        "Simple Aggregation": "SELECT COUNT(*) FROM sales;",
+        "Join Query": "SELECT COUNT(*) FROM sales s JOIN orders o ON s.order_id = o.order_id;",
+        "Complex Aggregation": "SELECT region, SUM(sales) FROM sales s JOIN orders o ON s.order_id = o.order_id GROUP BY region;",
+        "View Query": "SELECT COUNT(*) FROM sales_by_category_view;",
+        "Stored Procedure": "CALL GetTopNProductsBySales(5);"
+    }
+    
+    runs = st.slider("Runs per query", min_value=3, max_value=50, value=PROFILE_RUNS)
+    if st.button("🚀 Run Performance Tests"):
+        results = []
+        plans = {}
+        
+        try:
+            with get_pool(DB_CONFIG).connection() as connection:
+                for query_name, query in performance_queries.items():
+                    with st.spinner(f"Testing {query_name}..."):
+                        try:
+                            profile = profile_query(connection, query_name, query, runs=runs)
+                        except Exception as e:
+                            results.append({'Query Type': query_name, 'Status': f"Error: {e}"})
+                            continue
+                        try:
+                            save_profile(connection, profile)
+                        except Exception as e:
+                            st.warning(f"Could not record history for {query_name}: {e}")
+                        plans[query_name] = profile['plan']
+                        timings = profile['timings']
+                        results.append({
+                            'Query Type': query_name,
+                            'p50 (ms)': timings['p50_ms'],
+                            'p95 (ms)': timings['p95_ms'],
+                            'p99 (ms)': timings['p99_ms'],
+                            'Rows': profile['rows_returned'],
+                            'Bytes Sent': profile['bytes_sent'],
+                            'Handler Reads': profile['handler_reads'],
+                            'Temp Tables (disk)': f"{profile['tmp_tables']} ({profile['tmp_disk_tables']})",
+                            'Sort Rows': profile['sort_rows'],
+                            'Status': 'Success'
+                        })
+        except Exception as e:
+            st.error(f"Database connection error: {e}")
+        
+        results_df = pd.DataFrame(results)
+        st.dataframe(results_df, use_container_width=True)
+        
+        # Performance chart
+        if 'p50 (ms)' in results_df:
+            chart_df = results_df.dropna(subset=['p50 (ms)']).melt(
+                id_vars='Query Type', value_vars=['p50 (ms)', 'p95 (ms)', 'p99 (ms)'],
+                var_name='Percentile', value_name='Latency (ms)'
+            )
+            fig = px.bar(
+                chart_df, 
+                x='Query Type', 
+                y='Latency (ms)',
+                color='Percentile',
+                barmode='group',
+                title=f'Query Latency over {runs} Runs'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        
+        for query_name, plan in plans.items():
+            with st.expander(f"EXPLAIN ANALYZE: {query_name}"):
+                st.code(plan or "Not available for stored procedure calls", language='text')
+    
+    # Profile history
+    st.subheader("📉 Performance History")
+    history_days = st.selectbox("History window:", [7, 30, 90], format_func=lambda days: f"Last {days} days")
+    try:
+        with get_pool(DB_CONFIG).connection() as connection:
+            history_df = load_profile_history(connection, datetime.now() - timedelta(days=history_days))
+    except Exception as e:
+        st.info(f"No profile history available ({e})")
+        history_df = pd.DataFrame()
+    
+    if not history_df.empty:
+        fig = px.line(history_df, x='profiled_at', y='p95_ms', color='query_name', markers=True,
+                      title='p95 Latency per Query',
+                      labels={'profiled_at': 'Profiled At', 'p95_ms': 'p95 (ms)', 'query_name': 'Query'})
+        plan_changes = history_df[history_df['plan_changed']]
+        if not plan_changes.empty:
+            fig.add_trace(go.Scatter(x=plan_changes['profiled_at'], y=plan_changes['p95_ms'], mode='markers',
+                                     marker=dict(symbol='x', size=12, color='black'), name='Plan changed'))
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(history_df, use_container_width=True)
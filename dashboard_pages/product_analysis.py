@@ -0,0 +1,24 @@
+import streamlit as st
+import plotly.express as px
+from dashboard_data import get_data_from_db
+
+def show():
+    st.header("📦 Product Analysis")
+    
+    # Top products using stored procedure
+    st.subheader("🏆 Top Products (Using Stored Procedure)")
+    
+    n_products = st.slider("Number of top products:", min_value=5, max_value=50, value=10)
+    
+    if st.button("🔍 Get Top Products"):
+        top_products_df = get_data_from_db(f"CALL GetTopNProductsBySales({n_products})")
+        if not top_products_df.empty:
+            fig = px.bar(
+                top_products_df, 
+                x='total_sales', 
+                y='product_name',
+                orientation='h',
+                title=f'Top {n_products} Products by Sales'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            st.dataframe(top_products_df, use_container_width=True)
@@ -0,0 +1,54 @@
+import streamlit as st
+import plotly.express as px
+from dashboard_data import run_named_query
+
+def show():
+    st.header("🌍 Regional Analysis")
+    
+    # Regional performance with stored procedure
+    st.subheader("🗺️ Regional Performance Analysis")
+    
+    regional_df = run_named_query('regional_performance')
+    if not regional_df.empty:
+        # Regional performance metrics
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            total_regions = regional_df['region'].nunique()
+            st.metric("Total Regions", total_regions)
+        
+        with col2:
+            total_states = regional_df['state'].nunique()
+            st.metric("Total States", total_states)
+        
+        with col3:
+            avg_profit_margin = regional_df['profit_margin_pct'].mean()
+            st.metric("Avg Profit Margin", f"{avg_profit_margin:.1f}%")
+        
+        with col4:
+            top_region = regional_df.groupby('region')['total_sales'].sum().idxmax()
+            st.metric("Top Region", top_region)
+        
+        # Regional visualizations
+        region_summary = regional_df.groupby('region').agg({
+            'total_sales': 'sum',
+            'total_profit': 'sum',
+            'unique_customers': 'sum',
+            'total_orders': 'sum'
+        }).reset_index()
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            fig = px.bar(region_summary, x='region', y='total_sales',
+                        title='Total Sales by Region')
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            fig = px.scatter(region_summary, x='total_sales', y='total_profit',
+                           size='unique_customers', hover_name='region',
+                           title='Sales vs Profit by Region')
+            st.plotly_chart(fig, use_container_width=True)
+        
+        st.subheader("📊 Detailed Regional Data")
+        st.dataframe(regional_df, use_container_width=True)
@@ -0,0 +1,88 @@
+import streamlit as st
+import plotly.express as px
+from dashboard_data import fetch_named_query, fetch_page_data
+from named_queries import filtered_sales_query
+from fetch_planner import FetchPlan
+
+def show():
+    st.header("💰 Sales Analysis")
+    
+    # Use views for better performance
+    st.subheader("📊 Sales by Category (Using SQL View)")
+    category_container = st.container()
+
+    # Advanced filtering
+    st.subheader("🔍 Advanced Sales Filtering")
+    filter_container = st.container()
+    results_container = st.container()
+
+    # Widget values are in session state before the script reruns, so the filtered
+    # aggregate does not have to wait for the filter options to be drawn
+    selected_region = st.session_state.get('sales_region', "All")
+    selected_category = st.session_state.get('sales_category', "All")
+    min_sales = st.session_state.get('sales_min_amount', 0.0)
+
+    # Each combination of set filters has its own prepared statement; None disables a filter
+    filtered_query, filtered_params = filtered_sales_query(
+        region=None if selected_region == "All" else selected_region,
+        category=None if selected_category == "All" else selected_category,
+        min_sales=min_sales if min_sales > 0 else None,
+    )
+
+    def render_categories(category_df):
+        if category_df.empty:
+            return
+        col1, col2 = category_container.columns(2)
+        
+        with col1:
+            fig = px.bar(category_df, x='category', y='total_sales',
+                        title='Sales by Category',
+                        labels={'category': 'Category', 'total_sales': 'Total Sales ($)'})
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            fig = px.pie(category_df, values='total_sales', names='category',
+                        title='Sales Distribution by Category')
+            st.plotly_chart(fig, use_container_width=True)
+
+    def render_filtered(filtered_df):
+        if filtered_df.empty:
+            return
+        with results_container:
+            st.subheader("📈 Filtered Results")
+            st.dataframe(filtered_df, use_container_width=True)
+            
+            fig = px.treemap(
+                filtered_df, 
+                path=['region', 'category'], 
+                values='total_sales',
+                title='Sales Treemap by Region and Category'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+    filter_options = {}
+
+    def collect_options(column):
+        def collect(options_df):
+            filter_options[column] = list(options_df[column]) if not options_df.empty else []
+        return collect
+
+    plan = FetchPlan()
+    plan.add('categories', fetch_named_query, 'sales_by_category')
+    plan.add('regions', fetch_named_query, 'distinct_regions')
+    plan.add('category_options', fetch_named_query, 'distinct_categories')
+    plan.add('filtered', fetch_named_query, filtered_query, filtered_params)
+    fetch_page_data(plan, {
+        'categories': render_categories,
+        'regions': collect_options('region'),
+        'category_options': collect_options('category'),
+        'filtered': render_filtered,
+    })
+
+    col1, col2, col3 = filter_container.columns(3)
+    with col1:
+        st.selectbox("Select Region:", ["All"] + filter_options['region'], key='sales_region')
+    with col2:
+        st.selectbox("Select Category:", ["All"] + filter_options['category'], key='sales_category')
+    with col3:
+        st.number_input("Minimum Sales Amount:", min_value=0.0, value=0.0, key='sales_min_amount')
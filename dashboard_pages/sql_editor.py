@@ -0,0 +1,233 @@
+import streamlit as st
+import plotly.express as px
+from datetime import datetime
+import os
+import time
+import uuid
+from db_pool import get_pool
+from dashboard_data import DB_CONFIG
+from telemetry import TELEMETRY
+from query_guard import ConcurrencyLimitError, describe_interruption, get_query_guard
+from result_streaming import (EDITOR_ROW_CAP, PAGE_SIZE, export_query_to_csv, purge_expired_exports,
+                              run_streaming_query)
+
+def execute_custom_query(query, row_cap=EDITOR_ROW_CAP, pool=None, before_execute=None, after_execute=None):
+    """Execute custom SQL query and return results, keeping at most row_cap rows"""
+    with TELEMETRY.track('execute_custom_query', query) as event:
+        try:
+            result = run_streaming_query(pool or get_pool(DB_CONFIG), query, row_cap,
+                                         before_execute=before_execute, after_execute=after_execute)
+            event.update(rows=result['rows'], pool_wait=result['pool_wait'])
+            if result['df'] is not None:
+                return result['df'], result['execution_time'], None, result['truncated']
+            return None, result['execution_time'], f"Query executed successfully. {result['rows']} rows affected.", False
+        except Exception as e:
+            event['error'] = str(e)
+            return None, 0, f"Error: {str(e)}", False
+
+def editor_session_id():
+    """Stable id of this browser session, used for the editor's concurrency limit"""
+    if 'editor_session_id' not in st.session_state:
+        st.session_state.editor_session_id = uuid.uuid4().hex
+    return st.session_state.editor_session_id
+
+def discard_export():
+    """Remove the SQL editor's temporary CSV export, if any"""
+    export = st.session_state.pop('editor_export', None)
+    if export is not None and os.path.exists(export['path']):
+        os.remove(export['path'])
+
+def export_reader(path):
+    """Download payload for an export; the file is only read once the button is clicked"""
+    def read():
+        with open(path, 'rb') as f:
+            return f.read()
+    return read
+
+def show():
+    # Exports are dropped on a TTL, also those of sessions that were never closed
+    purge_expired_exports()
+    export = st.session_state.get('editor_export')
+    if export is not None and not os.path.exists(export['path']):
+        del st.session_state.editor_export
+
+    st.header("🔍 SQL Query Editor")
+    st.markdown("Execute custom SQL queries against the retail sales database.")
+    
+    # Query templates
+    st.subheader("📋 Query Templates")
+    template_options = {
+        "Custom Query": "",
+        "Sales by Category (View)": "SELECT * FROM sales_by_category_view;",
+        "Monthly Trends (View)": "SELECT * FROM monthly_sales_profit_view;",
+        "Top 10 Products (Stored Procedure)": "CALL GetTopNProductsBySales(10);",
+        "Customer Lifetime Value (CTE)": """
+WITH CustomerSales AS (
+    SELECT
+        o.customer_id,
+        o.customer_name,
+        SUM(s.sales) AS total_sales,
+        COUNT(DISTINCT s.order_id) AS total_orders
+    FROM sales s
+    JOIN orders o ON s.order_id = o.order_id
+    GROUP BY o.customer_id, o.customer_name
+)
+SELECT 
+    customer_name,
+    total_sales,
+    total_orders,
+    (total_sales / total_orders) AS avg_order_value
+FROM CustomerSales
+ORDER BY total_sales DESC
+LIMIT 20;
+        """,
+        "Sales Performance by Region": """
+SELECT 
+    o.region,
+    COUNT(DISTINCT o.customer_id) as customers,
+    COUNT(DISTINCT s.order_id) as orders,
+    SUM(s.sales) as total_sales,
+    SUM(s.profit) as total_profit,
+    AVG(s.sales) as avg_sale_amount
+FROM sales s
+JOIN orders o ON s.order_id = o.order_id
+GROUP BY o.region
+ORDER BY total_sales DESC;
+        """
+    }
+    
+    selected_template = st.selectbox("Select a template:", list(template_options.keys()))
+    
+    # Query input
+    query = st.text_area(
+        "SQL Query:", 
+        value=template_options[selected_template],
+        height=200,
+        help="Enter your SQL query here. Use SELECT statements to retrieve data."
+    )
+    
+    col1, col2, col3 = st.columns([1, 1, 4])
+    
+    with col1:
+        execute_button = st.button("▶️ Execute Query", type="primary")
+    
+    with col2:
+        if st.button("📋 Save Query"):
+            if 'saved_queries' not in st.session_state:
+                st.session_state.saved_queries = []
+            st.session_state.saved_queries.append({
+                'query': query,
+                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            })
+            st.success("Query saved!")
+    
+    query_guard = get_query_guard(DB_CONFIG)
+    if execute_button and query.strip():
+        try:
+            # Runs in the background on the editor pool so the page can offer a cancel button
+            token, future = query_guard.submit(editor_session_id(), execute_custom_query, query=query)
+            st.session_state.editor_running = {'token': token, 'future': future, 'query': query,
+                                               'started_at': time.time()}
+            discard_export()
+        except ConcurrencyLimitError as e:
+            st.warning(f"{e.msg}. Wait for it to finish or cancel it.")
+    
+    running = st.session_state.get('editor_running')
+    if running is not None:
+        if st.button("⏹️ Cancel Query"):
+            query_guard.cancel(running['token'])
+        status = st.empty()
+        while not running['future'].done():
+            status.info(f"⏳ Query running for {time.time() - running['started_at']:.1f} s "
+                        f"(budget {query_guard.timeout:.0f} s)")
+            time.sleep(0.25)
+        status.empty()
+        del st.session_state.editor_running
+        
+        (result_df, execution_time, error_msg, truncated), outcome = running['future'].result()
+        interruption = describe_interruption(outcome, query_guard.timeout)
+        if interruption:
+            result_df, error_msg, truncated = None, f"Error: {interruption}", False
+        # Kept in session state so paging and chart widgets can rerun without re-executing
+        st.session_state.editor_result = {
+            'query': running['query'], 'df': result_df, 'execution_time': execution_time,
+            'message': error_msg, 'truncated': truncated
+        }
+    
+    editor_result = st.session_state.get('editor_result')
+    if editor_result is not None:
+        result_df = editor_result['df']
+        execution_time = editor_result['execution_time']
+        
+        if result_df is None and editor_result['message'].startswith("Error"):
+            st.error(editor_result['message'])
+        elif result_df is not None:
+            st.success(f"Query executed successfully in {execution_time:.3f} seconds")
+            if editor_result['truncated']:
+                st.warning(f"Showing the first {EDITOR_ROW_CAP:,} rows. Use the CSV export for the full result.")
+            
+            # Display results one page at a time
+            st.subheader("📊 Query Results")
+            page_count = max((len(result_df) + PAGE_SIZE - 1) // PAGE_SIZE, 1)
+            page_number = st.number_input(f"Page (of {page_count}):", min_value=1, max_value=page_count, value=1)
+            page_start = (page_number - 1) * PAGE_SIZE
+            st.caption(f"Rows {page_start + 1:,}-{min(page_start + PAGE_SIZE, len(result_df)):,} of "
+                       f"{len(result_df):,}{'+' if editor_result['truncated'] else ''}")
+            st.dataframe(result_df.iloc[page_start:page_start + PAGE_SIZE], use_container_width=True)
+            
+            # Download option: the full result is streamed to a temporary file in chunks
+            export = st.session_state.get('editor_export')
+            if export is None:
+                if st.button("📦 Prepare CSV Export"):
+                    with st.spinner("Exporting query results..."):
+                        try:
+                            (path, rows_written, export_truncated), outcome = query_guard.run(
+                                editor_session_id(), export_query_to_csv, query=editor_result['query'])
+                            if describe_interruption(outcome, query_guard.timeout):
+                                raise RuntimeError(describe_interruption(outcome, query_guard.timeout))
+                            st.session_state.editor_export = {'path': path, 'rows': rows_written,
+                                                              'truncated': export_truncated}
+                            st.rerun()
+                        except Exception as e:
+                            st.error(f"Export failed: {e}")
+            else:
+                if export['truncated']:
+                    st.warning(f"Export stopped after {export['rows']:,} rows.")
+                # A callable is only run on click, so reruns never load the file into memory
+                st.download_button(
+                    label=f"📥 Download as CSV ({export['rows']:,} rows)",
+                    data=export_reader(export['path']),
+                    file_name=f"query_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv"
+                )
+            
+            # Basic visualization if numeric columns exist
+            numeric_cols = result_df.select_dtypes(include=['number']).columns.tolist()
+            if len(numeric_cols) > 0:
+                st.subheader("📈 Quick Visualization")
+                chart_type = st.selectbox("Chart Type:", ["Bar Chart", "Line Chart", "Scatter Plot"])
+                
+                if len(result_df.columns) >= 2:
+                    x_col = st.selectbox("X-axis:", result_df.columns.tolist())
+                    y_col = st.selectbox("Y-axis:", numeric_cols)
+                    
+                    if chart_type == "Bar Chart":
+                        fig = px.bar(result_df.head(20), x=x_col, y=y_col)
+                    elif chart_type == "Line Chart":
+                        fig = px.line(result_df, x=x_col, y=y_col)
+                    else:
+                        fig = px.scatter(result_df, x=x_col, y=y_col)
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.success(f"Query executed successfully in {execution_time:.3f} seconds")
+            st.info(editor_result['message'])
+    
+    # Query History
+    if 'saved_queries' in st.session_state and st.session_state.saved_queries:
+        st.subheader("📚 Saved Queries")
+        for i, saved_query in enumerate(st.session_state.saved_queries):
+            with st.expander(f"Query {i+1} - {saved_query['timestamp']}"):
+                st.code(saved_query['query'], language='sql')
+                if st.button(f"Load Query {i+1}", key=f"load_{i}"):
+                    st.rerun()
@@ -0,0 +1,213 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import mysql.connector
+from mysql.connector import Error
+
+# Default pool settings
+POOL_SIZE = 5
+CHECKOUT_TIMEOUT = 10.0
+HEALTH_CHECK_INTERVAL = 30.0
+
+
+class PoolTimeoutError(Error):
+    """Raised when no pooled connection becomes free within the checkout timeout"""
+
+
+class ConnectionPool:
+    """Size-limited pool of MySQL connections shared by every module in the project"""
+
+    def __init__(self, db_config, size=POOL_SIZE, checkout_timeout=CHECKOUT_TIMEOUT,
+                 health_check_interval=HEALTH_CHECK_INTERVAL, name='default'):
+        self.db_config = dict(db_config)
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+        self.name = name
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._generation = 0
+        self._generations = {}
+        self._last_checked = {}
+        self._stats = {
+            'checkouts': 0,
+            'timeouts': 0,
+            'connections_opened': 0,
+            'connections_replaced': 0,
+            'total_wait_time': 0.0,
+            'max_wait_time': 0.0,
+        }
+
+    def _open_connection(self):
+        connection = mysql.connector.connect(**self.db_config)
+        with self._lock:
+            self._stats['connections_opened'] += 1
+            self._generations[id(connection)] = self._generation
+        self._last_checked[id(connection)] = time.monotonic()
+        return connection
+
+    def _is_healthy(self, connection):
+        """Ping idle connections that have not been used for a while"""
+        last_checked = self._last_checked.get(id(connection), 0.0)
+        if time.monotonic() - last_checked < self.health_check_interval:
+            return True
+        try:
+            connection.ping(reconnect=False)
+        except Exception:
+            return False
+        self._last_checked[id(connection)] = time.monotonic()
+        return True
+
+    def _discard(self, connection):
+        self._last_checked.pop(id(connection), None)
+        with self._lock:
+            self._generations.pop(id(connection), None)
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def acquire(self, timeout=None):
+        """Check a connection out of the pool, opening one if the pool is not full yet"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        start_time = time.monotonic()
+        connection = None
+
+        while connection is None:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_open = self._created < self.size
+                    if can_open:
+                        self._created += 1
+                if can_open:
+                    try:
+                        connection = self._open_connection()
+                    except Exception:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+                    break
+                remaining = timeout - (time.monotonic() - start_time)
+                if remaining <= 0:
+                    with self._lock:
+                        self._stats['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        msg=f"No pooled connection available after {timeout:.1f} seconds"
+                    )
+                try:
+                    connection = self._idle.get(timeout=remaining)
+                except queue.Empty:
+                    continue
+
+            if not self._is_healthy(connection):
+                # Replace broken connections instead of reconnecting in place so that
+                # per-connection state (sessions, prepared statements) never goes stale
+                self._discard(connection)
+                with self._lock:
+                    self._stats['connections_replaced'] += 1
+                try:
+                    connection = self._open_connection()
+                except Exception:
+                    # The discarded connection's slot must not be lost, e.g. while the server restarts
+                    with self._lock:
+                        self._created -= 1
+                    raise
+
+        wait_time = time.monotonic() - start_time
+        with self._lock:
+            self._stats['checkouts'] += 1
+            self._stats['total_wait_time'] += wait_time
+            self._stats['max_wait_time'] = max(self._stats['max_wait_time'], wait_time)
+        return connection
+
+    def release(self, connection, broken=False):
+        """Return a connection to the pool, dropping it if it is no longer usable"""
+        with self._lock:
+            stale = self._generations.get(id(connection)) != self._generation
+        if broken or stale or not connection.is_connected():
+            self._discard(connection)
+            with self._lock:
+                self._created -= 1
+            return
+        try:
+            # Never hand over an open transaction to the next borrower
+            connection.rollback()
+        except Exception:
+            self._discard(connection)
+            with self._lock:
+                self._created -= 1
+            return
+        self._last_checked[id(connection)] = time.monotonic()
+        self._idle.put(connection)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Context manager that checks a connection out and always returns it"""
+        connection = self.acquire(timeout)
+        broken = False
+        try:
+            yield connection
+        except Error:
+            broken = not connection.is_connected()
+            raise
+        finally:
+            self.release(connection, broken=broken)
+
+    def stats(self):
+        """Current pool statistics"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = self.size
+            stats['open_connections'] = self._created
+        stats['idle_connections'] = self._idle.qsize()
+        stats['in_use_connections'] = stats['open_connections'] - stats['idle_connections']
+        stats['avg_wait_time'] = stats['total_wait_time'] / stats['checkouts'] if stats['checkouts'] else 0.0
+        return stats
+
+    def close_all(self):
+        """Close every idle connection; checked-out connections are closed on release.
+
+        The pool stays usable: later checkouts open fresh connections.
+        """
+        with self._lock:
+            self._generation += 1
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(connection)
+            with self._lock:
+                self._created -= 1
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_config, size=POOL_SIZE, checkout_timeout=CHECKOUT_TIMEOUT, name='default'):
+    """Return the shared pool for a database configuration, creating it on first use.
+
+    Pools with different names never share connections, so a workload can be given
+    its own capacity (e.g. the SQL editor) without starving the default pool.
+    """
+    key = (name,) + tuple(sorted((k, str(v)) for k, v in db_config.items()))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(db_config, size=size, checkout_timeout=checkout_timeout, name=name)
+            _pools[key] = pool
+        return pool
+
+
+def all_pool_stats():
+    """Statistics for every pool created in this process"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [dict(pool.stats(), name=pool.name, database=pool.db_config.get('database'), host=pool.db_config.get('host'))
+            for pool in pools]
@@ -1,16 +1,31 @@
 
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
 import pandas as pd
 import mysql.connector
 from mysql.connector import Error
+from db_pool import get_pool
+from rollups import refresh_cohort_retention, refresh_daily_sales_summary, refresh_monthly_sales_agg
+from local_engine import mark_snapshot_stale
+from forecast_cache import invalidate_forecast_cache
+from query_cache import mark_etl_completed
 
 # Database connection details
 DB_CONFIG = {
     'host': 'localhost',
-    'database': 'retail_sales',
+    'database': os.environ.get('RETAIL_SALES_DB', 'retail_sales'),
     'user': 'root',
     'password': 'root'  
 }
 
+# The bulk loader needs LOAD DATA LOCAL INFILE enabled on the client side
+ETL_DB_CONFIG = dict(DB_CONFIG, allow_local_infile=True)
+
 def create_db_connection(host, user, password, database=None):
     connection = None
     try:
@@ -34,104 +49,677 @@ def execute_query(connection, query):
     except Error as err:
         print(f"Error: '{err}'")
 
-def load_data_to_db(df, connection):
-    cursor = connection.cursor()
+# Source columns and upsert statements for each target table
+ORDERS_COLUMNS = ['Order ID', 'Order Date', 'Ship Date', 'Ship Mode', 'Customer ID', 'Customer Name', 'Segment', 'Country', 'City', 'State', 'Postal Code', 'Region']
+ORDERS_INSERT_QUERY = """
+INSERT INTO orders (order_id, order_date, ship_date, ship_mode, customer_id, customer_name, segment, country, city, state, postal_code, region)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+order_date = VALUES(order_date),
+ship_date = VALUES(ship_date),
+ship_mode = VALUES(ship_mode),
+customer_id = VALUES(customer_id),
+customer_name = VALUES(customer_name),
+segment = VALUES(segment),
+country = VALUES(country),
+city = VALUES(city),
+state = VALUES(state),
+postal_code = VALUES(postal_code),
+region = VALUES(region);
+"""
 
-    # Prepare data for orders table
-    orders_df = df[['Order ID', 'Order Date', 'Ship Date', 'Ship Mode', 'Customer ID', 'Customer Name', 'Segment', 'Country', 'City', 'State', 'Postal Code', 'Region']].drop_duplicates(subset=['Order ID'])
-    orders_records = orders_df.values.tolist()
-    orders_insert_query = """
-    INSERT INTO orders (order_id, order_date, ship_date, ship_mode, customer_id, customer_name, segment, country, city, state, postal_code, region)
-    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    ON DUPLICATE KEY UPDATE
-    order_date = VALUES(order_date),
-    ship_date = VALUES(ship_date),
-    ship_mode = VALUES(ship_mode),
-    customer_id = VALUES(customer_id),
-    customer_name = VALUES(customer_name),
-    segment = VALUES(segment),
-    country = VALUES(country),
-    city = VALUES(city),
-    state = VALUES(state),
-    postal_code = VALUES(postal_code),
-    region = VALUES(region);
-    """
+PRODUCTS_COLUMNS = ['Product ID', 'Category', 'Sub-Category', 'Product Name']
+PRODUCTS_INSERT_QUERY = """
+INSERT INTO products (product_id, category, sub_category, product_name)
+VALUES (%s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+category = VALUES(category),
+sub_category = VALUES(sub_category),
+product_name = VALUES(product_name);
+"""
 
-    # Prepare data for products table
-    products_df = df[['Product ID', 'Category', 'Sub-Category', 'Product Name']].drop_duplicates(subset=['Product ID'])
-    products_records = products_df.values.tolist()
-    products_insert_query = """
-    INSERT INTO products (product_id, category, sub_category, product_name)
-    VALUES (%s, %s, %s, %s)
-    ON DUPLICATE KEY UPDATE
-    category = VALUES(category),
-    sub_category = VALUES(sub_category),
-    product_name = VALUES(product_name);
-    """
+SALES_COLUMNS = ['Row ID', 'Order ID', 'Product ID', 'Sales', 'Quantity', 'Discount', 'Profit']
+SALES_INSERT_QUERY = """
+INSERT INTO sales (row_id, order_id, product_id, sales, quantity, discount, profit)
+VALUES (%s, %s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+order_id = VALUES(order_id),
+product_id = VALUES(product_id),
+sales = VALUES(sales),
+quantity = VALUES(quantity),
+discount = VALUES(discount),
+profit = VALUES(profit);
+"""
 
-    # Prepare data for sales table
-    sales_df = df[['Row ID', 'Order ID', 'Product ID', 'Sales', 'Quantity', 'Discount', 'Profit']]
+CSV_PATH = 'Sample-Superstore.csv'
+CHUNK_SIZE = 50000
+BATCH_SIZE = 5000
+WORKERS = 4
+
+def prepare_table_frames(df):
+    """Split the flat CSV frame into orders, products and sales frames"""
+    orders_df = df[ORDERS_COLUMNS].drop_duplicates(subset=['Order ID'])
+    products_df = df[PRODUCTS_COLUMNS].drop_duplicates(subset=['Product ID'])
+    sales_df = df[SALES_COLUMNS].copy()
     sales_df['Order ID'] = sales_df['Order ID'].astype(str) # Ensure Order ID is string
     sales_df['Product ID'] = sales_df['Product ID'].astype(str) # Ensure Product ID is string
+    return orders_df, products_df, sales_df
+
+def parse_dates(df):
+    """Convert the CSV date columns to datetime objects"""
+    df['Order Date'] = pd.to_datetime(df['Order Date'], format='%m/%d/%Y')
+    df['Ship Date'] = pd.to_datetime(df['Ship Date'], format='%m/%d/%Y')
+    return df
+
+def upsert_in_batches(connection, query, frame, batch_size=BATCH_SIZE):
+    """Upsert a frame in batches of batch_size rows, committing after every batch"""
+    cursor = connection.cursor()
+    rows_loaded = 0
+    try:
+        for start in range(0, len(frame), batch_size):
+            batch = frame.iloc[start:start + batch_size]
+            cursor.executemany(query, list(batch.itertuples(index=False, name=None)))
+            connection.commit()
+            rows_loaded += len(batch)
+    finally:
+        cursor.close()
+    return rows_loaded
+
+def load_data_to_db(df, connection):
+    cursor = connection.cursor()
+
+    orders_df, products_df, sales_df = prepare_table_frames(df)
+    orders_records = orders_df.values.tolist()
+    products_records = products_df.values.tolist()
     sales_records = sales_df.values.tolist()
-    sales_insert_query = """
-    INSERT INTO sales (row_id, order_id, product_id, sales, quantity, discount, profit)
-    VALUES (%s, %s, %s, %s, %s, %s, %s)
-    ON DUPLICATE KEY UPDATE
-    order_id = VALUES(order_id),
-    product_id = VALUES(product_id),
-    sales = VALUES(sales),
-    quantity = VALUES(quantity),
-    discount = VALUES(discount),
-    profit = VALUES(profit);
-    """
 
     try:
-        cursor.executemany(orders_insert_query, orders_records)
+        cursor.executemany(ORDERS_INSERT_QUERY, orders_records)
         connection.commit()
         print("Orders data loaded successfully")
 
-        cursor.executemany(products_insert_query, products_records)
+        cursor.executemany(PRODUCTS_INSERT_QUERY, products_records)
         connection.commit()
         print("Products data loaded successfully")
 
-        cursor.executemany(sales_insert_query, sales_records)
+        cursor.executemany(SALES_INSERT_QUERY, sales_records)
         connection.commit()
         print("Sales data loaded successfully")
 
     except Error as err:
         print(f"Error loading data: '{err}'")
 
-def main():
+def stream_data_to_db(csv_path, connection, chunk_size=CHUNK_SIZE, batch_size=BATCH_SIZE):
+    """Stream the CSV in chunks and upsert each chunk in committed batches.
+
+    Memory stays bounded by chunk_size regardless of file size, and a failure only
+    loses the batch in flight; everything committed before it stays in the database.
+    """
+    start_time = time.time()
+    rows_read = 0
+    rows_loaded = {'orders': 0, 'products': 0, 'sales': 0}
+    order_dates = set()
+
+    try:
+        for chunk_number, chunk in enumerate(pd.read_csv(csv_path, encoding='latin1', chunksize=chunk_size), start=1):
+            orders_df, products_df, sales_df = prepare_table_frames(parse_dates(chunk))
+
+            # Dates of orders that already exist, before the upsert can move them
+            order_dates.update(stored_order_dates(connection, orders_df['Order ID']))
+            # Dimensions first so the sales foreign keys always resolve
+            rows_loaded['orders'] += upsert_in_batches(connection, ORDERS_INSERT_QUERY, orders_df, batch_size)
+            rows_loaded['products'] += upsert_in_batches(connection, PRODUCTS_INSERT_QUERY, products_df, batch_size)
+            rows_loaded['sales'] += upsert_in_batches(connection, SALES_INSERT_QUERY, sales_df, batch_size)
+
+            rows_read += len(chunk)
+            order_dates.update(orders_df['Order Date'].dt.date)
+            elapsed = time.time() - start_time
+            print(f"Chunk {chunk_number}: {rows_read:,} rows processed ({rows_read / elapsed:,.0f} rows/s)")
+    except Error as err:
+        print(f"Error loading data after {rows_read:,} rows: '{err}'")
+
+    elapsed = time.time() - start_time
+    rows_per_second = rows_read / elapsed if elapsed > 0 else 0.0
+    print(f"Streamed {rows_read:,} rows in {elapsed:.2f} seconds ({rows_per_second:,.0f} rows/s)")
+    return {'rows_read': rows_read, 'rows_loaded': rows_loaded, 'order_dates': order_dates,
+            'elapsed_seconds': elapsed, 'rows_per_second': rows_per_second}
+
+# Staging tables and set-based merges used by the bulk loader
+BULK_TABLES = [
+    ('orders', ORDERS_COLUMNS, ['order_id', 'order_date', 'ship_date', 'ship_mode', 'customer_id', 'customer_name', 'segment', 'country', 'city', 'state', 'postal_code', 'region']),
+    ('products', PRODUCTS_COLUMNS, ['product_id', 'category', 'sub_category', 'product_name']),
+    ('sales', SALES_COLUMNS, ['row_id', 'order_id', 'product_id', 'sales', 'quantity', 'discount', 'profit']),
+]
+
+def write_load_file(frame, path):
+    """Write a frame as a tab-separated file in the format LOAD DATA expects by default"""
+    columns = []
+    for column in frame.columns:
+        values = frame[column]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            text = values.dt.strftime('%Y-%m-%d')
+        else:
+            text = values.astype(str).where(values.notna())
+            text = (text.str.replace('\\', '\\\\', regex=False)
+                        .str.replace('\t', '\\t', regex=False)
+                        .str.replace('\n', '\\n', regex=False))
+        columns.append(text.fillna('\\N'))
+
+    lines = columns[0]
+    for text in columns[1:]:
+        lines = lines + '\t' + text
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        if lines.empty:
+            return
+        for start in range(0, len(lines), BATCH_SIZE):
+            f.write('\n'.join(lines.iloc[start:start + BATCH_SIZE]))
+            f.write('\n')
+
+def bulk_load_data_to_db(df, connection):
+    """Load through LOAD DATA LOCAL INFILE into staging tables, then merge set-based.
+
+    Falls back to the row-by-row upsert in load_data_to_db if the server or the
+    connection does not allow local infile loads.
+    """
+    cursor = connection.cursor()
+    frames = prepare_table_frames(df)
+    temp_dir = tempfile.mkdtemp(prefix='retail_sales_bulk_')
+
+    try:
+        for (table, _, columns), frame in zip(BULK_TABLES, frames):
+            staging_table = f"{table}_staging"
+            load_path = os.path.join(temp_dir, f"{table}.tsv")
+            write_load_file(frame, load_path)
+
+            cursor.execute(f"CREATE TEMPORARY TABLE IF NOT EXISTS {staging_table} LIKE {table}")
+            cursor.execute(f"TRUNCATE TABLE {staging_table}")
+            cursor.execute(
+                f"LOAD DATA LOCAL INFILE '{load_path}' INTO TABLE {staging_table} "
+                f"CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' "
+                f"({', '.join(columns)})"
+            )
+
+            column_list = ', '.join(columns)
+            update_list = ',\n'.join(f"{column} = VALUES({column})" for column in columns[1:])
+            cursor.execute(f"""
+            INSERT INTO {table} ({column_list})
+            SELECT {column_list} FROM {staging_table}
+            ON DUPLICATE KEY UPDATE
+            {update_list};
+            """)
+            connection.commit()
+            print(f"{table.capitalize()} data bulk loaded successfully ({len(frame):,} rows)")
+        return True
+    except Error as err:
+        connection.rollback()
+        print(f"Bulk load failed ('{err}'), falling back to row-by-row upserts")
+        load_data_to_db(df, connection)
+        return False
+    finally:
+        cursor.close()
+        for name in os.listdir(temp_dir):
+            os.remove(os.path.join(temp_dir, name))
+        os.rmdir(temp_dir)
+
+def benchmark_load_paths(df, connection, repeats=3):
+    """Time the row-by-row and bulk load paths on the same frame"""
+    loaders = {'executemany upsert': load_data_to_db, 'LOAD DATA + merge': bulk_load_data_to_db}
+    results = []
+    for name, loader in loaders.items():
+        timings = []
+        for _ in range(repeats):
+            start_time = time.time()
+            loader(df, connection)
+            timings.append(time.time() - start_time)
+        best = min(timings)
+        results.append({'loader': name, 'best_seconds': best, 'mean_seconds': sum(timings) / len(timings),
+                        'rows_per_second': len(df) / best if best > 0 else 0.0})
+
+    print(f"\nLoad benchmark ({len(df):,} rows, best of {repeats}):")
+    for result in results:
+        print(f"  {result['loader']:<20} {result['best_seconds']:8.3f} s  {result['rows_per_second']:>12,.0f} rows/s")
+    return results
+
+# Incremental loads: key column and watermark column per table
+INCREMENTAL_TABLES = [
+    ('orders', ORDERS_INSERT_QUERY, 'Order ID', 'Order Date'),
+    ('products', PRODUCTS_INSERT_QUERY, 'Product ID', None),
+    ('sales', SALES_INSERT_QUERY, 'Row ID', 'Row ID'),
+]
+
+# Products have no date, so they are spread over a fixed number of key-hash buckets
+PRODUCT_PARTITIONS = 64
+
+FINGERPRINT_UPSERT_QUERY = """
+INSERT INTO etl_row_fingerprints (table_name, row_key, row_hash)
+VALUES (%s, %s, %s)
+ON DUPLICATE KEY UPDATE
+row_hash = VALUES(row_hash);
+"""
+
+WATERMARK_UPSERT_QUERY = """
+INSERT INTO etl_watermarks (table_name, max_row_id, max_order_date)
+VALUES (%s, %s, %s)
+ON DUPLICATE KEY UPDATE
+max_row_id = GREATEST(COALESCE(max_row_id, 0), COALESCE(VALUES(max_row_id), 0)),
+max_order_date = GREATEST(COALESCE(max_order_date, '1000-01-01'), COALESCE(VALUES(max_order_date), '1000-01-01'));
+"""
+
+PARTITION_DIGEST_UPSERT_QUERY = """
+INSERT INTO etl_partition_digests (table_name, partition_key, row_count, digest)
+VALUES (%s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+row_count = VALUES(row_count),
+digest = VALUES(digest);
+"""
+
+# Decimal places kept when hashing floats; the schema stores at most two
+HASH_FLOAT_PRECISION = 6
+
+def canonical_number(values):
+    """Numbers as fixed-precision strings without trailing zeros, so 0, 0.0 and 0.00
+    hash alike whatever dtype the rest of the extract gave the column"""
+    text = (values.astype(float).round(HASH_FLOAT_PRECISION) + 0.0).map(f'{{:.{HASH_FLOAT_PRECISION}f}}'.format)
+    return text.str.rstrip('0').str.rstrip('.')
+
+def normalize_for_hashing(frame):
+    """Canonical string form of every value, independent of the other rows in the extract.
+
+    Dtype drift between extracts (an integer column read as float64 once NaNs appear,
+    a Discount column that is all zeros in a small batch) must not change row hashes.
+    """
+    normalized = {}
+    for column in frame.columns:
+        values = frame[column]
+        present = values.notna()
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            text = canonical_number(values[present])
+        elif pd.api.types.is_datetime64_any_dtype(values):
+            text = values[present].dt.strftime('%Y-%m-%d %H:%M:%S')
+        else:
+            text = values[present].astype(str)
+        normalized[column] = text.reindex(values.index, fill_value='')
+    return pd.DataFrame(normalized, index=frame.index)
+
+def compute_row_hashes(frame):
+    """64-bit content hash of every row, computed vectorized by pandas"""
+    return pd.util.hash_pandas_object(normalize_for_hashing(frame), index=False)
+
+def partition_keys(df, table_name, frame):
+    """Partition of every row: order month for orders and sales, key-hash bucket for products"""
+    if table_name == 'products':
+        buckets = pd.util.hash_array(frame['Product ID'].astype(str).to_numpy()) % PRODUCT_PARTITIONS
+        return pd.Series(buckets, index=frame.index).map(lambda bucket: f"bucket-{bucket:02d}")
+    return df.loc[frame.index, 'Order Date'].dt.strftime('%Y-%m')
+
+def partition_digests(partitions, hashes):
+    """(row count, order-independent digest) per partition; the digest is the 64-bit wrapping sum of row hashes"""
+    grouped = pd.DataFrame({'partition': partitions.to_numpy(), 'hash': hashes.to_numpy(dtype='uint64')})
+    return {partition: (len(group), int(np.add.reduce(group['hash'].to_numpy(), dtype='uint64')))
+            for partition, group in grouped.groupby('partition', sort=False)}
+
+def fetch_partition_digests(connection, table_name):
+    cursor = connection.cursor()
+    cursor.execute("SELECT partition_key, row_count, digest FROM etl_partition_digests WHERE table_name = %s",
+                   (table_name,))
+    digests = {partition: (row_count, int(digest)) for partition, row_count, digest in cursor.fetchall()}
+    cursor.close()
+    return digests
+
+def fetch_watermark(connection, table_name):
+    cursor = connection.cursor()
+    cursor.execute("SELECT max_row_id, max_order_date FROM etl_watermarks WHERE table_name = %s", (table_name,))
+    row = cursor.fetchone()
+    cursor.close()
+    return row if row else (None, None)
+
+def fetch_fingerprints(connection, table_name, keys):
+    """Stored row hashes for the given keys, fetched in batches rather than row by row"""
+    cursor = connection.cursor()
+    fingerprints = {}
+    keys = list(keys)
+    for start in range(0, len(keys), BATCH_SIZE):
+        batch = keys[start:start + BATCH_SIZE]
+        placeholders = ', '.join(['%s'] * len(batch))
+        cursor.execute(
+            f"SELECT row_key, row_hash FROM etl_row_fingerprints WHERE table_name = %s AND row_key IN ({placeholders})",
+            [table_name] + batch
+        )
+        fingerprints.update(cursor.fetchall())
+    cursor.close()
+    return fingerprints
+
+def stored_order_dates(connection, order_ids):
+    """Order dates currently stored for the given orders, so days an order moves away from are refreshed too"""
+    cursor = connection.cursor()
+    order_dates = set()
+    order_ids = list(order_ids)
+    for start in range(0, len(order_ids), BATCH_SIZE):
+        batch = order_ids[start:start + BATCH_SIZE]
+        placeholders = ', '.join(['%s'] * len(batch))
+        cursor.execute(f"SELECT order_date FROM orders WHERE order_id IN ({placeholders})", batch)
+        order_dates.update(order_date for (order_date,) in cursor.fetchall() if order_date is not None)
+    cursor.close()
+    return order_dates
+
+def filter_changed_rows(connection, table_name, frame, key_column, watermark_column, partitions):
+    """Return the rows of frame that are new or whose content hash changed, their hashes
+    and the digests of the partitions that changed.
+
+    Partitions whose row count and digest match the stored ones are skipped without
+    touching row fingerprints, so the work follows the size of the delta rather than
+    the history. Within the remaining partitions, rows beyond the stored watermark are
+    new by definition; only rows at or below it need their fingerprints fetched.
+    """
+    hashes = compute_row_hashes(frame)
+    keys = frame[key_column].astype(str)
+
+    digests = partition_digests(partitions, hashes)
+    stored_digests = fetch_partition_digests(connection, table_name)
+    changed_digests = {partition: digest for partition, digest in digests.items()
+                       if stored_digests.get(partition) != digest}
+    in_changed_partition = partitions.isin(list(changed_digests))
+
+    if watermark_column is None:
+        maybe_known = in_changed_partition.copy()
+    else:
+        max_row_id, max_order_date = fetch_watermark(connection, table_name)
+        if watermark_column == 'Row ID':
+            watermark = max_row_id
+        else:
+            watermark = pd.Timestamp(max_order_date) if max_order_date is not None else None
+        if watermark is None:
+            maybe_known = pd.Series(False, index=frame.index)
+        else:
+            maybe_known = in_changed_partition & (frame[watermark_column] <= watermark)
+
+    stored = fetch_fingerprints(connection, table_name, keys[maybe_known]) if maybe_known.any() else {}
+    # Keep the stored hashes as Python ints so 64-bit values compare exactly
+    stored_hashes = keys.map(pd.Series(stored, dtype='object'))
+    is_known = stored_hashes.notna()
+    changed = in_changed_partition & ~is_known
+    changed[is_known] = stored_hashes[is_known].astype('uint64') != hashes[is_known]
+    return frame[changed], keys[changed], hashes[changed], changed_digests
+
+def incremental_load_data_to_db(df, connection, batch_size=BATCH_SIZE):
+    """Upsert only new or changed rows, tracked through partition digests, watermarks and row fingerprints.
+
+    Returns the changed rows per table and the previously stored dates of changed orders.
+    """
+    changes = {}
+    previous_dates = set()
+    for (table_name, insert_query, key_column, watermark_column), frame in zip(INCREMENTAL_TABLES, prepare_table_frames(df)):
+        partitions = partition_keys(df, table_name, frame)
+        changed_df, changed_keys, changed_hashes, changed_digests = filter_changed_rows(
+            connection, table_name, frame, key_column, watermark_column, partitions
+        )
+        if table_name == 'orders':
+            previous_dates = stored_order_dates(connection, changed_df['Order ID'])
+        upsert_in_batches(connection, insert_query, changed_df, batch_size)
+
+        # Record fingerprints and digests only after the data itself is committed
+        fingerprints = pd.DataFrame({'table_name': table_name, 'row_key': changed_keys,
+                                     'row_hash': changed_hashes.astype('uint64')})
+        upsert_in_batches(connection, FINGERPRINT_UPSERT_QUERY, fingerprints, batch_size)
+        digest_rows = pd.DataFrame([(table_name, partition, row_count, digest)
+                                    for partition, (row_count, digest) in changed_digests.items()],
+                                   columns=['table_name', 'partition_key', 'row_count', 'digest'])
+        upsert_in_batches(connection, PARTITION_DIGEST_UPSERT_QUERY, digest_rows, batch_size)
+
+        if not frame.empty:
+            max_row_id = int(frame['Row ID'].max()) if 'Row ID' in frame else None
+            max_order_date = frame['Order Date'].max().date() if 'Order Date' in frame else None
+            cursor = connection.cursor()
+            cursor.execute(WATERMARK_UPSERT_QUERY, (table_name, max_row_id, max_order_date))
+            connection.commit()
+            cursor.close()
+
+        changes[table_name] = changed_df
+        print(f"{table_name.capitalize()}: {len(changed_df):,} new or changed rows loaded, "
+              f"{len(frame) - len(changed_df):,} unchanged rows skipped "
+              f"({len(changed_digests):,} of {partitions.nunique():,} partitions compared)")
+    return changes, previous_dates
+
+def load_partition(pool, query, frame, batch_size=BATCH_SIZE):
+    """Load one frame on its own pooled connection"""
+    with pool.connection() as connection:
+        return upsert_in_batches(connection, query, frame, batch_size)
+
+def parallel_load_data_to_db(df, pool, workers=WORKERS, batch_size=BATCH_SIZE):
+    """Load orders and products concurrently, then sales split into Row ID ranges.
+
+    Each table or partition runs on its own pooled connection; failures are
+    collected per partition instead of aborting the whole load.
+    """
+    orders_df, products_df, sales_df = prepare_table_frames(df)
+    results = {}
+    errors = {}
+
+    def run(executor, jobs):
+        futures = {executor.submit(load_partition, pool, query, frame, batch_size): name
+                   for name, query, frame in jobs}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+                print(f"{name}: {results[name]:,} rows loaded")
+            except Exception as err:
+                errors[name] = str(err)
+                print(f"{name}: error '{err}'")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Orders and products are independent of each other
+        run(executor, [('orders', ORDERS_INSERT_QUERY, orders_df),
+                       ('products', PRODUCTS_INSERT_QUERY, products_df)])
+
+        if errors:
+            print("Skipping sales because a dimension table failed to load")
+            return results, errors
+
+        # Sales rows reference both dimensions, so partitions start once those exist
+        sales_df = sales_df.sort_values('Row ID')
+        partitions = [sales_df.iloc[positions[0]:positions[-1] + 1]
+                      for positions in np.array_split(np.arange(len(sales_df)), workers) if len(positions)]
+        run(executor, [(f"sales rows {part['Row ID'].iloc[0]}-{part['Row ID'].iloc[-1]}", SALES_INSERT_QUERY, part)
+                       for part in partitions])
+
+    return results, errors
+
+def affected_order_dates(df, changes=None, previous_dates=()):
+    """Order dates whose daily totals may have changed, given the rows that were loaded.
+
+    previous_dates holds the dates the loaded orders had before the load, since an order
+    whose date changed also leaves its old day's totals out of date.
+    """
+    if changes is None:
+        return set(df['Order Date'].dt.date) | set(previous_dates)
+    order_ids = set(changes['orders']['Order ID']) | set(changes['sales']['Order ID'])
+    return set(df.loc[df['Order ID'].isin(order_ids), 'Order Date'].dt.date) | set(previous_dates)
+
+def is_database_switch(command):
+    """Whether a schema statement creates or selects a database by name.
+
+    schema.sql names retail_sales for use with the mysql client; the ETL connection
+    already targets DB_CONFIG's database, which RETAIL_SALES_DB can override.
+    """
+    words = command.split()
+    return [word.upper() for word in words[:2]] == ['CREATE', 'DATABASE'] or words[0].upper() == 'USE'
+
+# Columns schema.sql gained after its tables were first created; CREATE TABLE IF NOT
+# EXISTS leaves existing tables alone, so these are added on the next ETL run
+SCHEMA_COLUMNS = [
+    ('daily_sales_summary', 'total_daily_orders', 'INT'),
+]
+
+def add_missing_columns(connection):
+    """Add the SCHEMA_COLUMNS an existing database lacks and return the tables altered"""
+    altered = set()
+    cursor = connection.cursor()
+    try:
+        for table, column, definition in SCHEMA_COLUMNS:
+            cursor.execute(
+                "SELECT 1 FROM information_schema.columns "
+                "WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s LIMIT 1",
+                (table, column)
+            )
+            if cursor.fetchone() is None:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                altered.add(table)
+                print(f"Added column {table}.{column}")
+    except Error as err:
+        print(f"Error migrating schema: '{err}'")
+    finally:
+        cursor.close()
+    return altered
+
+# Indexes schema.sql declares inside CREATE TABLE, which databases created before
+# them never received
+SCHEMA_INDEXES = [
+    ('orders', 'idx_orders_order_date', 'order_date'),
+]
+
+def add_missing_indexes(connection):
+    """Create the SCHEMA_INDEXES an existing database lacks"""
+    cursor = connection.cursor()
+    try:
+        for table, index_name, column in SCHEMA_INDEXES:
+            cursor.execute(
+                "SELECT 1 FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1",
+                (table, index_name)
+            )
+            if cursor.fetchone() is None:
+                cursor.execute(f"CREATE INDEX {index_name} ON {table} ({column})")
+                print(f"Created index {index_name} on {table}({column})")
+    except Error as err:
+        print(f"Error migrating schema: '{err}'")
+    finally:
+        cursor.close()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load Sample-Superstore.csv into the retail_sales database (RETAIL_SALES_DB)")
+    parser.add_argument('--csv', default=CSV_PATH, help="Path to the Superstore CSV extract")
+    # Exactly one load path runs, so a combination such as --incremental --parallel is
+    # rejected rather than silently becoming a full reload
+    load_mode = parser.add_mutually_exclusive_group()
+    load_mode.add_argument('--stream', action='store_true', help="Read the CSV in chunks and commit in batches")
+    load_mode.add_argument('--bulk', action='store_true', help="Load through staging tables and LOAD DATA LOCAL INFILE")
+    load_mode.add_argument('--incremental', action='store_true', help="Only load rows that are new or changed since the last run")
+    load_mode.add_argument('--parallel', action='store_true', help="Load tables and sales partitions on parallel connections")
+    load_mode.add_argument('--benchmark', action='store_true', help="Compare the row-by-row and bulk load paths")
+    load_mode.add_argument('--compact', action='store_true', help="Load into the compact surrogate-key schema (schema_compact.sql)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="CSV rows read per chunk in streaming mode")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Rows per committed batch in streaming mode")
+    parser.add_argument('--workers', type=int, default=WORKERS, help="Worker connections used by the parallel loader")
+    parser.add_argument('--full-refresh', action='store_true', help="Rebuild the daily summary, monthly aggregate and cohort matrix instead of refreshing affected dates")
+    return parser.parse_args()
+
+def run_compact_load(args):
+    """Create the compact surrogate-key schema and load the CSV into it"""
+    from compact_schema import COMPACT_DATABASE, load_compact_data_to_db
+
+    connection = create_db_connection(DB_CONFIG['host'], DB_CONFIG['user'], DB_CONFIG['password'])
+    if not connection:
+        return
+    execute_query(connection, f"CREATE DATABASE IF NOT EXISTS {COMPACT_DATABASE};")
+    connection.close()
+
+    connection = create_db_connection(DB_CONFIG['host'], DB_CONFIG['user'], DB_CONFIG['password'], COMPACT_DATABASE)
+    if not connection:
+        return
+    try:
+        with open('schema_compact.sql', 'r') as f:
+            for command in f.read().split(';'):
+                if command.strip() and not is_database_switch(command):
+                    execute_query(connection, command)
+        df = parse_dates(pd.read_csv(args.csv, encoding='latin1'))
+        load_compact_data_to_db(df, connection, args.batch_size)
+        # Every row was upserted, so the rollups are rebuilt rather than patched
+        refresh_daily_sales_summary(connection, schema='compact')
+        refresh_monthly_sales_agg(connection, schema='compact')
+        refresh_cohort_retention(connection, schema='compact')
+        # Dashboard result caches are versioned on this mark, so it moves last
+        mark_etl_completed(connection)
+        mark_snapshot_stale()
+        invalidate_forecast_cache()
+    except FileNotFoundError:
+        print(f"Error: {args.csv} not found. Make sure it's in the same directory as the script.")
+    except Exception as e:
+        print(f"Error processing CSV or loading data: {e}")
+    finally:
+        connection.close()
+
+def main(args=None):
+    args = args or parse_args()
+    if args.compact:
+        run_compact_load(args)
+        return
+
     # Create database and tables
     connection = create_db_connection(DB_CONFIG['host'], DB_CONFIG['user'], DB_CONFIG['password']) # Connect without specific DB to create it
     if connection:
-        execute_query(connection, "CREATE DATABASE IF NOT EXISTS retail_sales;")
+        execute_query(connection, f"CREATE DATABASE IF NOT EXISTS {DB_CONFIG['database']};")
         connection.close()
 
-    connection = create_db_connection(DB_CONFIG['host'], DB_CONFIG['user'], DB_CONFIG['password'], DB_CONFIG['database']) # Connect to the newly created DB
+    try:
+        pool = get_pool(ETL_DB_CONFIG, size=args.workers + 1)
+        connection = pool.acquire() # Connect to the newly created DB
+        print("MySQL Database connection successful")
+    except Error as err:
+        print(f"Error: '{err}'")
+        connection = None
     if connection:
         with open('schema.sql', 'r') as f:
             schema_sql = f.read()
         # Split the schema_sql into individual statements and execute them
         commands = schema_sql.split(';')
         for command in commands:
-            if command.strip(): # Ensure command is not empty
+            if command.strip() and not is_database_switch(command): # Ensure command is not empty
                 execute_query(connection, command)
+        add_missing_indexes(connection)
+        # A rollup that just gained a column has no values in it, so it is rebuilt in full
+        full_refresh = args.full_refresh or bool(add_missing_columns(connection))
 
         # Load data from CSV
         try:
-            df = pd.read_csv('Sample-Superstore.csv', encoding='latin1')
-            # Convert date columns to datetime objects
-            df['Order Date'] = pd.to_datetime(df['Order Date'], format='%m/%d/%Y')
-            df['Ship Date'] = pd.to_datetime(df['Ship Date'], format='%m/%d/%Y')
-            load_data_to_db(df, connection)
+            if args.stream:
+                summary = stream_data_to_db(args.csv, connection, args.chunk_size, args.batch_size)
+                refresh_dates = summary['order_dates']
+            else:
+                df = pd.read_csv(args.csv, encoding='latin1')
+                # Convert date columns to datetime objects
+                parse_dates(df)
+                changes = None
+                if args.incremental:
+                    changes, previous_dates = incremental_load_data_to_db(df, connection, args.batch_size)
+                else:
+                    # Current dates of orders the load may move to another day
+                    previous_dates = stored_order_dates(connection, df['Order ID'].unique())
+                    if args.benchmark:
+                        benchmark_load_paths(df, connection)
+                    elif args.parallel:
+                        parallel_load_data_to_db(df, pool, args.workers, args.batch_size)
+                    elif args.bulk:
+                        bulk_load_data_to_db(df, connection)
+                    else:
+                        load_data_to_db(df, connection)
+                refresh_dates = affected_order_dates(df, changes, previous_dates)
+
+            # Keep the daily rollup, monthly aggregate and cohort matrix in step with the fact table
+            refresh_daily_sales_summary(connection, None if full_refresh else refresh_dates)
+            refresh_monthly_sales_agg(connection, None if full_refresh else refresh_dates)
+            refresh_cohort_retention(connection, None if full_refresh else refresh_dates)
+            # Dashboard result caches are versioned on this mark, so it moves last
+            mark_etl_completed(connection)
+            mark_snapshot_stale()
+            invalidate_forecast_cache()
         except FileNotFoundError:
-            print("Error: Sample-Superstore.csv not found. Make sure it's in the same directory as the script.")
+            print(f"Error: {args.csv} not found. Make sure it's in the same directory as the script.")
         except Exception as e:
             print(f"Error processing CSV or loading data: {e}")
         finally:
-            connection.close()
+            pool.release(connection)
+            pool.close_all()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,57 @@
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Concurrent fetches per process; kept below the dashboard pool size so a page
+# never waits on its own checkouts
+PLANNER_WORKERS = 4
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def planner_executor():
+    """Process-wide worker pool, shared across Streamlit reruns and sessions"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=PLANNER_WORKERS, thread_name_prefix='fetch-planner')
+        return _executor
+
+
+class FetchPlan:
+    """A page's independent fetches, run concurrently and returned in completion order.
+
+    Fetch functions run on worker threads and must not call st.*; they raise on
+    failure and the caller renders results and errors from the script thread.
+    Each fetch runs in a copy of the caller's context, so contextvars such as the
+    telemetry page label carry over to the worker.
+    """
+
+    def __init__(self):
+        self._fetches = {}
+
+    def add(self, name, fetch, *args):
+        self._fetches[name] = (fetch, args)
+        return self
+
+    def run(self):
+        """Yield (name, result, error) for every fetch as soon as it finishes"""
+        if len(self._fetches) == 1:
+            (name, (fetch, args)), = self._fetches.items()
+            try:
+                yield name, fetch(*args), None
+            except Exception as e:
+                yield name, None, e
+            return
+
+        executor = planner_executor()
+        futures = {
+            executor.submit(contextvars.copy_context().run, fetch, *args): name
+            for name, (fetch, args) in self._fetches.items()
+        }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
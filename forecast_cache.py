@@ -0,0 +1,142 @@
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+import threading
+
+# Fitted parameters and forecasts persisted between processes and dashboard restarts
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.forecast_cache')
+MAX_ENTRIES = 512
+MAX_BYTES = 256 * 1024 * 1024
+
+SAFE_NAME_PATTERN = re.compile(r'[^A-Za-z0-9_.-]+')
+
+
+class ForecastCache:
+    """On-disk pickle cache for fitted forecasting models and their outputs.
+
+    An entry is keyed by series id, method, hyperparameters and a data fingerprint
+    (last month + row count), so new data never hits a stale entry. Reads touch the
+    file's mtime and eviction removes the least recently used files once the cache
+    holds more than max_entries files or max_bytes bytes.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0, 'invalidations': 0}
+
+    def _path(self, series_id, method, hyperparameters, fingerprint):
+        key = repr((series_id, method, sorted((hyperparameters or {}).items()), fingerprint))
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+        # The series id prefix lets invalidate() drop one series without reading any file
+        return os.path.join(self.directory, f"{SAFE_NAME_PATTERN.sub('_', series_id)}__{digest}.pkl")
+
+    def get(self, series_id, method, hyperparameters, fingerprint):
+        """Cached payload, or None"""
+        path = self._path(series_id, method, hyperparameters, fingerprint)
+        try:
+            with open(path, 'rb') as f:
+                payload = pickle.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            payload = None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            # Truncated or incompatible entry: drop it and refit
+            self._remove(path)
+            payload = None
+        with self._lock:
+            self._stats['hits' if payload is not None else 'misses'] += 1
+        return payload
+
+    def put(self, series_id, method, hyperparameters, fingerprint, payload):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(series_id, method, hyperparameters, fingerprint)
+        # Write to a temporary file and rename, so readers never see a partial entry
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except Exception:
+            self._remove(temp_path)
+            raise
+        with self._lock:
+            self._stats['writes'] += 1
+        self.evict()
+
+    def get_or_compute(self, series_id, method, hyperparameters, fingerprint, compute):
+        """Cached payload, or compute() stored under the key; a None fingerprint disables caching"""
+        if fingerprint is None:
+            return compute()
+        payload = self.get(series_id, method, hyperparameters, fingerprint)
+        if payload is None:
+            payload = compute()
+            self.put(series_id, method, hyperparameters, fingerprint, payload)
+        return payload
+
+    def _entries(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        entries = []
+        for name in names:
+            if not name.endswith('.pkl'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def evict(self):
+        """Remove least recently used entries until both limits hold"""
+        entries = sorted(self._entries())
+        total_bytes = sum(size for _, size, _ in entries)
+        evicted = 0
+        while entries and (len(entries) > self.max_entries or total_bytes > self.max_bytes):
+            _, size, path = entries.pop(0)
+            if self._remove(path):
+                evicted += 1
+            total_bytes -= size
+        with self._lock:
+            self._stats['evictions'] += evicted
+        return evicted
+
+    def invalidate(self, series_id=None):
+        """Drop every entry, or only those of one series; returns the number removed"""
+        prefix = None if series_id is None else f"{SAFE_NAME_PATTERN.sub('_', series_id)}__"
+        removed = sum(self._remove(path) for _, _, path in self._entries()
+                      if prefix is None or os.path.basename(path).startswith(prefix))
+        with self._lock:
+            self._stats['invalidations'] += removed
+        return removed
+
+    def stats(self):
+        entries = self._entries()
+        with self._lock:
+            stats = dict(self._stats)
+        stats['entries'] = len(entries)
+        stats['bytes'] = sum(size for _, size, _ in entries)
+        return stats
+
+
+FORECAST_CACHE = ForecastCache()
+
+
+def invalidate_forecast_cache(series_id=None):
+    """Hook for the ETL: fitted models are stale once the sales data changed"""
+    return FORECAST_CACHE.invalidate(series_id)
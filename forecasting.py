@@ -1,7 +1,13 @@
+import os
 import pandas as pd
 import numpy as np
+import time
 from datetime import datetime, timedelta
-import mysql.connector
+from db_pool import get_pool
+from rollups import (daily_summary_available, monthly_agg_available, TIME_SERIES_FROM_AGG_QUERY,
+                     TIME_SERIES_FROM_ROLLUP_QUERY)
+from telemetry import TELEMETRY
+from forecast_cache import FORECAST_CACHE
 from sklearn.linear_model import LinearRegression
 from sklearn.preprocessing import PolynomialFeatures
 import warnings
@@ -10,35 +16,102 @@ warnings.filterwarnings('ignore')
 # Database connection details
 DB_CONFIG = {
     'host': 'localhost',
-    'database': 'retail_sales',
+    'database': os.environ.get('RETAIL_SALES_DB', 'retail_sales'),
     'user': 'root',
     'password': 'root'
 }
 
+# Monthly series straight from the fact table, used until the daily rollup is populated
+MONTHLY_SERIES_QUERY = """
+SELECT 
+    DATE_FORMAT(o.order_date, '%Y-%m-01') as month_date,
+    SUM(s.sales) as monthly_sales,
+    SUM(s.profit) as monthly_profit,
+    COUNT(DISTINCT s.order_id) as monthly_orders
+FROM sales s
+JOIN orders o ON s.order_id = o.order_id
+GROUP BY month_date
+ORDER BY month_date
+"""
+
+# Cheap data fingerprint for the forecast cache: last order month and sales row count
+DATA_FINGERPRINT_QUERY = """
+SELECT
+    (SELECT DATE_FORMAT(MAX(order_date), '%Y-%m') FROM orders) as last_month,
+    (SELECT COUNT(*) FROM sales) as row_count
+"""
+
+HOLDOUT_MONTHS = 6
+
 def get_data_from_db(query):
     """Execute SQL query and return DataFrame"""
+    with TELEMETRY.track('forecasting', query) as event:
+        try:
+            checkout_start = time.perf_counter()
+            with get_pool(DB_CONFIG).connection() as connection:
+                event['pool_wait'] = time.perf_counter() - checkout_start
+                df = pd.read_sql(query, connection)
+            event['rows'] = len(df)
+            return df
+        except Exception as e:
+            event['error'] = str(e)
+            print(f"Database connection error: {e}")
+            return pd.DataFrame()
+
+# Rollup availability only changes when the ETL runs, so each check is repeated at
+# most once per AVAILABILITY_TTL seconds instead of on every forecast
+AVAILABILITY_TTL = 300.0
+_availability = {}
+
+def cached_availability(name, check):
+    """Result of an availability check, reused for AVAILABILITY_TTL seconds"""
+    now = time.monotonic()
+    cached = _availability.get(name)
+    if cached is not None and now - cached[1] < AVAILABILITY_TTL:
+        return cached[0]
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
-        df = pd.read_sql(query, connection)
-        connection.close()
-        return df
-    except Exception as e:
-        print(f"Database connection error: {e}")
-        return pd.DataFrame()
+        with get_pool(DB_CONFIG).connection() as connection:
+            available = check(connection)
+    except Exception:
+        available = False
+    _availability[name] = (available, now)
+    return available
+
+def daily_rollup_available():
+    """Whether the monthly series can be built from daily_sales_summary"""
+    return cached_availability('daily_sales_summary', daily_summary_available)
+
+def monthly_agg_ready():
+    """Whether monthly series can be read from monthly_sales_agg"""
+    return cached_availability('monthly_sales_agg', monthly_agg_available)
+
+def data_fingerprint():
+    """(last month, row count) of the sales data, or None if it cannot be read"""
+    df = get_data_from_db(DATA_FINGERPRINT_QUERY)
+    if df.empty:
+        return None
+    return (str(df['last_month'].iloc[0]), int(df['row_count'].iloc[0]))
+
+def cached_forecast(series_id, method, hyperparameters, fingerprint, fit):
+    """Forecast from the on-disk cache, fitting and storing it on a miss"""
+    payload = FORECAST_CACHE.get(series_id, method, hyperparameters, fingerprint) if fingerprint else None
+    if payload is None:
+        forecast_df = fit()
+        payload = {'parameters': forecast_df.attrs.get('parameters'), 'forecast': forecast_df}
+        if fingerprint and not forecast_df.empty:
+            FORECAST_CACHE.put(series_id, method, hyperparameters, fingerprint, payload)
+    return payload['forecast']
 
 def prepare_time_series_data():
     """Prepare monthly sales data for forecasting"""
-    query = """
-    SELECT 
-        DATE_FORMAT(o.order_date, '%Y-%m-01') as month_date,
-        SUM(s.sales) as monthly_sales,
-        SUM(s.profit) as monthly_profit,
-        COUNT(DISTINCT s.order_id) as monthly_orders
-    FROM sales s
-    JOIN orders o ON s.order_id = o.order_id
-    GROUP BY DATE_FORMAT(o.order_date, '%Y-%m')
-    ORDER BY month_date
-    """
+    # The monthly aggregate answers in one short index range; the daily rollup and the
+    # fact table are fallbacks until the ETL has populated it
+    if monthly_agg_ready():
+        query = TIME_SERIES_FROM_AGG_QUERY
+    elif daily_rollup_available():
+        query = TIME_SERIES_FROM_ROLLUP_QUERY
+    else:
+        query = MONTHLY_SERIES_QUERY
     
     df = get_data_from_db(query)
     if not df.empty:
@@ -73,6 +146,7 @@ def linear_forecast(df, periods=6, target_column='monthly_sales'):
         'predicted_value': future_predictions,
         'forecast_type': 'Linear'
     })
+    forecast_df.attrs['parameters'] = {'coef': model.coef_.tolist(), 'intercept': float(model.intercept_)}
     
     return forecast_df
 
@@ -107,6 +181,7 @@ def polynomial_forecast(df, periods=6, target_column='monthly_sales', degree=2):
         'predicted_value': future_predictions,
         'forecast_type': f'Polynomial (degree {degree})'
     })
+    forecast_df.attrs['parameters'] = {'coef': model.coef_.tolist(), 'intercept': float(model.intercept_)}
     
     return forecast_df
 
@@ -127,6 +202,7 @@ def moving_average_forecast(df, periods=6, target_column='monthly_sales', window
         'predicted_value': [recent_values] * periods,
         'forecast_type': f'Moving Average ({window} months)'
     })
+    forecast_df.attrs['parameters'] = {'level': float(recent_values)}
     
     return forecast_df
 
@@ -156,25 +232,30 @@ def seasonal_forecast(df, periods=6, target_column='monthly_sales'):
         'predicted_value': predictions,
         'forecast_type': 'Seasonal'
     })
+    forecast_df.attrs['parameters'] = {'seasonal_avg': {int(month): float(value) for month, value in seasonal_avg.items()}}
     
     return forecast_df
 
-def calculate_forecast_accuracy(df, target_column='monthly_sales'):
+def calculate_forecast_accuracy(df, target_column='monthly_sales', fingerprint=None):
     """Calculate basic forecast accuracy metrics"""
-    if df.empty or len(df) < 6:
+    if df.empty or len(df) < HOLDOUT_MONTHS:
         return {}
     
     # Use last 6 months as test set
-    train_df = df.iloc[:-6]
-    test_df = df.iloc[-6:]
+    train_df = df.iloc[:-HOLDOUT_MONTHS]
+    test_df = df.iloc[-HOLDOUT_MONTHS:]
     
     if len(train_df) < 3:
         return {}
     
-    # Generate forecasts for test period
-    linear_pred = linear_forecast(train_df, periods=6, target_column=target_column)
-    poly_pred = polynomial_forecast(train_df, periods=6, target_column=target_column)
-    ma_pred = moving_average_forecast(train_df, periods=6, target_column=target_column)
+    # Generate forecasts for test period; the train split only changes with the data fingerprint
+    series_id = f"national:{target_column}:holdout{HOLDOUT_MONTHS}"
+    linear_pred = cached_forecast(series_id, 'linear', {}, fingerprint,
+                                  lambda: linear_forecast(train_df, periods=HOLDOUT_MONTHS, target_column=target_column))
+    poly_pred = cached_forecast(series_id, 'polynomial', {'degree': 2}, fingerprint,
+                                lambda: polynomial_forecast(train_df, periods=HOLDOUT_MONTHS, target_column=target_column))
+    ma_pred = cached_forecast(series_id, 'moving_average', {'window': 3}, fingerprint,
+                              lambda: moving_average_forecast(train_df, periods=HOLDOUT_MONTHS, target_column=target_column))
     
     accuracy_metrics = {}
     
@@ -195,18 +276,29 @@ def calculate_forecast_accuracy(df, target_column='monthly_sales'):
     
     return accuracy_metrics
 
-def get_sales_forecasts(periods=6):
+def get_sales_forecasts(periods=6, target_column='monthly_sales'):
     """Get comprehensive sales forecasts using multiple methods"""
-    df = prepare_time_series_data()
+    # Models and the series itself are reused until the data fingerprint changes
+    fingerprint = data_fingerprint()
+    series_id = f"national:{target_column}"
+    df = FORECAST_CACHE.get(series_id, 'history', {}, fingerprint) if fingerprint else None
+    if df is None:
+        df = prepare_time_series_data()
+        if fingerprint and not df.empty:
+            FORECAST_CACHE.put(series_id, 'history', {}, fingerprint, df)
     
     if df.empty:
-        return pd.DataFrame(), {}
+        return pd.DataFrame(), {}, df
     
     # Generate forecasts using different methods
-    linear_forecast_df = linear_forecast(df, periods)
-    poly_forecast_df = polynomial_forecast(df, periods)
-    ma_forecast_df = moving_average_forecast(df, periods)
-    seasonal_forecast_df = seasonal_forecast(df, periods)
+    linear_forecast_df = cached_forecast(series_id, 'linear', {'periods': periods}, fingerprint,
+                                         lambda: linear_forecast(df, periods, target_column))
+    poly_forecast_df = cached_forecast(series_id, 'polynomial', {'periods': periods, 'degree': 2}, fingerprint,
+                                       lambda: polynomial_forecast(df, periods, target_column))
+    ma_forecast_df = cached_forecast(series_id, 'moving_average', {'periods': periods, 'window': 3}, fingerprint,
+                                     lambda: moving_average_forecast(df, periods, target_column))
+    seasonal_forecast_df = cached_forecast(series_id, 'seasonal', {'periods': periods}, fingerprint,
+                                           lambda: seasonal_forecast(df.copy(), periods, target_column))
     
     # Combine all forecasts
     all_forecasts = []
@@ -220,7 +312,7 @@ def get_sales_forecasts(periods=6):
         combined_forecasts = pd.DataFrame()
     
     # Calculate accuracy metrics
-    accuracy_metrics = calculate_forecast_accuracy(df)
+    accuracy_metrics = calculate_forecast_accuracy(df, target_column, fingerprint)
     
     return combined_forecasts, accuracy_metrics, df
 
@@ -0,0 +1,207 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+SAMPLE_PATH = 'Sample-Superstore.csv'
+OUTPUT_PATH = 'Synthetic-Superstore.csv'
+CHUNK_ROWS = 500000
+ROWS_PER_CUSTOMER = 12
+MAX_CUSTOMERS = 1000000
+
+CSV_COLUMNS = ['Row ID', 'Order ID', 'Order Date', 'Ship Date', 'Ship Mode', 'Customer ID', 'Customer Name',
+               'Segment', 'Country', 'City', 'State', 'Postal Code', 'Region', 'Product ID', 'Category',
+               'Sub-Category', 'Product Name', 'Sales', 'Quantity', 'Discount', 'Profit']
+
+
+class GroupedSampler:
+    """Draw rows of a frame conditioned on a group code, fully vectorized.
+
+    The frame is sorted by group once; a draw for group g picks a random position
+    inside that group's contiguous block.
+    """
+
+    def __init__(self, frame, group_codes):
+        order = np.argsort(group_codes, kind='stable')
+        self.frame = frame.iloc[order].reset_index(drop=True)
+        sorted_codes = np.asarray(group_codes)[order]
+        self.groups, self.starts, self.counts = np.unique(sorted_codes, return_index=True, return_counts=True)
+
+    def sample(self, rng, group_codes):
+        positions = np.searchsorted(self.groups, group_codes)
+        positions = np.clip(positions, 0, len(self.groups) - 1)
+        offsets = (rng.random(len(group_codes)) * self.counts[positions]).astype(np.int64)
+        return self.frame.iloc[self.starts[positions] + offsets].reset_index(drop=True)
+
+
+class SuperstoreModel:
+    """Marginal distributions and order/product/customer relationships learned from the sample"""
+
+    def __init__(self, sample_df, start_year=None, end_year=None):
+        df = sample_df.copy()
+        df['Order Date'] = pd.to_datetime(df['Order Date'], format='%m/%d/%Y')
+        df['Ship Date'] = pd.to_datetime(df['Ship Date'], format='%m/%d/%Y')
+        orders = df.drop_duplicates(subset=['Order ID'])
+
+        # Order level: lines per order, prefix, seasonality, ship mode with its delay, location
+        lines = df.groupby('Order ID').size()
+        self.lines_values, lines_counts = np.unique(lines.values, return_counts=True)
+        self.lines_probs = lines_counts / lines_counts.sum()
+
+        prefixes = orders['Order ID'].str.split('-').str[0].value_counts(normalize=True)
+        self.prefix_values, self.prefix_probs = prefixes.index.to_numpy(), prefixes.to_numpy()
+
+        day_of_year = orders['Order Date'].dt.dayofyear.clip(upper=365)
+        day_counts = np.bincount(day_of_year - 1, minlength=365).astype(float) + 0.5
+        self.day_of_year_probs = day_counts / day_counts.sum()
+
+        year_counts = orders['Order Date'].dt.year.value_counts()
+        start_year = start_year or int(year_counts.index.min())
+        end_year = end_year or int(year_counts.index.max())
+        self.years = np.arange(start_year, end_year + 1)
+        year_weights = np.array([year_counts.get(year, year_counts.mean()) for year in self.years], dtype=float)
+        self.year_probs = year_weights / year_weights.sum()
+
+        self.ship_pairs = pd.DataFrame({
+            'Ship Mode': orders['Ship Mode'].to_numpy(),
+            'ship_days': (orders['Ship Date'] - orders['Order Date']).dt.days.to_numpy(),
+        })
+        self.locations = orders[['Country', 'City', 'State', 'Postal Code', 'Region']].reset_index(drop=True)
+
+        # Customers: name and segment are fixed per customer
+        self.customers = df.drop_duplicates(subset=['Customer ID'])[['Customer ID', 'Customer Name', 'Segment']] \
+            .reset_index(drop=True)
+
+        # Products: catalog with popularity and a list price recovered from sales, quantity and discount
+        products = df.drop_duplicates(subset=['Product ID'])[['Product ID', 'Category', 'Sub-Category', 'Product Name']]
+        unit_price = (df['Sales'] / (df['Quantity'] * (1 - df['Discount']))).groupby(df['Product ID']).median()
+        popularity = df['Product ID'].value_counts()
+        self.products = products.set_index('Product ID').assign(
+            unit_price=unit_price, popularity=popularity
+        ).reset_index()
+        self.product_probs = (self.products['popularity'] / self.products['popularity'].sum()).to_numpy()
+
+        quantity_values, quantity_counts = np.unique(df['Quantity'], return_counts=True)
+        self.quantity_values, self.quantity_probs = quantity_values, quantity_counts / quantity_counts.sum()
+
+        # Discount and margin depend on region and sub-category; draw them jointly per group
+        df['margin'] = df['Profit'] / df['Sales']
+        self.region_codes = {region: code for code, region in enumerate(sorted(df['Region'].unique()))}
+        self.sub_category_codes = {name: code for code, name in enumerate(sorted(df['Sub-Category'].unique()))}
+        self.pricing = GroupedSampler(df[['Discount', 'margin']], self.pricing_group(df['Region'], df['Sub-Category']))
+
+    def pricing_group(self, regions, sub_categories):
+        return (regions.map(self.region_codes).to_numpy() * len(self.sub_category_codes)
+                + sub_categories.map(self.sub_category_codes).to_numpy())
+
+    def customer_pool(self, rng, n_customers):
+        """Synthetic customers cloned from the sample's name/segment pairs with unique ids"""
+        source = self.customers.iloc[rng.integers(0, len(self.customers), n_customers)].reset_index(drop=True)
+        initials = source['Customer ID'].str.split('-').str[0]
+        numbers = pd.Series(np.arange(10000, 10000 + n_customers)).astype(str)
+        return pd.DataFrame({'Customer ID': initials + '-' + numbers,
+                             'Customer Name': source['Customer Name'],
+                             'Segment': source['Segment']})
+
+    def generate_chunk(self, rng, n_rows, first_row_id, first_order_number, customers):
+        """Generate n_rows consistent lines, whole orders at a time; returns (frame, orders used)"""
+        # Orders
+        n_orders = int(n_rows / (self.lines_values * self.lines_probs).sum()) + 1
+        lines_per_order = rng.choice(self.lines_values, n_orders, p=self.lines_probs)
+        while lines_per_order.sum() < n_rows:
+            lines_per_order = np.concatenate([lines_per_order, rng.choice(self.lines_values, n_orders, p=self.lines_probs)])
+        n_orders = int(np.searchsorted(np.cumsum(lines_per_order), n_rows) + 1)
+        lines_per_order = lines_per_order[:n_orders]
+
+        years = rng.choice(self.years, n_orders, p=self.year_probs)
+        day_offsets = rng.choice(365, n_orders, p=self.day_of_year_probs)
+        order_dates = pd.to_datetime(years.astype(str), format='%Y') + pd.to_timedelta(day_offsets, unit='D')
+        ship = self.ship_pairs.iloc[rng.integers(0, len(self.ship_pairs), n_orders)].reset_index(drop=True)
+        ship_dates = order_dates + pd.to_timedelta(ship['ship_days'].to_numpy(), unit='D')
+        location = self.locations.iloc[rng.integers(0, len(self.locations), n_orders)].reset_index(drop=True)
+        customer = customers.iloc[rng.integers(0, len(customers), n_orders)].reset_index(drop=True)
+        prefixes = pd.Series(rng.choice(self.prefix_values, n_orders, p=self.prefix_probs))
+        order_numbers = pd.Series(np.arange(first_order_number, first_order_number + n_orders)).astype(str).str.zfill(6)
+        order_ids = prefixes + '-' + pd.Series(years).astype(str) + '-' + order_numbers
+
+        orders = pd.concat([
+            pd.DataFrame({'Order ID': order_ids,
+                          'Order Date': format_dates(order_dates),
+                          'Ship Date': format_dates(ship_dates),
+                          'Ship Mode': ship['Ship Mode']}),
+            customer, location,
+        ], axis=1)
+
+        # Lines: repeat order attributes, then draw products, quantities and pricing
+        lines = orders.loc[orders.index.repeat(lines_per_order)].reset_index(drop=True).iloc[:n_rows]
+        products = self.products.iloc[rng.choice(len(self.products), n_rows, p=self.product_probs)].reset_index(drop=True)
+        quantity = rng.choice(self.quantity_values, n_rows, p=self.quantity_probs)
+        pricing = self.pricing.sample(rng, self.pricing_group(lines['Region'], products['Sub-Category']))
+        sales = (products['unit_price'].to_numpy() * quantity * (1 - pricing['Discount'].to_numpy())).round(4)
+        profit = (sales * pricing['margin'].to_numpy()).round(4)
+
+        chunk = pd.concat([lines, products[['Product ID', 'Category', 'Sub-Category', 'Product Name']]], axis=1)
+        chunk['Row ID'] = np.arange(first_row_id, first_row_id + n_rows)
+        chunk['Sales'] = sales
+        chunk['Quantity'] = quantity
+        chunk['Discount'] = pricing['Discount'].to_numpy()
+        chunk['Profit'] = profit
+        return chunk[CSV_COLUMNS], n_orders
+
+
+def format_dates(dates):
+    """Format dates as m/d/Y through a lookup of the distinct days instead of per-row strftime"""
+    days = dates.values.astype('datetime64[D]')
+    unique_days, inverse = np.unique(days, return_inverse=True)
+    labels = pd.DatetimeIndex(unique_days).strftime('%m/%d/%Y').to_numpy()
+    return pd.Series(labels[inverse])
+
+
+def generate_csv(rows, output=OUTPUT_PATH, sample_path=SAMPLE_PATH, chunk_rows=CHUNK_ROWS, seed=42,
+                 start_year=None, end_year=None):
+    """Write a synthetic Superstore CSV of exactly rows lines, chunk by chunk"""
+    rng = np.random.default_rng(seed)
+    model = SuperstoreModel(pd.read_csv(sample_path, encoding='latin1'), start_year, end_year)
+    n_customers = int(min(max(len(model.customers), rows // ROWS_PER_CUSTOMER), MAX_CUSTOMERS))
+    customers = model.customer_pool(rng, n_customers)
+
+    start_time = time.time()
+    written = 0
+    order_number = 100000
+    with open(output, 'w', encoding='latin1', errors='replace', newline='') as f:
+        while written < rows:
+            n_rows = min(chunk_rows, rows - written)
+            chunk, n_orders = model.generate_chunk(rng, n_rows, written + 1, order_number, customers)
+            chunk.to_csv(f, header=(written == 0), index=False)
+            written += n_rows
+            order_number += n_orders
+            elapsed = time.time() - start_time
+            print(f"{written:,} / {rows:,} rows written ({written / elapsed:,.0f} rows/s)")
+    return output
+
+
+def parse_rows(value):
+    """Accept plain integers as well as 100k / 10M / 1B style sizes"""
+    value = value.strip().lower()
+    multipliers = {'k': 1000, 'm': 1000000, 'b': 1000000000}
+    if value[-1] in multipliers:
+        return int(float(value[:-1]) * multipliers[value[-1]])
+    return int(value)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Superstore CSV learned from the sample")
+    parser.add_argument('rows', type=parse_rows, help="Number of rows, e.g. 100k, 10M, 100M")
+    parser.add_argument('--output', default=OUTPUT_PATH, help="Output CSV path")
+    parser.add_argument('--sample', default=SAMPLE_PATH, help="Sample CSV to learn distributions from")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help="Rows generated and written per chunk")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed for reproducible output")
+    parser.add_argument('--start-year', type=int, help="First order year (default: sample's first year)")
+    parser.add_argument('--end-year', type=int, help="Last order year (default: sample's last year)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    generate_csv(args.rows, args.output, args.sample, args.chunk_rows, args.seed, args.start_year, args.end_year)
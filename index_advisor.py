@@ -0,0 +1,264 @@
+import argparse
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+from mysql.connector import Error
+
+from db_pool import get_pool
+from workload import collect_workload
+
+# Database connection details
+DB_CONFIG = {
+    'host': 'localhost',
+    'database': os.environ.get('RETAIL_SALES_DB', 'retail_sales'),
+    'user': 'root',
+    'password': 'root'
+}
+
+# Base tables and their wide string columns (VARCHAR(255) in schema.sql). InnoDB
+# keys are limited to 3072 bytes, i.e. three utf8mb4 VARCHAR(255) columns.
+BASE_TABLES = {
+    'orders': {'order_id', 'ship_mode', 'customer_id', 'customer_name', 'segment', 'country',
+               'city', 'state', 'postal_code', 'region'},
+    'products': {'product_id', 'category', 'sub_category', 'product_name'},
+    'sales': {'order_id', 'product_id'},
+}
+TABLE_COLUMNS = {
+    'orders': BASE_TABLES['orders'] | {'order_date', 'ship_date'},
+    'products': BASE_TABLES['products'],
+    'sales': BASE_TABLES['sales'] | {'row_id', 'sales', 'quantity', 'discount', 'profit'},
+}
+MAX_STRING_KEY_PARTS = 3
+MAX_INDEX_COLUMNS = 5
+
+# Access types that mean a table is read without a selective index
+SCAN_ACCESS_TYPES = {'ALL', 'index'}
+
+TABLE_REFERENCE_PATTERN = re.compile(
+    r'\b(?:FROM|JOIN)\s+(orders|products|sales)\b(?:\s+(?:AS\s+)?(?!ON\b|JOIN\b|WHERE\b|GROUP\b|ORDER\b|LIMIT\b)(\w+))?',
+    re.IGNORECASE
+)
+JOIN_PATTERN = re.compile(r'\b(\w+)\.(\w+)\s*=\s*(\w+)\.(\w+)')
+EQUALITY_FILTER_PATTERN = re.compile(r'\b(\w+)\.(\w+)\s*(?:=|IN\b)(?!\s*\w+\.\w+)', re.IGNORECASE)
+RANGE_FILTER_PATTERN = re.compile(r'\b(\w+)\.(\w+)\s*(?:BETWEEN\b|>=|<=|>|<)', re.IGNORECASE)
+GROUP_BY_PATTERN = re.compile(r'\bGROUP\s+BY\s+(.*?)(?=\bORDER\s+BY\b|\bLIMIT\b|\bHAVING\b|\)|;|$)',
+                              re.IGNORECASE | re.DOTALL)
+COLUMN_REFERENCE_PATTERN = re.compile(r'\b(\w+)\.(\w+)\b')
+
+
+def table_aliases(sql):
+    """Map of alias -> base table for every base table the query reads"""
+    aliases = {}
+    for table, alias in TABLE_REFERENCE_PATTERN.findall(sql):
+        aliases[alias or table] = table.lower()
+    return aliases
+
+
+def column_usage(sql, aliases):
+    """Columns per base table, split by how the query uses them"""
+    usage = {table: {'equality': [], 'range': [], 'group': [], 'join': [], 'other': []}
+             for table in set(aliases.values())}
+
+    def add(role, alias, column):
+        table = aliases.get(alias)
+        if table and column not in usage[table][role]:
+            usage[table][role].append(column)
+
+    for left_alias, left_column, right_alias, right_column in JOIN_PATTERN.findall(sql):
+        add('join', left_alias, left_column)
+        add('join', right_alias, right_column)
+    for alias, column in EQUALITY_FILTER_PATTERN.findall(sql):
+        add('equality', alias, column)
+    for alias, column in RANGE_FILTER_PATTERN.findall(sql):
+        add('range', alias, column)
+    for group_clause in GROUP_BY_PATTERN.findall(sql):
+        for alias, column in COLUMN_REFERENCE_PATTERN.findall(group_clause):
+            add('group', alias, column)
+    for alias, column in COLUMN_REFERENCE_PATTERN.findall(sql):
+        add('other', alias, column)
+
+    # Unaliased single-table queries such as SELECT DISTINCT region FROM orders
+    unqualified_sql = COLUMN_REFERENCE_PATTERN.sub(' ', sql)
+    for alias, table in aliases.items():
+        if alias == table:
+            for column in re.findall(r'\b\w+\b', unqualified_sql):
+                if column.lower() in TABLE_COLUMNS[table]:
+                    add('other', alias, column.lower())
+    return usage
+
+
+def candidate_index(table, roles):
+    """Composite index: equality filters, range filter, grouping, join keys, then covered columns"""
+    columns = []
+    for role in ('equality', 'range', 'group', 'join', 'other'):
+        for column in roles[role]:
+            if column in columns:
+                continue
+            if role == 'range' and any(c in roles['range'] for c in columns):
+                continue  # columns after a range predicate cannot be used for lookups
+            string_parts = sum(c in BASE_TABLES[table] for c in columns + [column])
+            if string_parts > MAX_STRING_KEY_PARTS or len(columns) >= MAX_INDEX_COLUMNS:
+                continue
+            columns.append(column)
+    return tuple(columns)
+
+
+def explain(connection, sql, params=()):
+    """EXPLAIN rows for a query as a list of dicts"""
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute(f"EXPLAIN {sql.strip().rstrip(';')}", tuple(params) or None)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def plan_summary(plan_rows):
+    return ', '.join(
+        f"{row['table']}:{row['type']}({row['key'] or '-'}, {row['rows']} rows)" for row in plan_rows
+    )
+
+
+def time_query(connection, sql, params=(), repeats=5):
+    """Median wall-clock milliseconds over repeated executions"""
+    cursor = connection.cursor()
+    timings = []
+    try:
+        for _ in range(repeats):
+            start_time = time.perf_counter()
+            cursor.execute(sql.strip().rstrip(';'), tuple(params) or None)
+            cursor.fetchall()
+            timings.append((time.perf_counter() - start_time) * 1000)
+    finally:
+        cursor.close()
+    return float(np.median(timings))
+
+
+def existing_indexes(connection):
+    """Column tuples of every index on the base tables"""
+    cursor = connection.cursor()
+    cursor.execute("""
+    SELECT table_name, index_name, column_name
+    FROM information_schema.statistics
+    WHERE table_schema = DATABASE()
+    ORDER BY table_name, index_name, seq_in_index
+    """)
+    indexes = {}
+    for table, index_name, column in cursor.fetchall():
+        indexes.setdefault((table.lower(), index_name), []).append(column.lower())
+    cursor.close()
+    result = {table: [] for table in BASE_TABLES}
+    for (table, _), columns in indexes.items():
+        if table in result:
+            result[table].append(tuple(columns))
+    return result
+
+
+def propose_indexes(connection, workload):
+    """EXPLAIN the workload and propose indexes for tables that are scanned"""
+    indexes = existing_indexes(connection)
+    proposals = {}
+    plans = {}
+
+    for query in workload:
+        try:
+            plan_rows = explain(connection, query['sql'], query['params'])
+        except Error as err:
+            print(f"Skipping {query['name']}: EXPLAIN failed ('{err}')")
+            continue
+        plans[query['name']] = plan_rows
+
+        aliases = table_aliases(query['sql'])
+        usage = column_usage(query['sql'], aliases)
+        for row in plan_rows:
+            table = aliases.get(row['table'])
+            if table is None or row['type'] not in SCAN_ACCESS_TYPES:
+                continue
+            columns = candidate_index(table, usage[table])
+            if not columns:
+                continue
+            if any(existing[:len(columns)] == columns for existing in indexes[table]):
+                continue
+            proposals.setdefault((table, columns), []).append(query['name'])
+
+    # Drop candidates that are a prefix of a longer candidate on the same table
+    kept = {}
+    for (table, columns), queries in sorted(proposals.items(), key=lambda item: -len(item[0][1])):
+        longer = next((other for other in kept if other[0] == table and other[1][:len(columns)] == columns), None)
+        if longer:
+            kept[longer].extend(q for q in queries if q not in kept[longer])
+        else:
+            kept[(table, columns)] = list(queries)
+
+    return [
+        {'table': table, 'columns': columns, 'name': index_name(table, columns),
+         'ddl': f"CREATE INDEX {index_name(table, columns)} ON {table} ({', '.join(columns)});",
+         'queries': queries}
+        for (table, columns), queries in kept.items()
+    ], plans
+
+
+def index_name(table, columns):
+    return f"idx_{table}_{'_'.join(columns)}"[:64]
+
+
+def apply_indexes(connection, proposals):
+    cursor = connection.cursor()
+    for proposal in proposals:
+        try:
+            cursor.execute(proposal['ddl'])
+            print(f"Created {proposal['name']}")
+        except Error as err:
+            print(f"Could not create {proposal['name']}: '{err}'")
+    cursor.close()
+
+
+def run_advisor(apply=False, repeats=5):
+    """Propose indexes for the workload and, if apply is set, create them and time before/after"""
+    workload = collect_workload()
+    with get_pool(DB_CONFIG).connection() as connection:
+        proposals, plans_before = propose_indexes(connection, workload)
+
+        print("Proposed indexes:")
+        for proposal in proposals:
+            print(f"  {proposal['ddl']}  -- {', '.join(proposal['queries'])}")
+        if not proposals:
+            print("  none, every workload query already uses an index")
+
+        report = []
+        for query in workload:
+            if query['name'] not in plans_before:
+                continue
+            report.append({
+                'query': query['name'],
+                'source': query['source'],
+                'before_ms': time_query(connection, query['sql'], query['params'], repeats),
+                'plan_before': plan_summary(plans_before[query['name']]),
+            })
+
+        if apply and proposals:
+            apply_indexes(connection, proposals)
+            for row, query in zip(report, [q for q in workload if q['name'] in plans_before]):
+                row['after_ms'] = time_query(connection, query['sql'], query['params'], repeats)
+                row['plan_after'] = plan_summary(explain(connection, query['sql'], query['params']))
+                row['speedup'] = row['before_ms'] / row['after_ms'] if row['after_ms'] > 0 else np.nan
+
+    report_df = pd.DataFrame(report)
+    with pd.option_context('display.max_colwidth', 80, 'display.width', 200):
+        print(report_df.to_string(index=False))
+    return proposals, report_df
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="EXPLAIN-driven index advisor for the retail_sales workload")
+    parser.add_argument('--apply', action='store_true', help="Create the proposed indexes and time the workload again")
+    parser.add_argument('--repeats', type=int, default=5, help="Executions per query when timing")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run_advisor(apply=args.apply, repeats=args.repeats)
@@ -0,0 +1,178 @@
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+
+# Touched by the ETL after every load so running dashboards reload their snapshot
+SNAPSHOT_MARKER = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.local_snapshot_version')
+
+ORDERS_TABLE_COLUMNS = ['order_id', 'order_date', 'ship_date', 'ship_mode', 'customer_id', 'customer_name',
+                        'segment', 'country', 'city', 'state', 'postal_code', 'region']
+PRODUCTS_TABLE_COLUMNS = ['product_id', 'category', 'sub_category', 'product_name']
+SALES_TABLE_COLUMNS = ['row_id', 'order_id', 'product_id', 'sales', 'quantity', 'discount', 'profit']
+
+# DuckDB versions of the views in advanced_sql.sql
+LOCAL_VIEWS = [
+    """
+    CREATE OR REPLACE VIEW sales_by_category_view AS
+    SELECT
+        p.category,
+        SUM(s.sales) AS total_sales,
+        SUM(s.profit) AS total_profit
+    FROM sales s
+    JOIN products p ON s.product_id = p.product_id
+    GROUP BY p.category
+    ORDER BY total_sales DESC
+    """,
+    """
+    CREATE OR REPLACE VIEW monthly_sales_profit_view AS
+    SELECT
+        strftime(o.order_date, '%Y-%m') AS sales_month,
+        SUM(s.sales) AS monthly_sales,
+        SUM(s.profit) AS monthly_profit
+    FROM sales s
+    JOIN orders o ON s.order_id = o.order_id
+    GROUP BY sales_month
+    ORDER BY sales_month
+    """,
+]
+
+
+def mark_snapshot_stale():
+    """Signal running dashboards that the MySQL data changed and snapshots must reload"""
+    with open(SNAPSHOT_MARKER, 'w') as f:
+        f.write(str(time.time()))
+
+
+def snapshot_version():
+    try:
+        return os.path.getmtime(SNAPSHOT_MARKER)
+    except OSError:
+        return None
+
+
+def _split_call(sql, open_paren):
+    """Split the arguments of the call whose '(' is at open_paren; returns (args, close_paren)"""
+    depth = 0
+    quote = None
+    args = []
+    start = open_paren + 1
+    for i in range(open_paren, len(sql)):
+        char = sql[i]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                args.append(sql[start:i])
+                return args, i
+        elif char == ',' and depth == 1:
+            args.append(sql[start:i])
+            start = i + 1
+    raise ValueError("Unbalanced parentheses in query")
+
+
+def _rewrite_function(sql, name, rewrite):
+    pattern = re.compile(rf'\b{name}\s*\(', re.IGNORECASE)
+    match = pattern.search(sql)
+    while match:
+        open_paren = match.end() - 1
+        args, close_paren = _split_call(sql, open_paren)
+        replacement = rewrite([_rewrite_function(arg.strip(), name, rewrite) for arg in args])
+        sql = sql[:match.start()] + replacement + sql[close_paren + 1:]
+        match = pattern.search(sql, match.start() + len(replacement))
+    return sql
+
+
+def translate_mysql_query(sql):
+    """Translate the MySQL dialect used by the dashboard into DuckDB SQL"""
+    sql = _rewrite_function(sql, 'DATE_FORMAT', lambda args: f"strftime({args[0]}, {args[1]})")
+    sql = _rewrite_function(sql, 'DATEDIFF', lambda args: f"date_diff('day', {args[1]}, {args[0]})")
+    sql = re.sub(r'\bCURDATE\s*\(\s*\)', 'current_date', sql, flags=re.IGNORECASE)
+    return re.sub(r'(?<!%)%s', '?', sql)
+
+
+def is_local_query(sql):
+    """Queries the local engine can answer; stored procedures and server metadata stay on MySQL"""
+    statement = sql.strip().lstrip('(').upper()
+    return statement.startswith(('SELECT', 'WITH')) and 'INFORMATION_SCHEMA' not in statement
+
+
+class LocalAnalyticsEngine:
+    """In-process DuckDB copy of the orders/products/sales star schema"""
+
+    def __init__(self):
+        # Imported here so MySQL-mode dashboards never pay for loading duckdb
+        try:
+            import duckdb
+        except ImportError as e:  # optional dependency, only needed for the local engine mode
+            raise ImportError("The local analytical engine requires the duckdb package") from e
+        self._connection = duckdb.connect(database=':memory:')
+        self._lock = threading.Lock()
+        self.loaded_version = None
+        self.loaded_at = None
+
+    def load_frames(self, orders_df, products_df, sales_df):
+        """Replace the snapshot with the given table frames"""
+        with self._lock:
+            for table, frame in (('orders', orders_df), ('products', products_df), ('sales', sales_df)):
+                self._connection.register(f'{table}_frame', frame)
+                self._connection.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM {table}_frame")
+                self._connection.unregister(f'{table}_frame')
+            for view_sql in LOCAL_VIEWS:
+                self._connection.execute(view_sql)
+            self.loaded_version = snapshot_version()
+            self.loaded_at = time.time()
+
+    def load_from_mysql(self, connection):
+        """Snapshot the star schema from MySQL with one full read per table"""
+        self.load_frames(
+            pd.read_sql(f"SELECT {', '.join(ORDERS_TABLE_COLUMNS)} FROM orders", connection),
+            pd.read_sql(f"SELECT {', '.join(PRODUCTS_TABLE_COLUMNS)} FROM products", connection),
+            pd.read_sql(f"SELECT {', '.join(SALES_TABLE_COLUMNS)} FROM sales", connection),
+        )
+
+    def load_from_csv(self, csv_path):
+        """Build the snapshot straight from a Superstore CSV, without any MySQL server"""
+        from etl_script import parse_dates, prepare_table_frames
+
+        df = parse_dates(pd.read_csv(csv_path, encoding='latin1'))
+        orders_df, products_df, sales_df = prepare_table_frames(df)
+        orders_df = orders_df.set_axis(ORDERS_TABLE_COLUMNS, axis=1)
+        orders_df['postal_code'] = orders_df['postal_code'].astype(str)
+        self.load_frames(
+            orders_df,
+            products_df.set_axis(PRODUCTS_TABLE_COLUMNS, axis=1),
+            sales_df.set_axis(SALES_TABLE_COLUMNS, axis=1),
+        )
+
+    def is_stale(self):
+        return snapshot_version() != self.loaded_version
+
+    def query(self, sql, params=()):
+        """Run a MySQL-dialect query against the snapshot and return a DataFrame"""
+        with self._lock:
+            return self._connection.execute(translate_mysql_query(sql), list(params)).df()
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_local_engine(load):
+    """Shared engine, (re)loaded through load(engine) on first use and after every ETL run"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = LocalAnalyticsEngine()
+            load(_engine)
+        elif _engine.is_stale():
+            load(_engine)
+        return _engine
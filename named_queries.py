@@ -0,0 +1,455 @@
+import os
+import weakref
+from datetime import timedelta
+from itertools import combinations
+
+import pandas as pd
+
+from rollups import (COHORT_RETENTION_FROM_MATRIX_QUERY, OVERVIEW_KPIS_FROM_ROLLUP_QUERY, MONTHLY_TREND_FROM_AGG_QUERY,
+                     MONTHLY_TREND_FROM_ROLLUP_QUERY)
+
+# Parameterized dashboard queries. Placeholders are bound server-side and each
+# query keeps its prepared statement for the lifetime of the pooled connection.
+# Current range and the equally long prior range in one pass: params are
+# (start_date x 6, prior_start, end_date), see overview_kpi_params
+OVERVIEW_KPIS_QUERY = """
+SELECT 
+    SUM(CASE WHEN o.order_date >= %s THEN s.sales END) as total_sales,
+    SUM(CASE WHEN o.order_date >= %s THEN s.profit END) as total_profit,
+    COUNT(DISTINCT CASE WHEN o.order_date >= %s THEN s.order_id END) as total_orders,
+    SUM(CASE WHEN o.order_date < %s THEN s.sales END) as prior_sales,
+    SUM(CASE WHEN o.order_date < %s THEN s.profit END) as prior_profit,
+    COUNT(DISTINCT CASE WHEN o.order_date < %s THEN s.order_id END) as prior_orders
+FROM sales s 
+JOIN orders o ON s.order_id = o.order_id 
+WHERE o.order_date BETWEEN %s AND %s
+"""
+
+# Sales analysis filters and the condition each one adds when it is set
+FILTERED_SALES_FILTERS = (
+    ('region', "o.region = %s"),
+    ('category', "p.category = %s"),
+    ('min_sales', "s.sales >= %s"),
+)
+
+FILTERED_SALES_QUERY = """
+SELECT 
+    o.region,
+    p.category,
+    SUM(s.sales) as total_sales,
+    SUM(s.profit) as total_profit,
+    COUNT(*) as transaction_count
+FROM sales s
+JOIN orders o ON s.order_id = o.order_id
+JOIN products p ON s.product_id = p.product_id
+{where}GROUP BY o.region, p.category
+ORDER BY total_sales DESC
+"""
+
+
+def filtered_sales_name(filters):
+    """Named query of the filtered sales variant for a set of filters"""
+    return 'filtered_sales_by_' + '_'.join(filters) if filters else 'filtered_sales'
+
+
+def filtered_sales_sql(filters, query=FILTERED_SALES_QUERY, filter_conditions=FILTERED_SALES_FILTERS):
+    """Filtered sales with a WHERE clause built only from the filters that are set.
+
+    A catch-all "(%s IS NULL OR col = %s)" predicate compiles into one generic plan
+    that cannot use an index or prune joins for any of the filters.
+    """
+    conditions = [condition for name, condition in filter_conditions if name in filters]
+    where = "WHERE " + "\n  AND ".join(conditions) + "\n" if conditions else ""
+    return query.format(where=where)
+
+
+# One named query, and so one prepared statement, per combination of set filters
+FILTERED_SALES_VARIANTS = {
+    filtered_sales_name(filters): filters
+    for size in range(len(FILTERED_SALES_FILTERS) + 1)
+    for filters in combinations([name for name, _ in FILTERED_SALES_FILTERS], size)
+}
+
+
+def filtered_sales_query(region=None, category=None, min_sales=None):
+    """Name and parameters of the filtered sales variant matching the filters that are set"""
+    values = {'region': region, 'category': category, 'min_sales': min_sales}
+    filters = tuple(name for name, _ in FILTERED_SALES_FILTERS if values[name] is not None)
+    return filtered_sales_name(filters), tuple(values[name] for name in filters)
+
+CUSTOMER_LIFETIME_VALUE_QUERY = """
+WITH CustomerSales AS (
+    SELECT
+        o.customer_id,
+        o.customer_name,
+        SUM(s.sales) AS total_sales,
+        COUNT(DISTINCT s.order_id) AS total_orders,
+        MIN(o.order_date) AS first_order,
+        MAX(o.order_date) AS last_order
+    FROM sales s
+    JOIN orders o ON s.order_id = o.order_id
+    GROUP BY o.customer_id, o.customer_name
+),
+RankedCustomers AS (
+    SELECT
+        customer_id,
+        customer_name,
+        total_sales,
+        total_orders,
+        first_order,
+        last_order,
+        DATEDIFF(last_order, first_order) AS customer_lifespan_days,
+        ROW_NUMBER() OVER (ORDER BY total_sales DESC) as sales_rank
+    FROM CustomerSales
+)
+SELECT
+    customer_name,
+    total_sales,
+    total_orders,
+    sales_rank,
+    customer_lifespan_days,
+    (total_sales / total_orders) AS average_order_value,
+    CASE 
+        WHEN customer_lifespan_days > 0 
+        THEN (total_sales / customer_lifespan_days) * 365 
+        ELSE total_sales 
+    END AS estimated_annual_value
+FROM RankedCustomers
+ORDER BY estimated_annual_value DESC
+LIMIT 20;
+"""
+
+# Cohort = month of a customer's first order; customers in each later month are counted
+# against it. Used until the ETL has populated cohort_retention.
+COHORT_RETENTION_QUERY = """
+WITH FirstOrders AS (
+    SELECT 
+        customer_id,
+        DATE_FORMAT(MIN(order_date), '%Y-%m') AS cohort_month
+    FROM orders
+    GROUP BY customer_id
+),
+CustomerMonths AS (
+    SELECT DISTINCT
+        o.customer_id,
+        f.cohort_month,
+        DATE_FORMAT(o.order_date, '%Y-%m') AS order_month
+    FROM orders o
+    JOIN FirstOrders f ON o.customer_id = f.customer_id
+),
+CohortSizes AS (
+    SELECT 
+        cohort_month,
+        COUNT(*) AS cohort_size
+    FROM FirstOrders
+    GROUP BY cohort_month
+)
+SELECT 
+    cm.cohort_month,
+    cm.order_month,
+    COUNT(*) AS customers,
+    cs.cohort_size,
+    ROUND(COUNT(*) * 100.0 / cs.cohort_size, 2) AS retention_rate
+FROM CustomerMonths cm
+JOIN CohortSizes cs ON cm.cohort_month = cs.cohort_month
+GROUP BY cm.cohort_month, cm.order_month, cs.cohort_size
+ORDER BY cm.cohort_month, cm.order_month;
+"""
+
+CUSTOMER_SEGMENTATION_QUERY = """
+WITH CustomerMetrics AS (
+    SELECT 
+        o.customer_id,
+        o.customer_name,
+        COUNT(DISTINCT s.order_id) as order_frequency,
+        SUM(s.sales) as total_sales,
+        AVG(s.sales) as avg_order_value,
+        DATEDIFF(CURDATE(), MAX(o.order_date)) as days_since_last_order
+    FROM sales s
+    JOIN orders o ON s.order_id = o.order_id
+    GROUP BY o.customer_id, o.customer_name
+)
+SELECT 
+    customer_name,
+    order_frequency,
+    total_sales,
+    avg_order_value,
+    days_since_last_order,
+    CASE 
+        WHEN order_frequency >= 10 AND total_sales >= 1000 THEN 'VIP'
+        WHEN order_frequency >= 5 AND total_sales >= 500 THEN 'Loyal'
+        WHEN order_frequency >= 2 AND total_sales >= 200 THEN 'Regular'
+        ELSE 'New'
+    END as customer_segment
+FROM CustomerMetrics
+ORDER BY total_sales DESC
+LIMIT 100;
+"""
+
+REGIONAL_PERFORMANCE_QUERY = """
+SELECT 
+    o.region,
+    o.state,
+    COUNT(DISTINCT o.customer_id) as unique_customers,
+    COUNT(DISTINCT s.order_id) as total_orders,
+    SUM(s.sales) as total_sales,
+    SUM(s.profit) as total_profit,
+    AVG(s.sales) as avg_order_value,
+    SUM(s.profit) / SUM(s.sales) * 100 as profit_margin_pct
+FROM sales s
+JOIN orders o ON s.order_id = o.order_id
+GROUP BY o.region, o.state
+ORDER BY total_sales DESC;
+"""
+
+NAMED_QUERIES = {
+    'overview_kpis': OVERVIEW_KPIS_QUERY,
+    'overview_kpis_rollup': OVERVIEW_KPIS_FROM_ROLLUP_QUERY,
+    'monthly_trend': "SELECT * FROM monthly_sales_profit_view",
+    'monthly_trend_rollup': MONTHLY_TREND_FROM_ROLLUP_QUERY,
+    'monthly_trend_agg': MONTHLY_TREND_FROM_AGG_QUERY,
+    'sales_by_category': "SELECT * FROM sales_by_category_view",
+    'distinct_regions': "SELECT DISTINCT region FROM orders",
+    'distinct_categories': "SELECT DISTINCT category FROM products",
+    'customer_lifetime_value': CUSTOMER_LIFETIME_VALUE_QUERY,
+    'cohort_retention': COHORT_RETENTION_QUERY,
+    'cohort_retention_matrix': COHORT_RETENTION_FROM_MATRIX_QUERY,
+    'customer_segmentation': CUSTOMER_SEGMENTATION_QUERY,
+    'regional_performance': REGIONAL_PERFORMANCE_QUERY,
+}
+NAMED_QUERIES.update({name: filtered_sales_sql(filters) for name, filters in FILTERED_SALES_VARIANTS.items()})
+
+# Schema of the database the dashboard reads: 'standard' (schema.sql) or 'compact'
+# (schema_compact.sql, loaded with `etl_script.py --compact`)
+SCHEMA = os.environ.get('RETAIL_SALES_SCHEMA', 'standard')
+
+# The compact schema's versions of the queries that scan the fact table. They join on
+# the integer keys and read names from the dictionary tables, instead of going through
+# the orders, products and sales views that rebuild the string ids with joins.
+COMPACT_OVERVIEW_KPIS_QUERY = """
+SELECT 
+    SUM(CASE WHEN o.order_date >= %s THEN s.sales END) as total_sales,
+    SUM(CASE WHEN o.order_date >= %s THEN s.profit END) as total_profit,
+    COUNT(DISTINCT CASE WHEN o.order_date >= %s THEN s.order_key END) as total_orders,
+    SUM(CASE WHEN o.order_date < %s THEN s.sales END) as prior_sales,
+    SUM(CASE WHEN o.order_date < %s THEN s.profit END) as prior_profit,
+    COUNT(DISTINCT CASE WHEN o.order_date < %s THEN s.order_key END) as prior_orders
+FROM compact_sales s 
+JOIN compact_orders o ON s.order_key = o.order_key 
+WHERE o.order_date BETWEEN %s AND %s
+"""
+
+COMPACT_FILTERED_SALES_FILTERS = (
+    ('region', "r.region = %s"),
+    ('category', "cat.category = %s"),
+    ('min_sales', "s.sales >= %s"),
+)
+
+COMPACT_FILTERED_SALES_QUERY = """
+SELECT 
+    r.region,
+    cat.category,
+    SUM(s.sales) as total_sales,
+    SUM(s.profit) as total_profit,
+    COUNT(*) as transaction_count
+FROM compact_sales s
+JOIN compact_orders o ON s.order_key = o.order_key
+JOIN dim_location l ON o.location_key = l.location_key
+JOIN dim_region r ON l.region_key = r.region_key
+JOIN compact_products p ON s.product_key = p.product_key
+JOIN dim_sub_category sc ON p.sub_category_key = sc.sub_category_key
+JOIN dim_category cat ON sc.category_key = cat.category_key
+{where}GROUP BY r.region, cat.category
+ORDER BY total_sales DESC
+"""
+
+COMPACT_CUSTOMER_LIFETIME_VALUE_QUERY = """
+WITH CustomerSales AS (
+    SELECT
+        o.customer_key,
+        SUM(s.sales) AS total_sales,
+        COUNT(DISTINCT s.order_key) AS total_orders,
+        MIN(o.order_date) AS first_order,
+        MAX(o.order_date) AS last_order
+    FROM compact_sales s
+    JOIN compact_orders o ON s.order_key = o.order_key
+    GROUP BY o.customer_key
+),
+RankedCustomers AS (
+    SELECT
+        c.customer_name,
+        cs.total_sales,
+        cs.total_orders,
+        cs.first_order,
+        cs.last_order,
+        DATEDIFF(cs.last_order, cs.first_order) AS customer_lifespan_days,
+        ROW_NUMBER() OVER (ORDER BY cs.total_sales DESC) as sales_rank
+    FROM CustomerSales cs
+    JOIN dim_customer c ON cs.customer_key = c.customer_key
+)
+SELECT
+    customer_name,
+    total_sales,
+    total_orders,
+    sales_rank,
+    customer_lifespan_days,
+    (total_sales / total_orders) AS average_order_value,
+    CASE 
+        WHEN customer_lifespan_days > 0 
+        THEN (total_sales / customer_lifespan_days) * 365 
+        ELSE total_sales 
+    END AS estimated_annual_value
+FROM RankedCustomers
+ORDER BY estimated_annual_value DESC
+LIMIT 20;
+"""
+
+COMPACT_COHORT_RETENTION_QUERY = """
+WITH FirstOrders AS (
+    SELECT 
+        customer_key,
+        DATE_FORMAT(MIN(order_date), '%Y-%m') AS cohort_month
+    FROM compact_orders
+    GROUP BY customer_key
+),
+CustomerMonths AS (
+    SELECT DISTINCT
+        o.customer_key,
+        f.cohort_month,
+        DATE_FORMAT(o.order_date, '%Y-%m') AS order_month
+    FROM compact_orders o
+    JOIN FirstOrders f ON o.customer_key = f.customer_key
+),
+CohortSizes AS (
+    SELECT 
+        cohort_month,
+        COUNT(*) AS cohort_size
+    FROM FirstOrders
+    GROUP BY cohort_month
+)
+SELECT 
+    cm.cohort_month,
+    cm.order_month,
+    COUNT(*) AS customers,
+    cs.cohort_size,
+    ROUND(COUNT(*) * 100.0 / cs.cohort_size, 2) AS retention_rate
+FROM CustomerMonths cm
+JOIN CohortSizes cs ON cm.cohort_month = cs.cohort_month
+GROUP BY cm.cohort_month, cm.order_month, cs.cohort_size
+ORDER BY cm.cohort_month, cm.order_month;
+"""
+
+COMPACT_CUSTOMER_SEGMENTATION_QUERY = """
+WITH CustomerMetrics AS (
+    SELECT 
+        o.customer_key,
+        COUNT(DISTINCT s.order_key) as order_frequency,
+        SUM(s.sales) as total_sales,
+        AVG(s.sales) as avg_order_value,
+        DATEDIFF(CURDATE(), MAX(o.order_date)) as days_since_last_order
+    FROM compact_sales s
+    JOIN compact_orders o ON s.order_key = o.order_key
+    GROUP BY o.customer_key
+)
+SELECT 
+    c.customer_name,
+    m.order_frequency,
+    m.total_sales,
+    m.avg_order_value,
+    m.days_since_last_order,
+    CASE 
+        WHEN m.order_frequency >= 10 AND m.total_sales >= 1000 THEN 'VIP'
+        WHEN m.order_frequency >= 5 AND m.total_sales >= 500 THEN 'Loyal'
+        WHEN m.order_frequency >= 2 AND m.total_sales >= 200 THEN 'Regular'
+        ELSE 'New'
+    END as customer_segment
+FROM CustomerMetrics m
+JOIN dim_customer c ON m.customer_key = c.customer_key
+ORDER BY m.total_sales DESC
+LIMIT 100;
+"""
+
+COMPACT_REGIONAL_PERFORMANCE_QUERY = """
+SELECT 
+    r.region,
+    l.state,
+    COUNT(DISTINCT o.customer_key) as unique_customers,
+    COUNT(DISTINCT s.order_key) as total_orders,
+    SUM(s.sales) as total_sales,
+    SUM(s.profit) as total_profit,
+    AVG(s.sales) as avg_order_value,
+    SUM(s.profit) / SUM(s.sales) * 100 as profit_margin_pct
+FROM compact_sales s
+JOIN compact_orders o ON s.order_key = o.order_key
+JOIN dim_location l ON o.location_key = l.location_key
+JOIN dim_region r ON l.region_key = r.region_key
+GROUP BY r.region, l.state
+ORDER BY total_sales DESC;
+"""
+
+# Named queries replaced on the compact schema. The rollup queries read the same tables
+# on both schemas, and schema_compact.sql defines the two dashboard views on the integer keys.
+COMPACT_NAMED_QUERIES = {
+    'overview_kpis': COMPACT_OVERVIEW_KPIS_QUERY,
+    'distinct_regions': "SELECT region FROM dim_region",
+    'distinct_categories': "SELECT category FROM dim_category",
+    'customer_lifetime_value': COMPACT_CUSTOMER_LIFETIME_VALUE_QUERY,
+    'cohort_retention': COMPACT_COHORT_RETENTION_QUERY,
+    'customer_segmentation': COMPACT_CUSTOMER_SEGMENTATION_QUERY,
+    'regional_performance': COMPACT_REGIONAL_PERFORMANCE_QUERY,
+}
+COMPACT_NAMED_QUERIES.update({
+    name: filtered_sales_sql(filters, COMPACT_FILTERED_SALES_QUERY, COMPACT_FILTERED_SALES_FILTERS)
+    for name, filters in FILTERED_SALES_VARIANTS.items()
+})
+
+
+def named_query_sql(name, schema=SCHEMA):
+    """SQL of a named query for the schema the database follows"""
+    if schema == 'compact':
+        return COMPACT_NAMED_QUERIES.get(name, NAMED_QUERIES[name])
+    return NAMED_QUERIES[name]
+
+# Prepared cursors per pooled connection. Keys are weak so the handles go away
+# together with connections the pool discards or replaces.
+_prepared_cursors = weakref.WeakKeyDictionary()
+
+
+def prepared_cursor(connection, name):
+    """Prepared cursor for a named query, reused for as long as the connection lives"""
+    cursors = _prepared_cursors.setdefault(connection, {})
+    cursor = cursors.get(name)
+    if cursor is None:
+        cursor = connection.cursor(prepared=True)
+        cursors[name] = cursor
+    return cursor
+
+
+def forget_prepared_statements(connection):
+    """Drop the cached handles of a connection, e.g. after an error on it"""
+    for cursor in _prepared_cursors.pop(connection, {}).values():
+        try:
+            cursor.close()
+        except Exception:
+            pass
+
+
+def overview_kpi_params(start_date, end_date):
+    """Parameters of the overview KPI queries: the range plus the equally long range before it"""
+    prior_start = start_date - (end_date - start_date) - timedelta(days=1)
+    return (start_date,) * 6 + (prior_start, end_date)
+
+
+def execute_named_query(connection, name, params=()):
+    """Run a named query as a server-side prepared statement and return a DataFrame"""
+    query = named_query_sql(name)
+    cursor = prepared_cursor(connection, name)
+    try:
+        # Passing the same string object lets the cursor skip re-preparing
+        cursor.execute(query, tuple(params))
+        rows = cursor.fetchall()
+    except Exception:
+        forget_prepared_statements(connection)
+        raise
+    columns = [desc[0] for desc in cursor.description]
+    return pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
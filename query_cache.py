@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import OrderedDict
+
+from mysql.connector import Error
+
+# Default cache settings
+MAX_ENTRIES = 256
+TTL_SECONDS = 3600.0
+VERSION_CHECK_INTERVAL = 5.0
+
+SALES_LOG_HIGH_WATER_MARK_QUERY = "SELECT MAX(log_id) FROM sales_log"
+
+# The ETL stamps this etl_watermarks row once the load and every rollup refresh are done
+ETL_RUN_MARKER = 'etl_run'
+ETL_COMPLETED_QUERY = """
+INSERT INTO etl_watermarks (table_name) VALUES (%s)
+ON DUPLICATE KEY UPDATE updated_at = CURRENT_TIMESTAMP
+"""
+ETL_COMPLETION_MARK_QUERY = "SELECT updated_at FROM etl_watermarks WHERE table_name = %s"
+
+
+def _fetch_mark(connection, query, params=()):
+    cursor = connection.cursor()
+    try:
+        cursor.execute(query, params)
+        row = cursor.fetchone()
+        return row[0] if row else None
+    except Error:
+        return None
+    finally:
+        cursor.close()
+
+
+def sales_log_high_water_mark(connection):
+    """Latest sales_log id written by the sales triggers, or None if the log is unavailable"""
+    return _fetch_mark(connection, SALES_LOG_HIGH_WATER_MARK_QUERY)
+
+
+def etl_completion_mark(connection):
+    """Time the last ETL run finished refreshing the rollups, or None before the first run"""
+    return _fetch_mark(connection, ETL_COMPLETION_MARK_QUERY, (ETL_RUN_MARKER,))
+
+
+def mark_etl_completed(connection):
+    """Record that the fact tables and every rollup built from them are in step"""
+    cursor = connection.cursor()
+    cursor.execute(ETL_COMPLETED_QUERY, (ETL_RUN_MARKER,))
+    connection.commit()
+    cursor.close()
+
+
+def data_version(connection):
+    """Cache version: the last completed ETL run plus the latest trigger-logged sales change.
+
+    The sales_log mark alone moves as soon as the ETL writes sales rows, before the
+    rollups are rebuilt, and never for orders or products writes; the ETL completion
+    mark moves once everything derived from those writes is refreshed.
+    """
+    return (etl_completion_mark(connection), sales_log_high_water_mark(connection))
+
+
+class QueryResultCache:
+    """TTL + LRU cache for query results, invalidated when the data version moves.
+
+    Every entry remembers the version it was computed at (see data_version). An entry
+    is served until it expires, an ETL run completes or the triggers log newer changes.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, ttl=TTL_SECONDS, version_check_interval=VERSION_CHECK_INTERVAL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version_check_interval = version_check_interval
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self._version_checked_at = None
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+
+    def current_version(self, fetch_version):
+        """Data version, refreshed at most once per version_check_interval"""
+        now = time.monotonic()
+        with self._lock:
+            if self._version_checked_at is not None and now - self._version_checked_at < self.version_check_interval:
+                return self._version
+        version = fetch_version()
+        with self._lock:
+            self._version = version
+            self._version_checked_at = now
+        return version
+
+    def get(self, key, version):
+        """Cached value for key if it is still fresh at version, else None"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            value, entry_version, created_at = entry
+            if now - created_at > self.ttl:
+                del self._entries[key]
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+            if entry_version != version:
+                del self._entries[key]
+                self._stats['invalidations'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return value
+
+    def put(self, key, value, version):
+        with self._lock:
+            self._entries[key] = (value, version, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._version_checked_at = None
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['version'] = self._version
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+
+# Shared by every caller in the process; Streamlit re-executes the app script on
+# each interaction, so the cache has to live in an imported module to persist
+RESULT_CACHE = QueryResultCache()
@@ -0,0 +1,186 @@
+import contextvars
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from mysql.connector import Error
+
+from db_pool import get_pool
+
+# Ad-hoc queries get their own small pool so they can never take the dashboard's connections
+EDITOR_POOL_SIZE = 2
+EDITOR_CHECKOUT_TIMEOUT = 2.0
+
+# Execution budget per query, and how long the watchdog waits past it before KILL QUERY
+EDITOR_TIMEOUT = 30.0
+WATCHDOG_GRACE = 2.0
+
+MAX_QUERIES_PER_SESSION = 1
+
+
+class ConcurrencyLimitError(Error):
+    """Raised when a session already runs as many editor queries as it may"""
+
+
+class QueryGuard:
+    """Runs ad-hoc queries with an execution budget, cancellation and per-session limits.
+
+    SELECT statements are bounded server-side through MAX_EXECUTION_TIME; everything
+    else (CALL, DML, DDL) is stopped by a watchdog that issues KILL QUERY from a
+    separate connection once the budget plus a grace period has passed. The same
+    KILL QUERY path serves explicit cancellation.
+    """
+
+    def __init__(self, db_config, pool_size=EDITOR_POOL_SIZE, timeout=EDITOR_TIMEOUT,
+                 max_queries_per_session=MAX_QUERIES_PER_SESSION):
+        self.pool = get_pool(db_config, size=pool_size, checkout_timeout=EDITOR_CHECKOUT_TIMEOUT, name='editor')
+        self._admin_pool = get_pool(db_config, size=1, name='watchdog')
+        self.timeout = timeout
+        self.max_queries_per_session = max_queries_per_session
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='query-guard')
+        self._lock = threading.Lock()
+        self._session_queries = {}
+        self._running = {}
+        self._stats = {'started': 0, 'completed': 0, 'cancelled': 0, 'timed_out': 0, 'rejected': 0}
+
+    def submit(self, session_id, fn, **kwargs):
+        """Run fn(**kwargs, pool=..., before_execute=..., after_execute=...) in the background.
+
+        Returns (token, future); the future resolves to (fn result, outcome) where
+        outcome is 'completed', 'cancelled' or 'timed_out'.
+        """
+        token = uuid.uuid4().hex
+        with self._lock:
+            # Sessions only have an entry while they run queries, so idle ones cost nothing
+            running = self._session_queries.get(session_id, 0)
+            if running >= self.max_queries_per_session:
+                self._stats['rejected'] += 1
+                raise ConcurrencyLimitError(
+                    msg=f"Only {self.max_queries_per_session} editor query may run per session at a time"
+                )
+            self._session_queries[session_id] = running + 1
+            self._running[token] = {'session_id': session_id, 'connection_id': None, 'started_at': time.time(),
+                                    'outcome': 'completed', 'watchdog': None, 'lock': threading.Lock()}
+            self._stats['started'] += 1
+        try:
+            future = self._executor.submit(contextvars.copy_context().run, self._run, token, fn, kwargs)
+        except Exception:
+            self._finish(token)
+            raise
+        future.add_done_callback(lambda _: self._finish(token))
+        return token, future
+
+    def run(self, session_id, fn, **kwargs):
+        """submit() and wait for the result"""
+        _, future = self.submit(session_id, fn, **kwargs)
+        return future.result()
+
+    def _run(self, token, fn, kwargs):
+        try:
+            result = fn(pool=self.pool, before_execute=lambda connection: self._arm(token, connection),
+                        after_execute=lambda connection: self._disarm(token), **kwargs)
+        finally:
+            # Also covers fn failing before its connection was released
+            self._disarm(token)
+        with self._lock:
+            return result, self._running[token]['outcome']
+
+    def _arm(self, token, connection):
+        """Apply the server-side budget and start the watchdog for a checked-out connection"""
+        cursor = connection.cursor()
+        cursor.execute("SET SESSION MAX_EXECUTION_TIME = %s", (int(self.timeout * 1000),))
+        cursor.close()
+        watchdog = threading.Timer(self.timeout + WATCHDOG_GRACE, self._kill, (token, 'timed_out'))
+        watchdog.daemon = True
+        with self._lock:
+            state = self._running[token]
+        with state['lock']:
+            state['connection_id'] = connection.connection_id
+            state['watchdog'] = watchdog
+        watchdog.start()
+
+    def _disarm(self, token):
+        """Stop the watchdog and forget the connection before it goes back to the pool.
+
+        Waits for a KILL QUERY in flight, so a late kill can never reach the query
+        of the connection's next borrower.
+        """
+        with self._lock:
+            state = self._running[token]
+        with state['lock']:
+            state['connection_id'] = None
+            if state['watchdog'] is not None:
+                state['watchdog'].cancel()
+                state['watchdog'] = None
+
+    def _finish(self, token):
+        with self._lock:
+            state = self._running.pop(token)
+            self._stats[state['outcome']] += 1
+            remaining = self._session_queries[state['session_id']] - 1
+            if remaining:
+                self._session_queries[state['session_id']] = remaining
+            else:
+                del self._session_queries[state['session_id']]
+
+    def _kill(self, token, outcome):
+        with self._lock:
+            state = self._running.get(token)
+        if state is None:
+            return False
+        # Held while the KILL is sent so _disarm cannot release the connection meanwhile
+        with state['lock']:
+            if state['connection_id'] is None:
+                return False
+            state['outcome'] = outcome
+            connection_id = state['connection_id']
+            try:
+                with self._admin_pool.connection() as connection:
+                    cursor = connection.cursor()
+                    cursor.execute(f"KILL QUERY {int(connection_id)}")
+                    cursor.close()
+                return True
+            except Error as e:
+                print(f"Could not kill query on connection {connection_id}: {e}")
+                return False
+
+    def cancel(self, token):
+        """Stop a running query; False if it already finished"""
+        return self._kill(token, 'cancelled')
+
+    def running_queries(self):
+        now = time.time()
+        with self._lock:
+            return [{'session_id': state['session_id'], 'connection_id': state['connection_id'],
+                     'running_seconds': now - state['started_at']} for state in self._running.values()]
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['running'] = len(self._running)
+        stats['timeout_seconds'] = self.timeout
+        return stats
+
+
+def describe_interruption(outcome, timeout):
+    """User-facing message for a query the guard stopped, or None"""
+    if outcome == 'cancelled':
+        return "Query cancelled."
+    if outcome == 'timed_out':
+        return f"Query stopped after exceeding the {timeout:.0f} second execution budget."
+    return None
+
+
+_guards = {}
+_guards_lock = threading.Lock()
+
+
+def get_query_guard(db_config):
+    """Shared guard per database configuration"""
+    key = tuple(sorted((k, str(v)) for k, v in db_config.items()))
+    with _guards_lock:
+        guard = _guards.get(key)
+        if guard is None:
+            guard = _guards[key] = QueryGuard(db_config)
+        return guard
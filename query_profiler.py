@@ -0,0 +1,135 @@
+import hashlib
+import re
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from sql_statements import CALL_PATTERN, run_statement
+from timing_stats import summarize_timings
+
+PROFILE_RUNS = 10
+
+# Session counters captured around each profiled query
+STATUS_COUNTER_PATTERNS = ('Handler_read%', 'Created_tmp%', 'Sort_%', 'Bytes_sent')
+
+# Normalizing the EXPLAIN ANALYZE tree drops timings, costs and row estimates,
+# so the hash only changes when the plan shape changes
+PLAN_NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)?(?:e[+-]?\d+)?')
+
+PROFILE_HISTORY_INSERT_QUERY = """
+INSERT INTO query_profile_history
+(profiled_at, query_name, runs, rows_returned, bytes_sent, p50_ms, p95_ms, p99_ms, mean_ms,
+ handler_reads, tmp_tables, tmp_disk_tables, sort_rows, plan_hash, plan)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);
+"""
+
+PROFILE_HISTORY_QUERY = """
+SELECT profiled_at, query_name, runs, rows_returned, bytes_sent, p50_ms, p95_ms, p99_ms,
+       handler_reads, tmp_tables, tmp_disk_tables, sort_rows, plan_hash
+FROM query_profile_history
+WHERE profiled_at >= %s
+ORDER BY query_name, profiled_at;
+"""
+
+
+def session_status(connection):
+    """Current values of the profiled session status counters"""
+    cursor = connection.cursor()
+    counters = {}
+    try:
+        for pattern in STATUS_COUNTER_PATTERNS:
+            cursor.execute("SHOW SESSION STATUS LIKE %s", (pattern,))
+            counters.update((name, int(value)) for name, value in cursor.fetchall())
+    finally:
+        cursor.close()
+    return counters
+
+
+def status_delta(before, after, overhead=None):
+    """Counter increase between two snapshots, less the cost of taking a snapshot"""
+    overhead = overhead or {}
+    return {name: max(after[name] - before.get(name, 0) - overhead.get(name, 0), 0) for name in after}
+
+
+def snapshot_overhead(connection):
+    """Counter increase caused by SHOW SESSION STATUS itself"""
+    return status_delta(session_status(connection), session_status(connection))
+
+
+def explain_analyze(connection, sql, params=()):
+    """EXPLAIN ANALYZE tree (MySQL 8.0.18+), or None for statements it cannot profile"""
+    if CALL_PATTERN.match(sql):
+        return None
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN ANALYZE {sql.strip().rstrip(';')}", tuple(params) or None)
+        return '\n'.join(row[0] for row in cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+def plan_hash(plan):
+    if plan is None:
+        return None
+    return hashlib.md5(PLAN_NUMBER_PATTERN.sub('#', plan).encode('utf-8')).hexdigest()
+
+
+def profile_query(connection, name, sql, params=(), runs=PROFILE_RUNS):
+    """Repeated timings, per-run status counters and the EXPLAIN ANALYZE plan for one query"""
+    run_statement(connection, sql, params)  # warm-up, not recorded
+
+    overhead = snapshot_overhead(connection)
+    before = session_status(connection)
+    timings = []
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        rows = run_statement(connection, sql, params)
+        timings.append((time.perf_counter() - start_time) * 1000)
+    counters = {counter: value / runs for counter, value in status_delta(before, session_status(connection), overhead).items()}
+
+    try:
+        plan = explain_analyze(connection, sql, params)
+    except Exception as e:
+        plan = f"EXPLAIN ANALYZE unavailable: {e}"
+
+    return {
+        'query_name': name,
+        'profiled_at': datetime.now().replace(microsecond=0),
+        'rows_returned': rows,
+        'bytes_sent': int(counters.get('Bytes_sent', 0)),
+        'timings': summarize_timings(timings),
+        'counters': counters,
+        'handler_reads': int(sum(value for counter, value in counters.items() if counter.startswith('Handler_read'))),
+        'tmp_tables': int(counters.get('Created_tmp_tables', 0)),
+        'tmp_disk_tables': int(counters.get('Created_tmp_disk_tables', 0)),
+        'sort_rows': int(counters.get('Sort_rows', 0)),
+        'plan': plan,
+        'plan_hash': plan_hash(plan),
+    }
+
+
+def save_profile(connection, profile):
+    """Append a profile to query_profile_history"""
+    timings = profile['timings']
+    cursor = connection.cursor()
+    cursor.execute(PROFILE_HISTORY_INSERT_QUERY, (
+        profile['profiled_at'], profile['query_name'], timings['runs'], profile['rows_returned'],
+        profile['bytes_sent'], timings['p50_ms'], timings['p95_ms'], timings['p99_ms'], timings['mean_ms'],
+        profile['handler_reads'], profile['tmp_tables'], profile['tmp_disk_tables'], profile['sort_rows'],
+        profile['plan_hash'], profile['plan'],
+    ))
+    connection.commit()
+    cursor.close()
+
+
+def load_profile_history(connection, since):
+    """Recorded profiles since a datetime, with a flag on runs whose plan differs from the previous one"""
+    cursor = connection.cursor()
+    cursor.execute(PROFILE_HISTORY_QUERY, (since,))
+    history = pd.DataFrame(cursor.fetchall(), columns=[desc[0] for desc in cursor.description])
+    cursor.close()
+    if not history.empty:
+        previous_plan = history.groupby('query_name')['plan_hash'].shift()
+        history['plan_changed'] = previous_plan.notna() & (previous_plan != history['plan_hash'])
+    return history
@@ -0,0 +1,176 @@
+import csv
+import os
+import tempfile
+import time
+
+import mysql.connector
+import pandas as pd
+from mysql.connector import Error
+
+# Rows kept in memory for display, rows per result page and rows per network round trip
+EDITOR_ROW_CAP = 10000
+PAGE_SIZE = 500
+FETCH_SIZE = 1000
+
+# Upper bound for a CSV export; the file is written in FETCH_SIZE chunks. Exports
+# older than EXPORT_TTL_SECONDS are deleted, whether or not their session is still open.
+EXPORT_ROW_CAP = 5000000
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), 'retail_sales_exports')
+EXPORT_TTL_SECONDS = 3600.0
+
+
+def iter_row_chunks(cursor, fetch_size=FETCH_SIZE, row_cap=None):
+    """Yield lists of rows from an unbuffered cursor, stopping after row_cap rows"""
+    fetched = 0
+    while row_cap is None or fetched < row_cap:
+        size = fetch_size if row_cap is None else min(fetch_size, row_cap - fetched)
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        fetched += len(rows)
+        yield rows
+
+
+def close_cursor(cursor):
+    """Close a fully read cursor; False if the connection still has unread results.
+
+    Stored procedures send a trailing status result after their row sets, which an
+    unbuffered cursor leaves on the wire.
+    """
+    try:
+        cursor.close()
+        return True
+    except Error:
+        return False
+
+
+def kill_query(db_config, connection_id):
+    """Stop the statement running on another connection with KILL QUERY.
+
+    Closing a connection that still has rows on the wire does not stop the query: the
+    C extension's close() frees the result by reading every remaining row first.
+    """
+    side_connection = mysql.connector.connect(**db_config)
+    try:
+        cursor = side_connection.cursor()
+        cursor.execute(f"KILL QUERY {int(connection_id)}")
+        cursor.close()
+    finally:
+        side_connection.close()
+
+
+def abandon_result(pool, connection):
+    """Stop a query whose remaining rows are not wanted before its connection is dropped"""
+    try:
+        kill_query(pool.db_config, connection.connection_id)
+    except Error as e:
+        print(f"Could not stop the query on connection {connection.connection_id}: {e}")
+
+
+def purge_expired_exports(directory=EXPORT_DIR, ttl=EXPORT_TTL_SECONDS):
+    """Delete CSV exports older than ttl seconds; returns how many were removed"""
+    if not os.path.isdir(directory):
+        return 0
+    removed = 0
+    cutoff = time.time() - ttl
+    for entry in os.scandir(directory):
+        if entry.name.startswith('query_results_') and entry.stat().st_mtime < cutoff:
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+def run_streaming_query(pool, query, row_cap=EDITOR_ROW_CAP, fetch_size=FETCH_SIZE, before_execute=None,
+                        after_execute=None):
+    """Run a query on an unbuffered cursor, keeping at most row_cap rows.
+
+    Returns a dict with the DataFrame (None for statements without a result set),
+    execution seconds, row count, truncated flag and pool wait seconds. A truncated
+    result still has rows waiting on the wire; rather than reading them only to
+    throw them away, the query is killed and the connection dropped.
+    before_execute(connection), if given, runs on the checked-out connection first;
+    after_execute(connection) runs once the query is done, before the connection is released.
+    """
+    checkout_start = time.perf_counter()
+    connection = pool.acquire()
+    result = {'df': None, 'pool_wait': time.perf_counter() - checkout_start, 'truncated': False}
+    broken = False
+    try:
+        if before_execute is not None:
+            before_execute(connection)
+        cursor = connection.cursor(buffered=False)
+        start_time = time.time()
+        cursor.execute(query)
+        result['execution_time'] = time.time() - start_time
+
+        if not cursor.with_rows:
+            connection.commit()
+            result['rows'] = cursor.rowcount
+            cursor.close()
+            return result
+
+        columns = [desc[0] for desc in cursor.description]
+        rows = []
+        for chunk in iter_row_chunks(cursor, fetch_size, row_cap):
+            rows.extend(chunk)
+        result['truncated'] = len(rows) >= row_cap and cursor.fetchone() is not None
+        if result['truncated']:
+            abandon_result(pool, connection)
+        broken = result['truncated'] or not close_cursor(cursor)
+        result.update(df=pd.DataFrame(rows, columns=columns), rows=len(rows))
+        return result
+    except Exception:
+        broken = broken or not connection.is_connected()
+        raise
+    finally:
+        if after_execute is not None:
+            after_execute(connection)
+        pool.release(connection, broken=broken)
+
+
+def export_query_to_csv(pool, query, row_cap=EXPORT_ROW_CAP, fetch_size=FETCH_SIZE, directory=EXPORT_DIR,
+                        before_execute=None, after_execute=None):
+    """Stream a query's result into a temporary CSV file chunk by chunk.
+
+    Returns (path, rows written, truncated). Only one chunk of rows is in memory at a time.
+    Expired exports in directory are purged first. The hooks work as in run_streaming_query.
+    """
+    os.makedirs(directory, exist_ok=True)
+    purge_expired_exports(directory)
+    connection = pool.acquire()
+    broken = False
+    handle, path = tempfile.mkstemp(prefix='query_results_', suffix='.csv', dir=directory)
+    written = 0
+    try:
+        if before_execute is not None:
+            before_execute(connection)
+        cursor = connection.cursor(buffered=False)
+        cursor.execute(query)
+        if not cursor.with_rows:
+            cursor.close()
+            return path, 0, False
+        with os.fdopen(handle, 'w', newline='', encoding='utf-8') as f:
+            handle = None
+            writer = csv.writer(f)
+            writer.writerow([desc[0] for desc in cursor.description])
+            for chunk in iter_row_chunks(cursor, fetch_size, row_cap):
+                writer.writerows(chunk)
+                written += len(chunk)
+        truncated = written >= row_cap and cursor.fetchone() is not None
+        if truncated:
+            abandon_result(pool, connection)
+        broken = truncated or not close_cursor(cursor)
+        return path, written, truncated
+    except Exception:
+        broken = broken or not connection.is_connected()
+        os.remove(path)
+        raise
+    finally:
+        if handle is not None:
+            os.close(handle)
+        if after_execute is not None:
+            after_execute(connection)
+        pool.release(connection, broken=broken)
@@ -0,0 +1,428 @@
+from datetime import date
+
+from mysql.connector import Error
+
+# Number of dates refreshed per DELETE/INSERT statement
+REFRESH_BATCH_SIZE = 500
+
+DAILY_SUMMARY_DELETE_QUERY = "DELETE FROM daily_sales_summary WHERE summary_date IN ({placeholders})"
+
+# Tables and keys the refresh queries read, per schema. The compact schema
+# (schema_compact.sql) is read on its integer keys, not through its orders, products
+# and sales views, which join every dimension back in to rebuild the string ids.
+ROLLUP_SOURCES = {
+    'standard': {
+        'sales_orders': "sales s\n    JOIN orders o ON s.order_id = o.order_id",
+        'sales_orders_products': "sales s\n    JOIN orders o ON s.order_id = o.order_id\n"
+                                 "    JOIN products p ON s.product_id = p.product_id",
+        'order_key': 's.order_id',
+        'orders': 'orders',
+        'customer_key': 'customer_id',
+        'dimensions': {'region': 'o.region', 'category': 'p.category', 'sub_category': 'p.sub_category'},
+    },
+    'compact': {
+        'sales_orders': "compact_sales s\n    JOIN compact_orders o ON s.order_key = o.order_key",
+        'sales_orders_products': "compact_sales s\n    JOIN compact_orders o ON s.order_key = o.order_key\n"
+                                 "    JOIN compact_products p ON s.product_key = p.product_key\n"
+                                 "    JOIN dim_sub_category sc ON p.sub_category_key = sc.sub_category_key\n"
+                                 "    JOIN dim_category cat ON sc.category_key = cat.category_key\n"
+                                 "    JOIN dim_location l ON o.location_key = l.location_key\n"
+                                 "    JOIN dim_region r ON l.region_key = r.region_key",
+        'order_key': 's.order_key',
+        'orders': 'compact_orders',
+        'customer_key': 'customer_key',
+        'dimensions': {'region': 'r.region', 'category': 'cat.category', 'sub_category': 'sc.sub_category'},
+    },
+}
+
+DAILY_SUMMARY_INSERT_QUERY = """
+INSERT INTO daily_sales_summary (summary_date, total_daily_sales, total_daily_profit, total_daily_orders)
+SELECT
+    o.order_date,
+    SUM(s.sales),
+    SUM(s.profit),
+    COUNT(DISTINCT {order_key})
+FROM
+    {sales_orders}
+{where_clause}
+GROUP BY
+    o.order_date
+ON DUPLICATE KEY UPDATE
+    total_daily_sales = VALUES(total_daily_sales),
+    total_daily_profit = VALUES(total_daily_profit),
+    total_daily_orders = VALUES(total_daily_orders);
+"""
+
+# Dashboard and forecasting queries answered from the daily rollup
+OVERVIEW_KPIS_FROM_ROLLUP_QUERY = """
+SELECT
+    SUM(CASE WHEN summary_date >= %s THEN total_daily_sales END) AS total_sales,
+    SUM(CASE WHEN summary_date >= %s THEN total_daily_profit END) AS total_profit,
+    CAST(SUM(CASE WHEN summary_date >= %s THEN total_daily_orders END) AS SIGNED) AS total_orders,
+    SUM(CASE WHEN summary_date < %s THEN total_daily_sales END) AS prior_sales,
+    SUM(CASE WHEN summary_date < %s THEN total_daily_profit END) AS prior_profit,
+    CAST(SUM(CASE WHEN summary_date < %s THEN total_daily_orders END) AS SIGNED) AS prior_orders
+FROM daily_sales_summary
+WHERE summary_date BETWEEN %s AND %s
+"""
+
+MONTHLY_TREND_FROM_ROLLUP_QUERY = """
+SELECT
+    DATE_FORMAT(summary_date, '%Y-%m') AS sales_month,
+    SUM(total_daily_sales) AS monthly_sales,
+    SUM(total_daily_profit) AS monthly_profit
+FROM daily_sales_summary
+GROUP BY sales_month
+ORDER BY sales_month
+"""
+
+TIME_SERIES_FROM_ROLLUP_QUERY = """
+SELECT
+    DATE_FORMAT(summary_date, '%Y-%m-01') AS month_date,
+    SUM(total_daily_sales) AS monthly_sales,
+    SUM(total_daily_profit) AS monthly_profit,
+    SUM(total_daily_orders) AS monthly_orders
+FROM daily_sales_summary
+GROUP BY month_date
+ORDER BY month_date
+"""
+
+
+# Dimension levels kept in monthly_sales_agg; dimensions not in a level are stored as '*'.
+# Distinct order counts cannot be added up from a finer level, so each level is aggregated.
+MONTHLY_AGG_DIMENSIONS = ('region', 'category', 'sub_category')
+MONTHLY_AGG_LEVELS = (
+    (),
+    ('region',),
+    ('category',),
+    ('category', 'sub_category'),
+    ('region', 'category', 'sub_category'),
+)
+
+# Rows are selected with a plain range on o.order_date so an index on it can be used
+MONTHLY_AGG_INSERT_QUERY = """
+INSERT INTO monthly_sales_agg
+    (region, category, sub_category, month_start, total_sales, total_profit, total_quantity, total_orders)
+SELECT
+    {dimension_columns},
+    DATE_FORMAT(o.order_date, '%Y-%m-01') AS agg_month,
+    SUM(s.sales),
+    SUM(s.profit),
+    SUM(s.quantity),
+    COUNT(DISTINCT {order_key})
+FROM
+    {sales_orders_products}
+{where_clause}
+GROUP BY
+    {group_columns}
+"""
+
+MONTHLY_AGG_DELETE_RANGE_QUERY = "DELETE FROM monthly_sales_agg WHERE month_start >= %s AND month_start < %s"
+
+# National series read straight from the aggregate's primary key
+MONTHLY_TREND_FROM_AGG_QUERY = """
+SELECT
+    DATE_FORMAT(month_start, '%Y-%m') AS sales_month,
+    total_sales AS monthly_sales,
+    total_profit AS monthly_profit
+FROM monthly_sales_agg
+WHERE region = '*' AND category = '*' AND sub_category = '*'
+ORDER BY month_start
+"""
+
+TIME_SERIES_FROM_AGG_QUERY = """
+SELECT
+    month_start AS month_date,
+    total_sales AS monthly_sales,
+    total_profit AS monthly_profit,
+    total_orders AS monthly_orders
+FROM monthly_sales_agg
+WHERE region = '*' AND category = '*' AND sub_category = '*'
+ORDER BY month_start
+"""
+
+SERIES_FROM_AGG_QUERY = """
+SELECT
+    region,
+    category,
+    sub_category,
+    month_start AS month_date,
+    total_sales AS monthly_sales,
+    total_profit AS monthly_profit,
+    total_orders AS monthly_orders
+FROM monthly_sales_agg
+WHERE region <> '*' AND category <> '*' AND sub_category <> '*'
+ORDER BY region, category, sub_category, month_start
+"""
+
+
+CUSTOMER_FIRST_ORDER_UPSERT_QUERY = """
+INSERT INTO customer_first_order ({customer_key}, first_order_date, cohort_month)
+SELECT
+    {customer_key},
+    MIN(order_date),
+    DATE_FORMAT(MIN(order_date), '%Y-%m-01')
+FROM {orders}
+{where_clause}
+GROUP BY {customer_key}
+ON DUPLICATE KEY UPDATE
+    first_order_date = VALUES(first_order_date),
+    cohort_month = VALUES(cohort_month)
+"""
+
+# Every cell inserted holds the complete count for its (cohort, month), so ranges that
+# overlap within one refresh simply overwrite each other
+COHORT_RETENTION_INSERT_QUERY = """
+INSERT INTO cohort_retention (cohort_month, order_month, active_customers)
+SELECT
+    f.cohort_month,
+    DATE_FORMAT(o.order_date, '%Y-%m-01') AS activity_month,
+    COUNT(DISTINCT o.{customer_key})
+FROM
+    {orders} o
+JOIN
+    customer_first_order f ON o.{customer_key} = f.{customer_key}
+{where_clause}
+GROUP BY
+    f.cohort_month, activity_month
+ON DUPLICATE KEY UPDATE
+    active_customers = VALUES(active_customers)
+"""
+
+COHORT_RETENTION_FROM_MATRIX_QUERY = """
+SELECT
+    DATE_FORMAT(r.cohort_month, '%Y-%m') AS cohort_month,
+    DATE_FORMAT(r.order_month, '%Y-%m') AS order_month,
+    PERIOD_DIFF(DATE_FORMAT(r.order_month, '%Y%m'), DATE_FORMAT(r.cohort_month, '%Y%m')) AS period_number,
+    r.active_customers AS customers,
+    c.active_customers AS cohort_size,
+    ROUND(r.active_customers * 100.0 / c.active_customers, 2) AS retention_rate
+FROM cohort_retention r
+JOIN cohort_retention c ON c.cohort_month = r.cohort_month AND c.order_month = r.cohort_month
+ORDER BY r.cohort_month, r.order_month
+"""
+
+
+def rollup_sql(template, schema, **fields):
+    """Fill a refresh query template with the sources of a schema (see ROLLUP_SOURCES)"""
+    sources = ROLLUP_SOURCES[schema]
+    return template.format(**{key: value for key, value in sources.items() if key != 'dimensions'}, **fields)
+
+
+def refresh_daily_sales_summary(connection, dates=None, schema='standard'):
+    """Recompute daily_sales_summary for the given order dates, or rebuild it when dates is None.
+
+    Affected dates are deleted and re-aggregated inside one transaction, so dates whose
+    sales disappeared are removed rather than left with stale totals.
+    """
+    cursor = connection.cursor()
+    try:
+        if dates is None:
+            cursor.execute("DELETE FROM daily_sales_summary")
+            cursor.execute(rollup_sql(DAILY_SUMMARY_INSERT_QUERY, schema, where_clause=""))
+            refreshed = cursor.rowcount
+        else:
+            dates = sorted(set(dates))
+            refreshed = 0
+            for start in range(0, len(dates), REFRESH_BATCH_SIZE):
+                batch = dates[start:start + REFRESH_BATCH_SIZE]
+                placeholders = ', '.join(['%s'] * len(batch))
+                cursor.execute(DAILY_SUMMARY_DELETE_QUERY.format(placeholders=placeholders), batch)
+                cursor.execute(
+                    rollup_sql(DAILY_SUMMARY_INSERT_QUERY, schema, where_clause=f"WHERE o.order_date IN ({placeholders})"),
+                    batch
+                )
+                refreshed += len(batch)
+        connection.commit()
+        print(f"Daily sales summary refreshed ({'full rebuild' if dates is None else f'{refreshed:,} dates'})")
+    except Error as err:
+        connection.rollback()
+        print(f"Error refreshing daily sales summary: '{err}'")
+    finally:
+        cursor.close()
+
+
+def daily_summary_available(connection):
+    """True when the daily rollup exists and has been populated"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT 1 FROM daily_sales_summary LIMIT 1")
+        return cursor.fetchone() is not None
+    except Error:
+        return False
+    finally:
+        cursor.close()
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def next_month(day):
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def month_ranges(months):
+    """Collapse month starts into contiguous [start, end) ranges"""
+    ranges = []
+    for month in sorted(set(months)):
+        if ranges and ranges[-1][1] == month:
+            ranges[-1][1] = next_month(month)
+        else:
+            ranges.append([month, next_month(month)])
+    return [tuple(month_range) for month_range in ranges]
+
+
+def monthly_agg_insert_query(level, where_clause="", schema='standard'):
+    dimensions = ROLLUP_SOURCES[schema]['dimensions']
+    dimension_columns = ', '.join(dimensions[d] if d in level else "'*'" for d in MONTHLY_AGG_DIMENSIONS)
+    group_columns = ', '.join([dimensions[d] for d in level] + ['agg_month'])
+    return rollup_sql(MONTHLY_AGG_INSERT_QUERY, schema, dimension_columns=dimension_columns,
+                      group_columns=group_columns, where_clause=where_clause)
+
+
+def refresh_monthly_sales_agg(connection, dates=None, schema='standard'):
+    """Recompute monthly_sales_agg for the months of the given order dates plus the
+    current month, or rebuild it when dates is None.
+
+    Changed months are grouped into contiguous ranges; each range is deleted and
+    re-aggregated from a plain order_date range (no function on the column, so the
+    idx_orders_order_date index from schema.sql applies) inside one transaction.
+    """
+    if dates is not None and not monthly_agg_available(connection):
+        # A partially filled store would look complete to readers; build it once in full
+        dates = None
+    cursor = connection.cursor()
+    try:
+        if dates is None:
+            cursor.execute("DELETE FROM monthly_sales_agg")
+            for level in MONTHLY_AGG_LEVELS:
+                cursor.execute(monthly_agg_insert_query(level, schema=schema))
+            refreshed = None
+        else:
+            months = {month_start(day) for day in dates} | {month_start(date.today())}
+            refreshed = len(months)
+            for start, end in month_ranges(months):
+                cursor.execute(MONTHLY_AGG_DELETE_RANGE_QUERY, (start, end))
+                for level in MONTHLY_AGG_LEVELS:
+                    cursor.execute(
+                        monthly_agg_insert_query(level, "WHERE o.order_date >= %s AND o.order_date < %s", schema),
+                        (start, end)
+                    )
+        connection.commit()
+        print(f"Monthly sales aggregate refreshed ({'full rebuild' if refreshed is None else f'{refreshed:,} months'})")
+    except Error as err:
+        connection.rollback()
+        print(f"Error refreshing monthly sales aggregate: '{err}'")
+    finally:
+        cursor.close()
+
+
+def monthly_agg_available(connection):
+    """True when the monthly aggregate exists and has been populated"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT 1 FROM monthly_sales_agg LIMIT 1")
+        return cursor.fetchone() is not None
+    except Error:
+        return False
+    finally:
+        cursor.close()
+
+
+def customer_cohorts(cursor, customer_ids, customer_key='customer_id'):
+    placeholders = ', '.join(['%s'] * len(customer_ids))
+    cursor.execute(f"SELECT {customer_key}, cohort_month FROM customer_first_order WHERE {customer_key} IN ({placeholders})",
+                   list(customer_ids))
+    return dict(cursor.fetchall())
+
+
+def refresh_cohort_retention(connection, dates=None, schema='standard'):
+    """Bring customer_first_order and cohort_retention up to date with the orders placed
+    on the given dates, or rebuild both when dates is None.
+
+    Only customers who order on those dates, or whose first order was on one of them,
+    can get a new first order. The dates include the old date of a changed order, so a
+    customer whose first order was reassigned to someone else is recomputed as well.
+    Cells are recomputed for the changed order months (every cohort) and, for the
+    cohorts that gained or lost a customer, for every month.
+    """
+    if dates is not None and not cohort_retention_available(connection):
+        dates = None
+    orders, customer_key = ROLLUP_SOURCES[schema]['orders'], ROLLUP_SOURCES[schema]['customer_key']
+    cursor = connection.cursor()
+    try:
+        if dates is None:
+            cursor.execute("DELETE FROM cohort_retention")
+            cursor.execute("DELETE FROM customer_first_order")
+            cursor.execute(rollup_sql(CUSTOMER_FIRST_ORDER_UPSERT_QUERY, schema, where_clause=""))
+            cursor.execute(rollup_sql(COHORT_RETENTION_INSERT_QUERY, schema, where_clause=""))
+            connection.commit()
+            print("Cohort retention matrix refreshed (full rebuild)")
+            return
+
+        dates = sorted(set(dates))
+        customer_ids = set()
+        for start in range(0, len(dates), REFRESH_BATCH_SIZE):
+            batch = dates[start:start + REFRESH_BATCH_SIZE]
+            placeholders = ', '.join(['%s'] * len(batch))
+            cursor.execute(f"SELECT DISTINCT {customer_key} FROM {orders} WHERE order_date IN ({placeholders})", batch)
+            customer_ids.update(row[0] for row in cursor.fetchall())
+            cursor.execute(f"SELECT {customer_key} FROM customer_first_order WHERE first_order_date IN ({placeholders})",
+                           batch)
+            customer_ids.update(row[0] for row in cursor.fetchall())
+
+        moved_cohorts = set()
+        customer_ids = sorted(customer_ids)
+        for start in range(0, len(customer_ids), REFRESH_BATCH_SIZE):
+            batch = customer_ids[start:start + REFRESH_BATCH_SIZE]
+            placeholders = ', '.join(['%s'] * len(batch))
+            before = customer_cohorts(cursor, batch, customer_key)
+            # Recreated from scratch, so customers left without any order drop out
+            cursor.execute(f"DELETE FROM customer_first_order WHERE {customer_key} IN ({placeholders})", batch)
+            cursor.execute(
+                rollup_sql(CUSTOMER_FIRST_ORDER_UPSERT_QUERY, schema,
+                           where_clause=f"WHERE {customer_key} IN ({placeholders})"),
+                batch
+            )
+            after = customer_cohorts(cursor, batch, customer_key)
+            for customer_id in set(before) | set(after):
+                if before.get(customer_id) != after.get(customer_id):
+                    moved_cohorts.update(month for month in (before.get(customer_id), after.get(customer_id))
+                                         if month is not None)
+
+        for start, end in month_ranges(month_start(day) for day in dates):
+            cursor.execute("DELETE FROM cohort_retention WHERE order_month >= %s AND order_month < %s", (start, end))
+            cursor.execute(
+                rollup_sql(COHORT_RETENTION_INSERT_QUERY, schema,
+                           where_clause="WHERE o.order_date >= %s AND o.order_date < %s"),
+                (start, end)
+            )
+        if moved_cohorts:
+            moved_cohorts = sorted(moved_cohorts)
+            placeholders = ', '.join(['%s'] * len(moved_cohorts))
+            cursor.execute(f"DELETE FROM cohort_retention WHERE cohort_month IN ({placeholders})", moved_cohorts)
+            cursor.execute(
+                rollup_sql(COHORT_RETENTION_INSERT_QUERY, schema, where_clause=f"WHERE f.cohort_month IN ({placeholders})"),
+                moved_cohorts
+            )
+        connection.commit()
+        print(f"Cohort retention matrix refreshed ({len(customer_ids):,} customers, "
+              f"{len(moved_cohorts):,} cohorts changed)")
+    except Error as err:
+        connection.rollback()
+        print(f"Error refreshing cohort retention matrix: '{err}'")
+    finally:
+        cursor.close()
+
+
+def cohort_retention_available(connection):
+    """True when the cohort retention matrix exists and has been populated"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT 1 FROM cohort_retention LIMIT 1")
+        return cursor.fetchone() is not None
+    except Error:
+        return False
+    finally:
+        cursor.close()
@@ -14,7 +14,8 @@ CREATE TABLE IF NOT EXISTS orders (
     city VARCHAR(255),
     state VARCHAR(255),
     postal_code VARCHAR(255),
-    region VARCHAR(255)
+    region VARCHAR(255),
+    INDEX idx_orders_order_date (order_date)
 );
 
 CREATE TABLE IF NOT EXISTS products (
@@ -37,3 +38,88 @@ CREATE TABLE IF NOT EXISTS sales (
 );
 
 
+
+
+-- Daily rollup refreshed by the ETL (see rollups.refresh_daily_sales_summary)
+CREATE TABLE IF NOT EXISTS daily_sales_summary (
+    summary_date DATE PRIMARY KEY,
+    total_daily_sales DECIMAL(14, 2),
+    total_daily_profit DECIMAL(14, 2),
+    total_daily_orders INT
+);
+
+-- ETL control tables for incremental loads
+CREATE TABLE IF NOT EXISTS etl_watermarks (
+    table_name VARCHAR(64) PRIMARY KEY,
+    max_row_id INT,
+    max_order_date DATE,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS etl_row_fingerprints (
+    table_name VARCHAR(64),
+    row_key VARCHAR(255),
+    row_hash BIGINT UNSIGNED,
+    PRIMARY KEY (table_name, row_key)
+);
+
+-- Row count and digest (wrapping sum of row hashes) per order month or product bucket.
+-- Unchanged partitions are skipped without reading their row fingerprints
+CREATE TABLE IF NOT EXISTS etl_partition_digests (
+    table_name VARCHAR(64),
+    partition_key VARCHAR(32),
+    row_count INT,
+    digest BIGINT UNSIGNED,
+    PRIMARY KEY (table_name, partition_key)
+);
+
+-- Query profiles recorded by the dashboard's Performance Monitor (see query_profiler.py)
+CREATE TABLE IF NOT EXISTS query_profile_history (
+    profile_id INT AUTO_INCREMENT PRIMARY KEY,
+    profiled_at DATETIME NOT NULL,
+    query_name VARCHAR(100) NOT NULL,
+    runs INT,
+    rows_returned INT,
+    bytes_sent BIGINT,
+    p50_ms DOUBLE,
+    p95_ms DOUBLE,
+    p99_ms DOUBLE,
+    mean_ms DOUBLE,
+    handler_reads BIGINT,
+    tmp_tables INT,
+    tmp_disk_tables INT,
+    sort_rows BIGINT,
+    plan_hash CHAR(32),
+    plan TEXT,
+    INDEX idx_query_profile_history_name_time (query_name, profiled_at)
+);
+
+-- Monthly aggregates keyed by month and optional dimensions, '*' meaning all values
+-- (see rollups.refresh_monthly_sales_agg)
+CREATE TABLE IF NOT EXISTS monthly_sales_agg (
+    region VARCHAR(100) NOT NULL DEFAULT '*',
+    category VARCHAR(100) NOT NULL DEFAULT '*',
+    sub_category VARCHAR(100) NOT NULL DEFAULT '*',
+    month_start DATE NOT NULL,
+    total_sales DECIMAL(16, 2),
+    total_profit DECIMAL(16, 2),
+    total_quantity INT,
+    total_orders INT,
+    PRIMARY KEY (region, category, sub_category, month_start)
+);
+
+-- First order per customer and the cohort x month retention matrix built from it
+-- (see rollups.refresh_cohort_retention)
+CREATE TABLE IF NOT EXISTS customer_first_order (
+    customer_id VARCHAR(255) PRIMARY KEY,
+    first_order_date DATE NOT NULL,
+    cohort_month DATE NOT NULL,
+    INDEX idx_customer_first_order_cohort (cohort_month)
+);
+
+CREATE TABLE IF NOT EXISTS cohort_retention (
+    cohort_month DATE NOT NULL,
+    order_month DATE NOT NULL,
+    active_customers INT NOT NULL,
+    PRIMARY KEY (cohort_month, order_month)
+);
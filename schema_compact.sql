@@ -0,0 +1,270 @@
+-- Compact variant of schema.sql with integer surrogate keys and dictionary-encoded dimensions.
+-- Loaded with `python3 etl_script.py --compact` into the database RETAIL_SALES_DB names
+-- (default retail_sales_compact). The orders, products and sales names are read-only views
+-- with the original columns. The rollups, and the views, procedures and sales_log triggers
+-- of advanced_sql.sql, are defined here on the integer keys, so that file is not needed.
+
+-- Dictionary tables for low-cardinality attributes
+CREATE TABLE IF NOT EXISTS dim_region (
+    region_key TINYINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    region VARCHAR(32) NOT NULL,
+    UNIQUE KEY uq_region (region)
+);
+
+CREATE TABLE IF NOT EXISTS dim_segment (
+    segment_key TINYINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    segment VARCHAR(32) NOT NULL,
+    UNIQUE KEY uq_segment (segment)
+);
+
+CREATE TABLE IF NOT EXISTS dim_ship_mode (
+    ship_mode_key TINYINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    ship_mode VARCHAR(32) NOT NULL,
+    UNIQUE KEY uq_ship_mode (ship_mode)
+);
+
+CREATE TABLE IF NOT EXISTS dim_category (
+    category_key TINYINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    category VARCHAR(64) NOT NULL,
+    UNIQUE KEY uq_category (category)
+);
+
+CREATE TABLE IF NOT EXISTS dim_sub_category (
+    sub_category_key TINYINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    sub_category VARCHAR(64) NOT NULL,
+    category_key TINYINT UNSIGNED NOT NULL,
+    UNIQUE KEY uq_sub_category (sub_category, category_key),
+    FOREIGN KEY (category_key) REFERENCES dim_category(category_key)
+);
+
+CREATE TABLE IF NOT EXISTS dim_location (
+    location_key MEDIUMINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    country VARCHAR(64) NOT NULL,
+    state VARCHAR(64) NOT NULL,
+    city VARCHAR(64) NOT NULL,
+    postal_code VARCHAR(10) NOT NULL,
+    region_key TINYINT UNSIGNED NOT NULL,
+    UNIQUE KEY uq_location (country, state, city, postal_code, region_key),
+    FOREIGN KEY (region_key) REFERENCES dim_region(region_key)
+);
+
+-- Entity tables keyed by integers, with the natural keys kept unique for lookups
+CREATE TABLE IF NOT EXISTS dim_customer (
+    customer_key MEDIUMINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    customer_id VARCHAR(16) NOT NULL,
+    customer_name VARCHAR(64),
+    segment_key TINYINT UNSIGNED,
+    UNIQUE KEY uq_customer_id (customer_id),
+    FOREIGN KEY (segment_key) REFERENCES dim_segment(segment_key)
+);
+
+CREATE TABLE IF NOT EXISTS compact_products (
+    product_key MEDIUMINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    product_id VARCHAR(20) NOT NULL,
+    sub_category_key TINYINT UNSIGNED,
+    product_name VARCHAR(255),
+    UNIQUE KEY uq_product_id (product_id),
+    FOREIGN KEY (sub_category_key) REFERENCES dim_sub_category(sub_category_key)
+);
+
+CREATE TABLE IF NOT EXISTS compact_orders (
+    order_key INT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    order_id VARCHAR(20) NOT NULL,
+    order_date DATE,
+    ship_date DATE,
+    ship_mode_key TINYINT UNSIGNED,
+    customer_key MEDIUMINT UNSIGNED,
+    location_key MEDIUMINT UNSIGNED,
+    UNIQUE KEY uq_order_id (order_id),
+    INDEX idx_compact_orders_order_date (order_date),
+    FOREIGN KEY (ship_mode_key) REFERENCES dim_ship_mode(ship_mode_key),
+    FOREIGN KEY (customer_key) REFERENCES dim_customer(customer_key),
+    FOREIGN KEY (location_key) REFERENCES dim_location(location_key)
+);
+
+CREATE TABLE IF NOT EXISTS compact_sales (
+    row_id INT UNSIGNED PRIMARY KEY,
+    order_key INT UNSIGNED NOT NULL,
+    product_key MEDIUMINT UNSIGNED NOT NULL,
+    sales DECIMAL(10, 2),
+    quantity SMALLINT UNSIGNED,
+    discount DECIMAL(3, 2),
+    profit DECIMAL(10, 2),
+    FOREIGN KEY (order_key) REFERENCES compact_orders(order_key),
+    FOREIGN KEY (product_key) REFERENCES compact_products(product_key)
+);
+
+-- Rollups and the ETL run marker, as in schema.sql. The refresh functions in rollups.py
+-- read the compact tables on their integer keys (ROLLUP_SOURCES['compact']).
+CREATE TABLE IF NOT EXISTS daily_sales_summary (
+    summary_date DATE PRIMARY KEY,
+    total_daily_sales DECIMAL(14, 2),
+    total_daily_profit DECIMAL(14, 2),
+    total_daily_orders INT
+);
+
+CREATE TABLE IF NOT EXISTS monthly_sales_agg (
+    region VARCHAR(100) NOT NULL DEFAULT '*',
+    category VARCHAR(100) NOT NULL DEFAULT '*',
+    sub_category VARCHAR(100) NOT NULL DEFAULT '*',
+    month_start DATE NOT NULL,
+    total_sales DECIMAL(16, 2),
+    total_profit DECIMAL(16, 2),
+    total_quantity INT,
+    total_orders INT,
+    PRIMARY KEY (region, category, sub_category, month_start)
+);
+
+-- Keyed by customer_key. The compact load rebuilds it in full every time, so it is simply
+-- recreated, which also replaces the customer_id layout of earlier versions.
+DROP TABLE IF EXISTS customer_first_order;
+CREATE TABLE customer_first_order (
+    customer_key MEDIUMINT UNSIGNED PRIMARY KEY,
+    first_order_date DATE NOT NULL,
+    cohort_month DATE NOT NULL,
+    INDEX idx_customer_first_order_cohort (cohort_month)
+);
+
+CREATE TABLE IF NOT EXISTS cohort_retention (
+    cohort_month DATE NOT NULL,
+    order_month DATE NOT NULL,
+    active_customers INT NOT NULL,
+    PRIMARY KEY (cohort_month, order_month)
+);
+
+CREATE TABLE IF NOT EXISTS etl_watermarks (
+    table_name VARCHAR(64) PRIMARY KEY,
+    max_row_id INT,
+    max_order_date DATE,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+-- sales_log and the triggers of advanced_sql.sql, attached to compact_sales because MySQL
+-- cannot put triggers on the sales view. Each trigger body is a single statement so the
+-- loader can still split this file on semicolons.
+CREATE TABLE IF NOT EXISTS sales_log (
+    log_id INT AUTO_INCREMENT PRIMARY KEY,
+    action_type VARCHAR(50),
+    order_id VARCHAR(255),
+    product_id VARCHAR(255),
+    old_quantity INT,
+    new_quantity INT,
+    log_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+DROP TRIGGER IF EXISTS after_sales_insert_update;
+CREATE TRIGGER after_sales_insert_update
+AFTER INSERT ON compact_sales
+FOR EACH ROW
+INSERT INTO sales_log (action_type, order_id, product_id, new_quantity)
+SELECT 'INSERT', o.order_id, p.product_id, NEW.quantity
+FROM compact_orders o, compact_products p
+WHERE o.order_key = NEW.order_key AND p.product_key = NEW.product_key;
+
+DROP TRIGGER IF EXISTS after_sales_update;
+CREATE TRIGGER after_sales_update
+AFTER UPDATE ON compact_sales
+FOR EACH ROW
+INSERT INTO sales_log (action_type, order_id, product_id, old_quantity, new_quantity)
+SELECT 'UPDATE', o.order_id, p.product_id, OLD.quantity, NEW.quantity
+FROM compact_orders o, compact_products p
+WHERE o.order_key = NEW.order_key AND p.product_key = NEW.product_key
+  AND OLD.quantity <> NEW.quantity;
+
+-- Compatibility views with the column layout of schema.sql
+CREATE OR REPLACE VIEW orders AS
+SELECT
+    o.order_id,
+    o.order_date,
+    o.ship_date,
+    sm.ship_mode,
+    c.customer_id,
+    c.customer_name,
+    sg.segment,
+    l.country,
+    l.city,
+    l.state,
+    l.postal_code,
+    r.region
+FROM compact_orders o
+JOIN dim_ship_mode sm ON o.ship_mode_key = sm.ship_mode_key
+JOIN dim_customer c ON o.customer_key = c.customer_key
+JOIN dim_segment sg ON c.segment_key = sg.segment_key
+JOIN dim_location l ON o.location_key = l.location_key
+JOIN dim_region r ON l.region_key = r.region_key;
+
+CREATE OR REPLACE VIEW products AS
+SELECT
+    p.product_id,
+    cat.category,
+    sc.sub_category,
+    p.product_name
+FROM compact_products p
+JOIN dim_sub_category sc ON p.sub_category_key = sc.sub_category_key
+JOIN dim_category cat ON sc.category_key = cat.category_key;
+
+CREATE OR REPLACE VIEW sales AS
+SELECT
+    s.row_id,
+    o.order_id,
+    p.product_id,
+    s.sales,
+    s.quantity,
+    s.discount,
+    s.profit
+FROM compact_sales s
+JOIN compact_orders o ON s.order_key = o.order_key
+JOIN compact_products p ON s.product_key = p.product_key;
+
+-- The views and procedures of advanced_sql.sql, defined directly on the integer keys.
+-- Each procedure body is a single statement, so no DELIMITER is needed.
+CREATE OR REPLACE VIEW sales_by_category_view AS
+SELECT
+    cat.category,
+    SUM(s.sales) AS total_sales,
+    SUM(s.profit) AS total_profit
+FROM compact_sales s
+JOIN compact_products p ON s.product_key = p.product_key
+JOIN dim_sub_category sc ON p.sub_category_key = sc.sub_category_key
+JOIN dim_category cat ON sc.category_key = cat.category_key
+GROUP BY cat.category
+ORDER BY total_sales DESC;
+
+CREATE OR REPLACE VIEW monthly_sales_profit_view AS
+SELECT
+    DATE_FORMAT(o.order_date, '%Y-%m') AS sales_month,
+    SUM(s.sales) AS monthly_sales,
+    SUM(s.profit) AS monthly_profit
+FROM compact_sales s
+JOIN compact_orders o ON s.order_key = o.order_key
+GROUP BY sales_month
+ORDER BY sales_month;
+
+DROP PROCEDURE IF EXISTS GetTopNProductsBySales;
+CREATE PROCEDURE GetTopNProductsBySales(IN n INT)
+SELECT
+    p.product_name,
+    SUM(s.sales) AS total_sales
+FROM compact_sales s
+JOIN compact_products p ON s.product_key = p.product_key
+GROUP BY p.product_name
+ORDER BY total_sales DESC
+LIMIT n;
+
+DROP PROCEDURE IF EXISTS GetSalesByRegionAndDateRange;
+CREATE PROCEDURE GetSalesByRegionAndDateRange(
+    IN region_name VARCHAR(255),
+    IN start_date DATE,
+    IN end_date DATE
+)
+SELECT
+    l.city,
+    SUM(s.sales) AS total_sales,
+    SUM(s.profit) AS total_profit
+FROM compact_sales s
+JOIN compact_orders o ON s.order_key = o.order_key
+JOIN dim_location l ON o.location_key = l.location_key
+JOIN dim_region r ON l.region_key = r.region_key
+WHERE r.region = region_name AND o.order_date BETWEEN start_date AND end_date
+GROUP BY l.city
+ORDER BY total_sales DESC;
@@ -0,0 +1,21 @@
+import re
+
+# Workload statements that call a stored procedure rather than run a query
+CALL_PATTERN = re.compile(r'\s*CALL\s+(\w+)\s*\((.*)\)\s*;?\s*$', re.IGNORECASE | re.DOTALL)
+
+
+def run_statement(connection, sql, params=()):
+    """Run one workload statement on a MySQL connection and return the number of rows fetched"""
+    cursor = connection.cursor()
+    try:
+        call = CALL_PATTERN.match(sql)
+        if call:
+            # callproc consumes every result set, so the connection stays usable
+            args = [int(arg) if arg.strip().isdigit() else arg.strip().strip("'")
+                    for arg in call.group(2).split(',') if arg.strip()]
+            cursor.callproc(call.group(1), args)
+            return sum(len(result.fetchall()) for result in cursor.stored_results())
+        cursor.execute(sql.strip().rstrip(';'), tuple(params) or None)
+        return len(cursor.fetchall())
+    finally:
+        cursor.close()
@@ -0,0 +1,193 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Budgets the dashboard is held to: importing the app script in a fresh interpreter,
+# importing one page module on top of it, and re-executing the script on a rerun
+COLD_START_BUDGET_MS = 1500.0
+PAGE_IMPORT_BUDGET_MS = 500.0
+RERUN_BUDGET_MS = 50.0
+
+RERUN_HISTORY = 200
+RERUN_SAMPLES = 20
+
+IMPORT_TIME_PATTERN = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+class StartupProfile:
+    """In-process record of page imports and script reruns, kept across Streamlit reruns"""
+
+    def __init__(self, history=RERUN_HISTORY):
+        self._lock = threading.Lock()
+        self._page_imports = {}
+        self._reruns = deque(maxlen=history)
+
+    def record_page_import(self, page, seconds):
+        with self._lock:
+            self._page_imports[page] = seconds
+
+    def record_rerun(self, page, overhead_seconds, render_seconds):
+        """overhead covers the script up to page dispatch; render is the page itself"""
+        with self._lock:
+            self._reruns.append({'page': page, 'overhead_ms': overhead_seconds * 1000,
+                                 'render_ms': render_seconds * 1000})
+
+    def page_imports(self):
+        with self._lock:
+            return [{'page': page, 'import_ms': seconds * 1000, 'budget_ms': PAGE_IMPORT_BUDGET_MS}
+                    for page, seconds in self._page_imports.items()]
+
+    def reruns(self):
+        with self._lock:
+            return list(self._reruns)
+
+
+STARTUP_PROFILE = StartupProfile()
+
+
+def parse_import_times(stderr):
+    """(module, self ms, cumulative ms, depth) for every line of `python -X importtime` output"""
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us) / 1000, int(cumulative_us) / 1000, len(indent) // 2))
+    return rows
+
+
+def import_times(statement):
+    """Import timings of a statement run in a fresh interpreter"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=BASE_DIR,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return parse_import_times(result.stderr)
+
+
+def cumulative_ms(rows, module):
+    return next((cumulative for name, _, cumulative, _ in rows if name == module), 0.0)
+
+
+def imported_by(rows, module, max_depth=2):
+    """(name, cumulative ms) of the modules a top-level import pulled in, up to max_depth.
+
+    importtime lists children before their parent, so they are the rows between the
+    previous top-level row and the module's own row.
+    """
+    children = []
+    for name, _, cumulative, depth in rows:
+        if depth == 0:
+            if name == module:
+                return children
+            children = []
+        elif depth <= max_depth:
+            children.append((name, cumulative))
+    return []
+
+
+def rerun_timings(samples=RERUN_SAMPLES, engine='local'):
+    """Median script overhead and full rerun time (ms) over real reruns of the app.
+
+    The app runs under streamlit's AppTest; the first run pays for imports and the
+    engine start-up, the following runs are reruns of the default page. The overhead
+    is what the app itself records in STARTUP_PROFILE up to the page dispatch. The
+    local engine on the sample CSV keeps the measurement independent of a MySQL server.
+    """
+    statement = (
+        "import statistics, time\n"
+        "from streamlit.testing.v1 import AppTest\n"
+        "from startup_profiler import STARTUP_PROFILE\n"
+        f"app = AppTest.from_file({os.path.join(BASE_DIR, 'advanced_dashboard.py')!r}, default_timeout=120)\n"
+        "app.run()\n"
+        "totals = []\n"
+        f"for _ in range({samples}):\n"
+        "    start = time.perf_counter()\n"
+        "    app.run()\n"
+        "    totals.append((time.perf_counter() - start) * 1000)\n"
+        "if app.exception:\n"
+        "    raise RuntimeError(app.exception[0].value)\n"
+        f"overheads = [rerun['overhead_ms'] for rerun in STARTUP_PROFILE.reruns()[-{samples}:]]\n"
+        "print(statistics.median(overheads), statistics.median(totals))\n"
+    )
+    env = dict(os.environ, DASHBOARD_ENGINE=engine)
+    if engine == 'local':
+        env.setdefault('LOCAL_ENGINE_SOURCE', os.path.join(BASE_DIR, 'Sample-Superstore.csv'))
+    result = subprocess.run([sys.executable, '-c', statement], cwd=BASE_DIR, env=env,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    overhead_ms, total_ms = result.stdout.strip().splitlines()[-1].split()
+    return float(overhead_ms), float(total_ms)
+
+
+def profile_startup(top=15, engine='local'):
+    """Cold start, per-page import and rerun timings of the dashboard against their budgets"""
+    from dashboard_pages import PAGES
+
+    app_rows = import_times('import advanced_dashboard')
+    report = {
+        'cold_start_ms': cumulative_ms(app_rows, 'advanced_dashboard'),
+        'slowest_imports': sorted(imported_by(app_rows, 'advanced_dashboard'),
+                                  key=lambda row: row[1], reverse=True)[:top],
+        'pages': [],
+    }
+    report['rerun_ms'], report['rerun_total_ms'] = rerun_timings(engine=engine)
+    for label, module in PAGES.items():
+        page_module = f"dashboard_pages.{module}"
+        rows = import_times(f"import advanced_dashboard, {page_module}")
+        report['pages'].append((label, cumulative_ms(rows, page_module)))
+    return report
+
+
+def over_budget(report):
+    """Budget violations as readable strings"""
+    violations = []
+    if report['cold_start_ms'] > COLD_START_BUDGET_MS:
+        violations.append(f"cold start {report['cold_start_ms']:.0f} ms > {COLD_START_BUDGET_MS:.0f} ms")
+    for label, page_ms in report['pages']:
+        if page_ms > PAGE_IMPORT_BUDGET_MS:
+            violations.append(f"{label} import {page_ms:.0f} ms > {PAGE_IMPORT_BUDGET_MS:.0f} ms")
+    if report['rerun_ms'] > RERUN_BUDGET_MS:
+        violations.append(f"rerun {report['rerun_ms']:.1f} ms > {RERUN_BUDGET_MS:.0f} ms")
+    return violations
+
+
+def print_report(report):
+    print(f"Cold start (import advanced_dashboard): {report['cold_start_ms']:.0f} ms "
+          f"(budget {COLD_START_BUDGET_MS:.0f} ms)")
+    print("\nSlowest imports:")
+    for name, cumulative in report['slowest_imports']:
+        print(f"  {name:<40} {cumulative:>8.1f} ms")
+    print(f"\nPage imports on first visit (budget {PAGE_IMPORT_BUDGET_MS:.0f} ms each):")
+    for label, page_ms in report['pages']:
+        print(f"  {label:<40} {page_ms:>8.1f} ms")
+    print(f"\nRerun overhead (script up to page dispatch): {report['rerun_ms']:.2f} ms "
+          f"(budget {RERUN_BUDGET_MS:.0f} ms)")
+    print(f"Full rerun including the default page: {report['rerun_total_ms']:.1f} ms")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Profile dashboard start-up and rerun time against a budget")
+    parser.add_argument('--top', type=int, default=15, help="Slowest imports to list")
+    parser.add_argument('--engine', default='local', choices=['local', 'mysql'],
+                        help="Dashboard engine the reruns are measured against")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = profile_startup(args.top, args.engine)
+    print_report(report)
+    violations = over_budget(report)
+    if violations:
+        print("\nOver budget:\n  " + "\n  ".join(violations))
+        sys.exit(1)
+    print("\nWithin budget")
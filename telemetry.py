@@ -0,0 +1,175 @@
+import contextvars
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from timing_stats import summarize_timings
+
+# Bounded memory: latency samples per fingerprint and raw events kept for export
+MAX_LATENCY_SAMPLES = 1000
+MAX_EVENTS = 10000
+
+# Page the current query is issued from; worker threads inherit it through copy_context()
+CURRENT_PAGE = contextvars.ContextVar('telemetry_page', default=None)
+
+COMMENT_PATTERN = re.compile(r'--[^\n]*|/\*.*?\*/', re.DOTALL)
+STRING_LITERAL_PATTERN = re.compile(r"'(?:[^'\\]|\\.)*'")
+NUMBER_LITERAL_PATTERN = re.compile(r'\b\d+(?:\.\d+)?\b')
+IN_LIST_PATTERN = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+
+
+def normalize_query(sql):
+    """Query text with comments removed and literals replaced, so repeated shapes group together"""
+    text = COMMENT_PATTERN.sub(' ', sql)
+    text = STRING_LITERAL_PATTERN.sub('?', text)
+    text = NUMBER_LITERAL_PATTERN.sub('?', text)
+    text = text.replace('%s', '?')
+    text = IN_LIST_PATTERN.sub('IN (?)', text)
+    return ' '.join(text.split()).rstrip(';').strip().lower()
+
+
+def query_fingerprint(sql):
+    return hashlib.md5(normalize_query(sql).encode('utf-8')).hexdigest()[:12]
+
+
+@contextmanager
+def page_context(page):
+    """Attribute every query issued inside the block to a dashboard page"""
+    token = CURRENT_PAGE.set(page)
+    try:
+        yield
+    finally:
+        CURRENT_PAGE.reset(token)
+
+
+class QueryTelemetry:
+    """In-memory aggregates of every instrumented query, grouped by page, source and fingerprint"""
+
+    def __init__(self, max_latency_samples=MAX_LATENCY_SAMPLES, max_events=MAX_EVENTS):
+        self.max_latency_samples = max_latency_samples
+        self._lock = threading.Lock()
+        self._aggregates = {}
+        self._events = deque(maxlen=max_events)
+        self.started_at = time.time()
+
+    def record(self, source, sql, latency, rows=None, cache_hit=False, pool_wait=0.0, error=None, page=None):
+        """Add one query execution; latency and pool_wait are in seconds"""
+        page = page or CURRENT_PAGE.get() or 'unknown'
+        fingerprint = query_fingerprint(sql)
+        event = {
+            'timestamp': time.time(), 'page': page, 'source': source, 'fingerprint': fingerprint,
+            'latency_ms': latency * 1000, 'rows': rows, 'cache_hit': cache_hit,
+            'pool_wait_ms': pool_wait * 1000, 'error': error,
+        }
+        with self._lock:
+            key = (page, source, fingerprint)
+            aggregate = self._aggregates.get(key)
+            if aggregate is None:
+                aggregate = self._aggregates[key] = {
+                    'page': page, 'source': source, 'fingerprint': fingerprint,
+                    'query': normalize_query(sql)[:200],
+                    'calls': 0, 'errors': 0, 'cache_hits': 0, 'cache_misses': 0, 'rows': 0,
+                    'total_latency': 0.0, 'total_pool_wait': 0.0,
+                    'latency_samples': deque(maxlen=self.max_latency_samples),
+                }
+            aggregate['calls'] += 1
+            aggregate['errors'] += error is not None
+            aggregate['cache_hits' if cache_hit else 'cache_misses'] += 1
+            aggregate['rows'] += rows or 0
+            aggregate['total_latency'] += latency
+            aggregate['total_pool_wait'] += pool_wait
+            aggregate['latency_samples'].append(latency * 1000)
+            self._events.append(event)
+
+    @contextmanager
+    def track(self, source, sql):
+        """Time a block and record it; the block fills in rows, cache_hit, pool_wait and error"""
+        event = {'rows': None, 'cache_hit': False, 'pool_wait': 0.0, 'error': None}
+        start_time = time.perf_counter()
+        try:
+            yield event
+        except Exception as e:
+            event['error'] = str(e)
+            raise
+        finally:
+            self.record(source, sql, time.perf_counter() - start_time, **event)
+
+    def summary(self):
+        """One row per (page, source, fingerprint) with latency percentiles"""
+        with self._lock:
+            aggregates = [dict(aggregate, latency_samples=list(aggregate['latency_samples']))
+                          for aggregate in self._aggregates.values()]
+        rows = []
+        for aggregate in aggregates:
+            timings = summarize_timings(aggregate.pop('latency_samples'))
+            calls = aggregate['calls']
+            rows.append(dict(
+                aggregate,
+                hit_rate=aggregate['cache_hits'] / calls,
+                avg_latency_ms=aggregate['total_latency'] / calls * 1000,
+                p50_ms=timings['p50_ms'],
+                p95_ms=timings['p95_ms'],
+                p99_ms=timings['p99_ms'],
+                avg_pool_wait_ms=aggregate['total_pool_wait'] / calls * 1000,
+            ))
+        return sorted(rows, key=lambda row: -row['total_latency'])
+
+    def prometheus_text(self):
+        """Aggregates in the Prometheus text exposition format"""
+        metrics = [
+            ('dashboard_query_calls_total', 'counter', 'Instrumented query executions', 'calls'),
+            ('dashboard_query_errors_total', 'counter', 'Query executions that failed', 'errors'),
+            ('dashboard_query_cache_hits_total', 'counter', 'Executions answered from the result cache', 'cache_hits'),
+            ('dashboard_query_rows_total', 'counter', 'Rows returned', 'rows'),
+            ('dashboard_query_latency_seconds_total', 'counter', 'Total query latency', 'total_latency'),
+            ('dashboard_query_pool_wait_seconds_total', 'counter', 'Total connection pool wait', 'total_pool_wait'),
+        ]
+        summary = self.summary()
+        lines = []
+        for name, metric_type, help_text, field in metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for row in summary:
+                lines.append(f"{name}{{{prometheus_labels(row)}}} {row[field]}")
+        lines.append("# HELP dashboard_query_latency_seconds Query latency quantiles over recent executions")
+        lines.append("# TYPE dashboard_query_latency_seconds gauge")
+        for row in summary:
+            for quantile, field in (('0.5', 'p50_ms'), ('0.95', 'p95_ms'), ('0.99', 'p99_ms')):
+                lines.append(f"dashboard_query_latency_seconds{{{prometheus_labels(row)},quantile=\"{quantile}\"}} "
+                             f"{row[field] / 1000}")
+        return '\n'.join(lines) + '\n'
+
+    def json_lines(self):
+        """Raw events, one JSON object per line"""
+        with self._lock:
+            events = list(self._events)
+        return ''.join(json.dumps(event, default=str) + '\n' for event in events)
+
+    def write_prometheus(self, path):
+        with open(path, 'w') as f:
+            f.write(self.prometheus_text())
+        return path
+
+    def write_json_lines(self, path):
+        with open(path, 'w') as f:
+            f.write(self.json_lines())
+        return path
+
+    def reset(self):
+        with self._lock:
+            self._aggregates.clear()
+            self._events.clear()
+            self.started_at = time.time()
+
+
+def prometheus_labels(row):
+    values = {key: str(row[key]).replace('\\', '\\\\').replace('"', '\\"') for key in ('page', 'source', 'fingerprint')}
+    return ','.join(f'{key}="{value}"' for key, value in values.items())
+
+
+# Process-wide telemetry shared by the dashboard and forecasting
+TELEMETRY = QueryTelemetry()
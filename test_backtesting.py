@@ -0,0 +1,45 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+import backtesting
+from backtesting import evaluate_cutoffs, run_backtest
+
+
+def seasonal_series(months=48):
+    """Two series that repeat exactly every twelve months"""
+    calendar = pd.date_range('2014-01-01', periods=months, freq='MS')
+    Y = np.vstack([100 + 10 * calendar.month, np.where(calendar.month == 12, 90, 50)]).astype(float)
+    return calendar, Y
+
+
+def test_predicted_months_are_the_actual_months(monkeypatch):
+    calendar, Y = seasonal_series()
+    requested = []
+    predict_method = backtesting.predict_method
+
+    def recording_predict(method, parameters, n_history, horizon_dates, **hyperparameters):
+        requested.append((n_history, horizon_dates))
+        return predict_method(method, parameters, n_history, horizon_dates, **hyperparameters)
+
+    monkeypatch.setattr(backtesting, 'predict_method', recording_predict)
+    shm = shared_memory.SharedMemory(create=True, size=Y.nbytes)
+    try:
+        np.ndarray(Y.shape, dtype=Y.dtype, buffer=shm.buf)[:] = Y
+        evaluate_cutoffs(shm.name, Y.shape, Y.dtype, calendar, 'seasonal', {}, list(range(12, Y.shape[1])), 6)
+    finally:
+        shm.close()
+        shm.unlink()
+
+    assert len(requested) == Y.shape[1] - 12
+    for cutoff, horizon_dates in requested:
+        actual = calendar[cutoff:cutoff + 6]
+        assert list(horizon_dates.to_period('M')) == list(actual.to_period('M'))
+
+
+def test_seasonal_backtest_is_exact_on_a_seasonal_series():
+    calendar, Y = seasonal_series()
+    results = run_backtest(Y, calendar, methods=(('seasonal', {}),), workers=1)
+    assert len(results) == backtesting.HORIZON
+    assert np.allclose(results['MAE'], 0)
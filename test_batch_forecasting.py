@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from batch_forecasting import batch_forecast, future_dates
+
+
+def test_horizon_steps_whole_months_across_the_year_end():
+    calendar = pd.date_range('2015-01-01', '2017-11-01', freq='MS')
+    horizon = future_dates(calendar, 14)
+    assert list(horizon.to_period('M')) == list(pd.period_range('2017-12', periods=14, freq='M'))
+    assert (horizon.day == 1).all()
+
+
+def test_seasonal_forecast_keeps_month_of_year():
+    # One series whose value is its calendar month, so a shifted horizon shows up directly
+    calendar = pd.date_range('2015-01-01', '2017-11-01', freq='MS')
+    Y = calendar.month.to_numpy(dtype=float)[None, :]
+    keys = pd.DataFrame({'region': ['West'], 'category': ['Furniture'], 'sub_category': ['Chairs']})
+    forecast = batch_forecast(keys, calendar, Y, periods=14, methods=(('seasonal', {}),))
+    expected = pd.period_range('2017-12', periods=14, freq='M')
+    assert list(pd.DatetimeIndex(forecast['month_date']).to_period('M')) == list(expected)
+    assert np.allclose(forecast['predicted_value'], expected.month)
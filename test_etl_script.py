@@ -0,0 +1,68 @@
+import io
+
+import pandas as pd
+
+from etl_script import add_missing_columns, add_missing_indexes, compute_row_hashes, parse_dates
+
+HEADER = "Row ID,Order ID,Order Date,Ship Date,Postal Code,Sales,Quantity,Discount,Profit\n"
+ROW = "7,CA-2017-100001,12/30/2017,1/3/2018,90036,48.86,7,0,14.17\n"
+
+
+def extract(rows):
+    return parse_dates(pd.read_csv(io.StringIO(HEADER + ''.join(rows))))
+
+
+def test_row_hash_does_not_depend_on_the_rest_of_the_extract():
+    # Alone, Discount and Postal Code parse as int64; next to a fractional discount
+    # and a missing postal code they parse as float64
+    delta = extract([ROW])
+    full = extract(["1,CA-2017-100000,1/2/2017,1/5/2017,,12.5,1,0.2,3.1\n", ROW])
+    assert delta['Discount'].dtype != full['Discount'].dtype
+    assert delta['Postal Code'].dtype != full['Postal Code'].dtype
+    assert compute_row_hashes(delta).iloc[0] == compute_row_hashes(full).iloc[1]
+
+
+def test_row_hash_changes_with_the_content():
+    changed = extract([ROW.replace('48.86', '48.87')])
+    assert compute_row_hashes(extract([ROW])).iloc[0] != compute_row_hashes(changed).iloc[0]
+
+
+class FakeConnection:
+    """Answers information_schema lookups from a set of existing (table, name) pairs"""
+
+    def __init__(self, existing):
+        self.existing = set(existing)
+        self.statements = []
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, params=None):
+        self.statements.append(query)
+        self.found = params is not None and tuple(params) in self.existing
+
+    def fetchone(self):
+        return (1,) if self.found else None
+
+    def close(self):
+        pass
+
+
+def test_missing_rollup_column_is_added_once():
+    old = FakeConnection([])
+    assert add_missing_columns(old) == {'daily_sales_summary'}
+    assert "ALTER TABLE daily_sales_summary ADD COLUMN total_daily_orders INT" in old.statements
+
+    current = FakeConnection([('daily_sales_summary', 'total_daily_orders')])
+    assert add_missing_columns(current) == set()
+    assert not any(statement.startswith('ALTER') for statement in current.statements)
+
+
+def test_order_date_index_is_created_once():
+    old = FakeConnection([])
+    add_missing_indexes(old)
+    assert "CREATE INDEX idx_orders_order_date ON orders (order_date)" in old.statements
+
+    current = FakeConnection([('orders', 'idx_orders_order_date')])
+    add_missing_indexes(current)
+    assert not any(statement.startswith('CREATE') for statement in current.statements)
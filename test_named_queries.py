@@ -0,0 +1,15 @@
+from named_queries import COMPACT_NAMED_QUERIES, NAMED_QUERIES, named_query_sql
+
+
+def test_compact_queries_take_the_same_parameters():
+    # The dashboard binds one set of parameters per name, whichever schema is in use
+    for name, sql in COMPACT_NAMED_QUERIES.items():
+        assert name in NAMED_QUERIES
+        assert sql.count('%s') == NAMED_QUERIES[name].count('%s'), name
+
+
+def test_compact_queries_use_the_integer_keys():
+    for name in COMPACT_NAMED_QUERIES:
+        sql = named_query_sql(name, 'compact')
+        assert ' orders ' not in sql and ' sales s' not in sql and ' products ' not in sql, name
+    assert named_query_sql('overview_kpis_rollup', 'compact') is NAMED_QUERIES['overview_kpis_rollup']
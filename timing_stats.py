@@ -0,0 +1,20 @@
+import numpy as np
+
+# Percentiles reported for every set of latency samples
+PERCENTILES = (50, 90, 95, 99)
+
+
+def summarize_timings(timings_ms):
+    """Latency statistics for a list of millisecond timings"""
+    if not timings_ms:
+        return {}
+    values = np.asarray(timings_ms, dtype=float)
+    summary = {f'p{p}_ms': float(np.percentile(values, p)) for p in PERCENTILES}
+    summary.update({
+        'runs': int(len(values)),
+        'min_ms': float(values.min()),
+        'max_ms': float(values.max()),
+        'mean_ms': float(values.mean()),
+        'stddev_ms': float(values.std()),
+    })
+    return summary
@@ -0,0 +1,66 @@
+import os
+from datetime import date
+
+from named_queries import FILTERED_SALES_VARIANTS, NAMED_QUERIES, named_query_sql, overview_kpi_params
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ANALYSIS_QUERIES_PATH = os.path.join(BASE_DIR, 'analysis_queries.sql')
+
+# Representative parameters for the parameterized named queries
+SAMPLE_PARAMS = {
+    'overview_kpis': overview_kpi_params(date(2014, 1, 1), date(2017, 12, 31)),
+    'overview_kpis_rollup': overview_kpi_params(date(2014, 1, 1), date(2017, 12, 31)),
+}
+
+# Every filtered sales variant is profiled with the same filter values
+SAMPLE_FILTERS = {'region': 'West', 'category': 'Furniture', 'min_sales': 100.0}
+SAMPLE_PARAMS.update({name: tuple(SAMPLE_FILTERS[f] for f in filters)
+                      for name, filters in FILTERED_SALES_VARIANTS.items()})
+
+# Queries the dashboard sends outside the named-query layer
+DASHBOARD_EXTRA_QUERIES = {
+    'top_products_procedure': "CALL GetTopNProductsBySales(10)",
+}
+
+
+def sql_file_queries(path):
+    """Statements of a plain SQL file, named after the comment line preceding each one"""
+    with open(path, 'r') as f:
+        content = f.read()
+
+    queries = []
+    for number, statement in enumerate(content.split(';'), start=1):
+        title = None
+        sql_lines = []
+        for line in statement.strip().splitlines():
+            if line.strip().startswith('--'):
+                title = title or line.strip().lstrip('-').strip()
+            elif line.strip():
+                sql_lines.append(line)
+        if sql_lines:
+            queries.append((title or f"statement {number}", '\n'.join(sql_lines)))
+    return queries
+
+
+def collect_workload(include_procedures=False):
+    """Every read query issued by the dashboard, analysis_queries.sql and forecasting.
+
+    Returns a list of dicts with name, source, sql and params.
+    """
+    from forecasting import MONTHLY_SERIES_QUERY
+
+    workload = [
+        {'name': name, 'source': 'dashboard', 'sql': named_query_sql(name), 'params': SAMPLE_PARAMS.get(name, ())}
+        for name in NAMED_QUERIES
+    ]
+    if include_procedures:
+        workload.extend(
+            {'name': name, 'source': 'dashboard', 'sql': sql, 'params': ()}
+            for name, sql in DASHBOARD_EXTRA_QUERIES.items()
+        )
+    workload.extend(
+        {'name': title, 'source': 'analysis_queries.sql', 'sql': sql, 'params': ()}
+        for title, sql in sql_file_queries(ANALYSIS_QUERIES_PATH)
+    )
+    workload.append({'name': 'monthly_series', 'source': 'forecasting', 'sql': MONTHLY_SERIES_QUERY, 'params': ()})
+    return workload